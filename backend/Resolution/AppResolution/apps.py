@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class AppresolutionConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'AppResolution'
+
+    def ready(self):
+        from AppResolution import signals  # noqa: F401
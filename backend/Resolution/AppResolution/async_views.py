@@ -0,0 +1,160 @@
+"""
+Vistas de lectura asíncronas para despliegues ASGI.
+
+DRF no tiene vistas asíncronas, así que los GET de reclamos, solicitudes, perfiles y reportes
+se implementan como vistas async de Django sobre el ORM asíncrono y devuelven el mismo JSON
+que las APIView. El resto de métodos (POST, PUT, PATCH, DELETE, HEAD) siguen pasando por la
+APIView síncrona a través de sync_to_async.
+"""
+import logging
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth.models import AnonymousUser
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework import status
+
+from AppResolution.models import User, Claim, Request, Profile
+from AppResolution.serializers import claim_serializer, request_serializer, profile_serializer, claim_read_serializer, request_read_serializer, profile_read_serializer, InvalidFields
+from AppResolution.utils.filters import filter_items, InvalidFilter
+from AppResolution.utils.pagination import apaginate_queryset, is_paginated, InvalidCursor
+from AppResolution.utils.permissions import aadmin_error
+from AppResolution.utils.renderers import FastJSONRenderer
+from AppResolution.utils.reports import aget_cached_report, parse_report_window, InvalidReportWindow
+from AppResolution.utils.tokens import SignedTokenAuthentication
+from AppResolution.views import list_projection, list_payload
+
+logger = logging.getLogger(__name__)
+renderer = FastJSONRenderer()
+authenticator = SignedTokenAuthentication()
+
+
+def json_response(data, status_code=status.HTTP_200_OK):
+    return HttpResponse(renderer.render(data), status=status_code, content_type=renderer.media_type)
+
+
+def prepare_request(request):
+    """
+    Deja en el HttpRequest lo que usan los helpers compartidos con las APIView:
+    query_params y el usuario del token Bearer (o anónimo)
+    """
+    request.query_params = request.GET
+    auth = authenticator.authenticate(request)
+    request.user = auth[0] if auth else AnonymousUser()
+    return request
+
+
+def hybrid_view(async_get, view_class):
+    """
+    Vista async que atiende GET con `async_get` y delega el resto de métodos en `view_class`
+    """
+    sync_view = sync_to_async(view_class.as_view())
+
+    @csrf_exempt
+    async def view(request, *args, **kwargs):
+        if request.method == 'GET':
+            return await async_get(prepare_request(request), *args, **kwargs)
+        return await sync_view(request, *args, **kwargs)
+    return view
+
+
+async def apaginated_response(request, queryset, serializer_class, keys=('created_at', 'id'), descending=True):
+    """
+    Versión asíncrona de paginated_response
+    """
+    try:
+        queryset, fields, cursor_keys = list_projection(request, queryset, serializer_class, keys)
+        page = await apaginate_queryset(request, queryset, keys, descending=descending)
+    except (InvalidCursor, InvalidFields) as e:
+        return json_response({"error": str(e)}, status.HTTP_400_BAD_REQUEST)
+    return json_response(list_payload(serializer_class, *page, fields, cursor_keys))
+
+
+async def afiltered_response(request, queryset, serializer_class):
+    """
+    Versión asíncrona de filtered_response
+    """
+    try:
+        queryset, keys, descending = filter_items(queryset, request.query_params, cursor=is_paginated(request))
+    except InvalidFilter as e:
+        return json_response({"error": str(e)}, status.HTTP_400_BAD_REQUEST)
+    return await apaginated_response(request, queryset, serializer_class, keys, descending)
+
+
+async def aget_item(model, serializer_class, pk, not_found):
+    try:
+        instance = await model.objects.aget(pk=pk)
+    except model.DoesNotExist:
+        return json_response({"error": not_found}, status.HTTP_404_NOT_FOUND)
+    return json_response(serializer_class(instance).data)
+
+
+async def aget_items(request, model, serializer_class, read_serializer_class, not_found, pk=None, user_id=None):
+    """
+    GET de reclamos o solicitudes: uno por ID, los de un usuario o todos, con los mismos filtros que la APIView
+    """
+    if pk:
+        return await aget_item(model, serializer_class, pk, not_found)
+
+    filter_user_id = user_id or request.query_params.get('user_id')
+    if filter_user_id:
+        try:
+            items = model.objects.filter(user_id=filter_user_id)
+        except Exception as e:
+            return json_response({"error": str(e)}, status.HTTP_400_BAD_REQUEST)
+        return await afiltered_response(request, items, read_serializer_class)
+
+    return await afiltered_response(request, model.objects.all(), read_serializer_class)
+
+
+async def claim_get(request, pk=None, user_id=None, **kwargs):
+    return await aget_items(request, Claim, claim_serializer, claim_read_serializer, "Reclamo no encontrado", pk, user_id)
+
+
+async def request_get(request, pk=None, user_id=None, **kwargs):
+    return await aget_items(request, Request, request_serializer, request_read_serializer, "Solicitud no encontrada", pk, user_id)
+
+
+async def profile_get(request, pk=None, user_id=None, **kwargs):
+    if pk:
+        return await aget_item(Profile, profile_serializer, pk, "Perfil no encontrado")
+
+    filter_user_id = user_id or request.query_params.get('user_id')
+    if filter_user_id:
+        try:
+            user = await User.objects.select_related('profile').aget(id=filter_user_id)
+        except User.DoesNotExist:
+            return json_response({"error": "Usuario no encontrado"}, status.HTTP_404_NOT_FOUND)
+        except Exception as e:
+            return json_response({"error": str(e)}, status.HTTP_400_BAD_REQUEST)
+        if not user.profile:
+            return json_response({"error": "No se encontró perfil para este usuario"}, status.HTTP_404_NOT_FOUND)
+        return json_response(profile_serializer(user.profile).data)
+
+    return await apaginated_response(request, Profile.objects.all(), profile_read_serializer, keys=('id',))
+
+
+async def reports_get(request):
+    error = await aadmin_error(request)
+    if error is not None:
+        return json_response(*error)
+    try:
+        try:
+            start_date, end_date = parse_report_window(request.GET)
+        except InvalidReportWindow as e:
+            return json_response({"error": str(e)}, status.HTTP_400_BAD_REQUEST)
+
+        report, etag, last_modified = await aget_cached_report(start_date, end_date)
+        response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        if response is None:
+            response = json_response(report)
+        response['ETag'] = etag
+        response['Last-Modified'] = http_date(last_modified)
+        response['Cache-Control'] = 'private, no-cache'
+        return response
+
+    except Exception as e:
+        logger.exception("Error en reports_get")
+        return json_response({"error": str(e)}, status.HTTP_400_BAD_REQUEST)
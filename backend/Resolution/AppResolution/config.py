@@ -10,4 +10,61 @@ MAILERSEND_FROM_EMAIL = "MS_EOJlqh@test-65qngkd23mdlwr12.mlsender.net"
 MAILERSEND_FROM_NAME = "Resolution"
 
 # Email por defecto para pruebas
-DEFAULT_TEST_EMAIL = "dylansantiagorodriguez.p@gmail.com" 
\ No newline at end of file
+DEFAULT_TEST_EMAIL = "dylansantiagorodriguez.p@gmail.com" 
+
+# Paginación por cursor de los listados
+DEFAULT_PAGE_SIZE = int(os.environ.get('RESOLUTION_PAGE_SIZE', 50))
+MAX_PAGE_SIZE = int(os.environ.get('RESOLUTION_MAX_PAGE_SIZE', 500))
+
+# Límite de filas para los clientes que no envían cursor (modo de compatibilidad)
+LEGACY_MAX_ROWS = int(os.environ.get('RESOLUTION_LEGACY_MAX_ROWS', 1000))
+
+# Ventana de los reportes de administrador
+DEFAULT_REPORT_DAYS = int(os.environ.get('RESOLUTION_REPORT_DAYS', 30))
+MAX_REPORT_DAYS = int(os.environ.get('RESOLUTION_MAX_REPORT_DAYS', 366))
+
+# Tiempo máximo que un reporte calculado permanece en caché (se invalida antes si cambian los datos)
+REPORT_CACHE_TTL_SECONDS = int(os.environ.get('RESOLUTION_REPORT_CACHE_TTL_SECONDS', 300))
+
+# Vigencia de los códigos de verificación
+AUTH_CODE_TTL_MINUTES = int(os.environ.get('RESOLUTION_AUTH_CODE_TTL_MINUTES', 10))
+# Reenvíos dentro de esta ventana reutilizan el código vigente sin escribir ni enviar correo
+AUTH_CODE_RESEND_WINDOW_SECONDS = int(os.environ.get('RESOLUTION_AUTH_CODE_RESEND_WINDOW_SECONDS', 60))
+
+# Cola de correos salientes (EmailOutbox)
+OUTBOX_MAX_WORKERS = int(os.environ.get('RESOLUTION_OUTBOX_MAX_WORKERS', 4))
+OUTBOX_BATCH_SIZE = int(os.environ.get('RESOLUTION_OUTBOX_BATCH_SIZE', 50))
+OUTBOX_MAX_ATTEMPTS = int(os.environ.get('RESOLUTION_OUTBOX_MAX_ATTEMPTS', 5))
+OUTBOX_RETRY_BASE_SECONDS = int(os.environ.get('RESOLUTION_OUTBOX_RETRY_BASE_SECONDS', 30))
+OUTBOX_QUOTA_BACKOFF_SECONDS = int(os.environ.get('RESOLUTION_OUTBOX_QUOTA_BACKOFF_SECONDS', 3600))
+OUTBOX_SEND_LEASE_SECONDS = int(os.environ.get('RESOLUTION_OUTBOX_SEND_LEASE_SECONDS', 300))
+
+# Alta masiva de reclamos y solicitudes
+BULK_CREATE_CHUNK_SIZE = int(os.environ.get('RESOLUTION_BULK_CREATE_CHUNK_SIZE', 500))
+BULK_MAX_ITEMS = int(os.environ.get('RESOLUTION_BULK_MAX_ITEMS', 10000))
+
+# Caché de permisos de administrador
+ADMIN_CACHE_TTL_SECONDS = int(os.environ.get('RESOLUTION_ADMIN_CACHE_TTL_SECONDS', 60))
+
+# Tokens de acceso firmados (HMAC con vencimiento)
+ACCESS_TOKEN_TTL_SECONDS = int(os.environ.get('RESOLUTION_ACCESS_TOKEN_TTL_SECONDS', 15 * 60))
+REFRESH_TOKEN_TTL_SECONDS = int(os.environ.get('RESOLUTION_REFRESH_TOKEN_TTL_SECONDS', 7 * 24 * 60 * 60))
+
+# Exportación en streaming: filas leídas por vuelta del cursor del servidor
+EXPORT_CHUNK_SIZE = int(os.environ.get('RESOLUTION_EXPORT_CHUNK_SIZE', 2000))
+
+# Codificador JSON de la API: 'auto' usa orjson si está instalado, 'stdlib' fuerza el módulo json
+JSON_BACKEND = os.environ.get('RESOLUTION_JSON_BACKEND', 'auto')
+
+# Configuración de texto de Postgres para la búsqueda de reclamos y solicitudes (solo consultas).
+# Debe coincidir con el 'spanish' fijado en los índices GIN de la migración 0017; si cambia,
+# hace falta una migración nueva que recree esos índices.
+SEARCH_CONFIG = 'spanish'
+
+# Hash de contraseñas fuera del hilo de la petición: número de procesos del pool (0 = en el mismo hilo)
+PASSWORD_HASH_WORKERS = int(os.environ.get('RESOLUTION_PASSWORD_HASH_WORKERS', 0))
+PASSWORD_HASH_TIMEOUT_SECONDS = int(os.environ.get('RESOLUTION_PASSWORD_HASH_TIMEOUT_SECONDS', 30))
+
+# Vistas de lectura asíncronas (GET de reclamos, solicitudes, perfiles y reportes) bajo ASGI.
+# Desactivadas por defecto hasta que el benchmark muestre que superan a WSGI.
+ASYNC_VIEWS = os.environ.get('RESOLUTION_ASYNC_VIEWS', '0') == '1'
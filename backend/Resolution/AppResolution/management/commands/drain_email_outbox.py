@@ -0,0 +1,31 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from AppResolution.config import OUTBOX_MAX_WORKERS, OUTBOX_BATCH_SIZE
+from AppResolution.utils.outbox import drain_outbox
+
+
+class Command(BaseCommand):
+    help = 'Envía los correos pendientes de la cola EmailOutbox'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=OUTBOX_MAX_WORKERS, help='Hilos de envío simultáneos')
+        parser.add_argument('--batch-size', type=int, default=OUTBOX_BATCH_SIZE, help='Mensajes reservados por lote')
+        parser.add_argument('--loop', action='store_true', help='Ejecutar continuamente como proceso de fondo')
+        parser.add_argument('--interval', type=int, default=5, help='Segundos entre pasadas con --loop')
+
+    def handle(self, *args, **options):
+        while True:
+            # Un proceso de fondo no pasa por el ciclo de petición de Django: se descartan aquí
+            # las conexiones caídas o que superaron CONN_MAX_AGE
+            close_old_connections()
+            stats = drain_outbox(max_workers=options['workers'], batch_size=options['batch_size'])
+            self.stdout.write(
+                f"Enviados: {stats['sent']}, reintentos: {stats['retried']}, fallidos: {stats['failed']}"
+                + (" (cuota agotada)" if stats['quota_exceeded'] else "")
+            )
+            if not options['loop']:
+                return
+            time.sleep(options['interval'])
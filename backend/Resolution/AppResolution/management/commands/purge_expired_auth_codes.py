@@ -0,0 +1,26 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from AppResolution.utils.sweeper import purge_expired_auth_codes
+
+
+class Command(BaseCommand):
+    help = 'Elimina por lotes los códigos de verificación vencidos'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000, help='Filas a eliminar por sentencia')
+        parser.add_argument('--loop', action='store_true', help='Ejecutar continuamente como proceso de fondo')
+        parser.add_argument('--interval', type=int, default=60, help='Segundos entre pasadas con --loop')
+
+    def handle(self, *args, **options):
+        while True:
+            # Un proceso de fondo no pasa por el ciclo de petición de Django: se descartan aquí
+            # las conexiones caídas o que superaron CONN_MAX_AGE
+            close_old_connections()
+            deleted = purge_expired_auth_codes(batch_size=options['batch_size'])
+            self.stdout.write(f'Códigos vencidos eliminados: {deleted}')
+            if not options['loop']:
+                return
+            time.sleep(options['interval'])
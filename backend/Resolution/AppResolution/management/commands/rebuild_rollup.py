@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from AppResolution.utils.rollup import rebuild_rollup
+
+
+class Command(BaseCommand):
+    help = 'Reconstruye desde cero la tabla de resumen diario de reclamos y solicitudes'
+
+    def handle(self, *args, **options):
+        rows = rebuild_rollup()
+        self.stdout.write(self.style.SUCCESS(f'Resumen diario reconstruido ({rows} filas)'))
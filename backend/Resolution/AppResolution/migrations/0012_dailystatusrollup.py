@@ -0,0 +1,70 @@
+# Generated by Django 5.2 on 2026-10-17 17:10
+
+from collections import Counter
+
+from django.db import migrations, models
+from django.db.models import Count
+from django.db.models.functions import TruncDate
+
+# Copia congelada de la normalización de estados vigente al escribir esta migración;
+# no se importa de AppResolution.utils para que su efecto no cambie con el código actual.
+ROLLUP_STATUSES = {
+    'pendiente': 'pendiente',
+    'en proceso': 'en_proceso',
+    'completado': 'completado',
+}
+NULL_STATUS = 'sin_estado'
+OTHER_STATUS = 'otro'
+
+
+def normalize_status(value):
+    if value is None:
+        return NULL_STATUS
+    return ROLLUP_STATUSES.get(value.lower(), OTHER_STATUS)
+
+
+def aggregate_rollup_rows(sources):
+    counts = Counter()
+    for kind, model in sources:
+        rows = model.objects.annotate(day=TruncDate('created_at')).values('day', 'status').annotate(n=Count('id'))
+        for row in rows:
+            counts[(kind, row['day'], normalize_status(row['status']))] += row['n']
+    return counts
+
+
+def populate_rollup(apps, schema_editor):
+    Claim = apps.get_model('AppResolution', 'Claim')
+    Request = apps.get_model('AppResolution', 'Request')
+    DailyStatusRollup = apps.get_model('AppResolution', 'DailyStatusRollup')
+    counts = aggregate_rollup_rows([('claim', Claim), ('request', Request)])
+    DailyStatusRollup.objects.bulk_create(
+        [
+            DailyStatusRollup(kind=kind, date=date, normalized_status=normalized_status, count=count)
+            for (kind, date, normalized_status), count in counts.items()
+        ],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('AppResolution', '0011_alter_profile_password_alter_profile_phone_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyStatusRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('claim', 'Reclamo'), ('request', 'Solicitud')], max_length=10)),
+                ('date', models.DateField()),
+                ('normalized_status', models.CharField(max_length=20)),
+                ('count', models.IntegerField(default=0)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('kind', 'date', 'normalized_status'), name='unique_daily_status_rollup')],
+            },
+        ),
+        migrations.RunPython(populate_rollup, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,50 @@
+# Generated by Django 5.2 on 2026-10-17 17:12
+
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('AppResolution', '0012_dailystatusrollup'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='authentication',
+            index=models.Index(fields=['user', '-id'], name='auth_user_latest_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='claim',
+            index=models.Index(fields=['user', 'created_at'], name='claim_user_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='claim',
+            index=models.Index(fields=['status', 'created_at'], name='claim_status_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='claim',
+            index=models.Index(fields=['created_at', 'id'], name='claim_created_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='claim',
+            index=models.Index(django.db.models.functions.text.Lower('status'), name='claim_status_lower_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='request',
+            index=models.Index(fields=['user', 'created_at'], name='request_user_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='request',
+            index=models.Index(fields=['status', 'created_at'], name='request_status_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='request',
+            index=models.Index(fields=['created_at', 'id'], name='request_created_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='request',
+            index=models.Index(django.db.models.functions.text.Lower('status'), name='request_status_lower_idx'),
+        ),
+    ]
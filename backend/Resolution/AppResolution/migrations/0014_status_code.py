@@ -0,0 +1,114 @@
+# Generated by Django 5.2 on 2026-10-17 17:13
+
+from collections import Counter
+
+from django.db import migrations, models
+from django.db.models import Count
+from django.db.models.functions import TruncDate
+
+# Copia congelada de AppResolution.utils.status y de la normalización del resumen diario
+# al escribir esta migración, para que repetirla dé siempre el mismo resultado.
+PENDIENTE, EN_PROCESO, COMPLETADO, OTRO = 1, 2, 3, 9
+
+STATUS_ALIASES = {
+    'pendiente': PENDIENTE,
+    'en proceso': EN_PROCESO,
+    'completado': COMPLETADO,
+}
+
+STATUS_KEYS = {
+    PENDIENTE: 'pendiente',
+    EN_PROCESO: 'en_proceso',
+    COMPLETADO: 'completado',
+    OTRO: 'otro',
+}
+
+NULL_STATUS = 'sin_estado'
+
+
+def status_code_for(value):
+    if value is None:
+        return None
+    normalized = ' '.join(str(value).replace('_', ' ').split()).lower()
+    return STATUS_ALIASES.get(normalized, OTRO)
+
+
+def normalize_status(value):
+    code = status_code_for(value)
+    return NULL_STATUS if code is None else STATUS_KEYS[code]
+
+
+def aggregate_rollup_rows(sources):
+    counts = Counter()
+    for kind, model in sources:
+        rows = model.objects.annotate(day=TruncDate('created_at')).values('day', 'status').annotate(n=Count('id'))
+        for row in rows:
+            counts[(kind, row['day'], normalize_status(row['status']))] += row['n']
+    return counts
+
+
+def normalize_statuses(apps, schema_editor):
+    """
+    Asigna el código normalizado a partir del texto existente, un UPDATE por cada valor distinto
+    """
+    DailyStatusRollup = apps.get_model('AppResolution', 'DailyStatusRollup')
+    sources = [('claim', apps.get_model('AppResolution', 'Claim')), ('request', apps.get_model('AppResolution', 'Request'))]
+    for _, model in sources:
+        for value in model.objects.exclude(status__isnull=True).values_list('status', flat=True).distinct():
+            model.objects.filter(status=value).update(status_code=status_code_for(value))
+
+    # El resumen diario usa la misma normalización, así que se recalcula
+    counts = aggregate_rollup_rows(sources)
+    DailyStatusRollup.objects.all().delete()
+    DailyStatusRollup.objects.bulk_create(
+        [
+            DailyStatusRollup(kind=kind, date=date, normalized_status=normalized_status, count=count)
+            for (kind, date, normalized_status), count in counts.items()
+        ],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('AppResolution', '0013_hot_path_indexes'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='claim',
+            name='claim_status_created_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='claim',
+            name='claim_status_lower_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='request',
+            name='request_status_created_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='request',
+            name='request_status_lower_idx',
+        ),
+        migrations.AddField(
+            model_name='claim',
+            name='status_code',
+            field=models.PositiveSmallIntegerField(choices=[(1, 'Pendiente'), (2, 'En Proceso'), (3, 'Completado'), (9, 'Otro')], null=True),
+        ),
+        migrations.AddField(
+            model_name='request',
+            name='status_code',
+            field=models.PositiveSmallIntegerField(choices=[(1, 'Pendiente'), (2, 'En Proceso'), (3, 'Completado'), (9, 'Otro')], null=True),
+        ),
+        migrations.RunPython(normalize_statuses, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='claim',
+            index=models.Index(fields=['status_code', 'created_at'], name='claim_status_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='request',
+            index=models.Index(fields=['status_code', 'created_at'], name='request_status_created_idx'),
+        ),
+    ]
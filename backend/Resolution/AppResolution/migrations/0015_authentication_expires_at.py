@@ -0,0 +1,30 @@
+# Generated by Django 5.2 on 2026-10-17 17:14
+
+import AppResolution.models
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('AppResolution', '0014_status_code'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='authentication',
+            name='expires_at',
+            field=models.DateTimeField(default=AppResolution.models.auth_code_expiry),
+        ),
+        migrations.AlterField(
+            model_name='authentication',
+            name='user',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='authentications', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddIndex(
+            model_name='authentication',
+            index=models.Index(fields=['expires_at'], name='auth_expires_idx'),
+        ),
+    ]
@@ -0,0 +1,44 @@
+from django.db import migrations
+
+# Configuración de texto fija de los índices; AppResolution.config.SEARCH_CONFIG debe
+# coincidir con ella para que las búsquedas puedan usarlos.
+SEARCH_CONFIG = 'spanish'
+
+# Índices GIN de búsqueda de texto completo. Solo existen en Postgres; en otros motores
+# la búsqueda usa icontains (ver AppResolution/utils/filters.py).
+SEARCH_INDEXES = (
+    ('Claim', 'claim_search_idx'),
+    ('Request', 'request_search_idx'),
+)
+
+
+def search_index(name):
+    from django.contrib.postgres.indexes import GinIndex
+    from django.contrib.postgres.search import SearchVector
+
+    return GinIndex(SearchVector('subject', 'description', config=SEARCH_CONFIG), name=name)
+
+
+def add_search_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for model_name, index_name in SEARCH_INDEXES:
+        schema_editor.add_index(apps.get_model('AppResolution', model_name), search_index(index_name))
+
+
+def remove_search_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for model_name, index_name in SEARCH_INDEXES:
+        schema_editor.remove_index(apps.get_model('AppResolution', model_name), search_index(index_name))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('AppResolution', '0016_emailoutbox'),
+    ]
+
+    operations = [
+        migrations.RunPython(add_search_indexes, remove_search_indexes),
+    ]
@@ -0,0 +1,37 @@
+from django.db import migrations, models
+from django.db.models import Count, Max
+
+
+def dedupe_authentications(apps, schema_editor):
+    """
+    Deja solo el código más reciente (mayor id) de cada usuario, el mismo que usaba la verificación
+    """
+    Authentication = apps.get_model('AppResolution', 'Authentication')
+    db_alias = schema_editor.connection.alias
+    duplicated = (
+        Authentication.objects.using(db_alias)
+        .values('user')
+        .annotate(latest=Max('id'), total=Count('id'))
+        .filter(total__gt=1)
+    )
+    for row in duplicated.iterator():
+        Authentication.objects.using(db_alias).filter(user_id=row['user']).exclude(id=row['latest']).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('AppResolution', '0017_search_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(dedupe_authentications, migrations.RunPython.noop),
+        migrations.RemoveIndex(
+            model_name='authentication',
+            name='auth_user_latest_idx',
+        ),
+        migrations.AddConstraint(
+            model_name='authentication',
+            constraint=models.UniqueConstraint(fields=['user'], name='auth_user_unique'),
+        ),
+    ]
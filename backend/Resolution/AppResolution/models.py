@@ -1,8 +1,79 @@
-from django.db import models
+from django.db import models, router, transaction, DatabaseError
 from django.contrib.auth.models import AbstractUser
 from django.utils import timezone
+from datetime import timedelta
+from AppResolution.config import AUTH_CODE_TTL_MINUTES, AUTH_CODE_RESEND_WINDOW_SECONDS
+from AppResolution.utils.status import Status, status_code_for
 
-class User(AbstractUser):
+class DirtyFieldsMixin:
+    """
+    Recuerda los valores leídos de la base de datos para que save() sobre una fila existente
+    actualice solo las columnas modificadas, y no ejecute nada si no cambió ninguna.
+    Con update_fields explícito se respeta lo indicado. Si la fila se borró después de leerla,
+    save() con cambios la vuelve a insertar como haría Django; sin cambios no hace nada.
+    """
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._snapshot()
+        return instance
+
+    def _snapshot(self, fields=None):
+        loaded = getattr(self, '_loaded_values', None) or {}
+        for field in self._meta.concrete_fields:
+            if field.attname not in self.__dict__:
+                continue  # campo diferido
+            if fields is None or field.name in fields or field.attname in fields:
+                loaded[field.attname] = getattr(self, field.attname)
+        self._loaded_values = loaded
+
+    def get_dirty_fields(self):
+        """
+        Nombres de los campos cambiados desde la última lectura o escritura, o None si la
+        instancia no se leyó de la base de datos
+        """
+        loaded = getattr(self, '_loaded_values', None)
+        if loaded is None:
+            return None
+        return {
+            field.name for field in self._meta.concrete_fields
+            if field.attname in loaded and field.attname in self.__dict__
+            and getattr(self, field.attname) != loaded[field.attname]
+        }
+
+    def save(self, *args, **kwargs):
+        if not self._state.adding and not args and not kwargs.get('force_insert') and kwargs.get('update_fields') is None:
+            dirty = self.get_dirty_fields()
+            if dirty is not None and self._meta.pk.name not in dirty:
+                if not dirty:
+                    return
+                kwargs['update_fields'] = dirty
+                using = kwargs.get('using') or router.db_for_write(self.__class__, instance=self)
+                try:
+                    # El savepoint deshace solo este intento si falla, sin marcar para rollback
+                    # la transacción que lo rodea
+                    with transaction.atomic(using=using):
+                        super().save(*args, **kwargs)
+                except DatabaseError as e:
+                    # Django lanza DatabaseError (la clase base, no un error del backend) cuando el
+                    # UPDATE con update_fields no encuentra la fila. Si la fila se borró después de
+                    # leerla, se repite un save() completo para que Django la vuelva a insertar
+                    if type(e) is not DatabaseError:
+                        raise
+                    del kwargs['update_fields']
+                    super().save(*args, **kwargs)
+                self._snapshot(kwargs.get('update_fields'))
+                return
+        super().save(*args, **kwargs)
+        self._snapshot(kwargs.get('update_fields'))
+
+    def refresh_from_db(self, using=None, fields=None, from_queryset=None):
+        super().refresh_from_db(using=using, fields=fields, from_queryset=from_queryset)
+        self._snapshot(fields)
+
+
+class User(DirtyFieldsMixin, AbstractUser):
     username = models.CharField(max_length=150, unique=True, null=True, blank=True)
     first_name = models.CharField(max_length=50)
     last_name = models.CharField(max_length=50)
@@ -17,31 +88,133 @@ class User(AbstractUser):
     REQUIRED_FIELDS = []
 
 
+def auth_code_expiry():
+    return timezone.now() + timedelta(minutes=AUTH_CODE_TTL_MINUTES)
+
+
 class Authentication(models.Model):
-    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='authentications')
+    # Un único código por usuario; la restricción única ya cubre las búsquedas por usuario
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='authentications', db_index=False)
     token = models.CharField(max_length=10, null=True)
+    expires_at = models.DateTimeField(default=auth_code_expiry)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['expires_at'], name='auth_expires_idx'),
+        ]
+        constraints = [
+            models.UniqueConstraint(fields=['user'], name='auth_user_unique'),
+        ]
+
+    def is_expired(self, now=None):
+        return self.expires_at <= (now or timezone.now())
+
+    def issued_at(self):
+        return self.expires_at - timedelta(minutes=AUTH_CODE_TTL_MINUTES)
+
+    def in_resend_window(self, now=None):
+        """
+        El código sigue vigente y se emitió hace menos de AUTH_CODE_RESEND_WINDOW_SECONDS
+        """
+        now = now or timezone.now()
+        return not self.is_expired(now) and now < self.issued_at() + timedelta(seconds=AUTH_CODE_RESEND_WINDOW_SECONDS)
 
 
-class Claim(models.Model):
+class StatusCodeMixin:
+    """
+    Mantiene status_code sincronizado con el texto de status en cada save()
+    """
+
+    def save(self, *args, **kwargs):
+        # El código normalizado siempre se deriva del texto que envía la API
+        self.status_code = status_code_for(self.status)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'status' in update_fields:
+            kwargs['update_fields'] = {*update_fields, 'status_code'}
+        # pre_save bloquea la fila para leer el estado anterior (signals.remember_previous_status);
+        # la transacción mantiene el bloqueo hasta que post_save aplica el cambio al resumen diario
+        using = kwargs.get('using') or router.db_for_write(self.__class__, instance=self)
+        with transaction.atomic(using=using, savepoint=False):
+            super().save(*args, **kwargs)
+
+
+class Claim(StatusCodeMixin, DirtyFieldsMixin, models.Model):
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='claims')
     subject = models.CharField(max_length=500, null=True)
     description = models.CharField(max_length=500, null=True)
     status = models.CharField(max_length=255, null=True)
+    status_code = models.PositiveSmallIntegerField(choices=Status.choices, null=True)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['user', 'created_at'], name='claim_user_created_idx'),
+            models.Index(fields=['status_code', 'created_at'], name='claim_status_created_idx'),
+            models.Index(fields=['created_at', 'id'], name='claim_created_id_idx'),
+        ]
+
 
-class Request(models.Model):
+class Request(StatusCodeMixin, DirtyFieldsMixin, models.Model):
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='requests')
     subject = models.CharField(max_length=500, null=True)
     description = models.CharField(max_length=500, null=True)
     status = models.CharField(max_length=255, null=True)
+    status_code = models.PositiveSmallIntegerField(choices=Status.choices, null=True)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['user', 'created_at'], name='request_user_created_idx'),
+            models.Index(fields=['status_code', 'created_at'], name='request_status_created_idx'),
+            models.Index(fields=['created_at', 'id'], name='request_created_id_idx'),
+        ]
 
-class Profile(models.Model):
+
+class Profile(DirtyFieldsMixin, models.Model):
     first_name = models.CharField(max_length=50)
     last_name = models.CharField(max_length=50)
     email = models.EmailField(max_length=50)
     password = models.CharField(max_length=128)
     phone = models.CharField(max_length=15, null=True, blank=True)
-    photo = models.CharField(max_length=255)
\ No newline at end of file
+    photo = models.CharField(max_length=255)
+
+class DailyStatusRollup(models.Model):
+    KIND_CHOICES = [
+        ('claim', 'Reclamo'),
+        ('request', 'Solicitud'),
+    ]
+
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES)
+    date = models.DateField()
+    normalized_status = models.CharField(max_length=20)
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['kind', 'date', 'normalized_status'], name='unique_daily_status_rollup'),
+        ]
+
+
+class EmailOutbox(models.Model):
+    STATUS_CHOICES = [
+        ('pending', 'Pendiente'),
+        ('sending', 'Enviando'),
+        ('sent', 'Enviado'),
+        ('failed', 'Fallido'),
+    ]
+
+    to_email = models.EmailField(max_length=50)
+    subject = models.CharField(max_length=255)
+    html_body = models.TextField()
+    text_body = models.TextField()
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='pending')
+    attempts = models.IntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True, default='')
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', 'next_attempt_at'], name='outbox_due_idx'),
+        ]
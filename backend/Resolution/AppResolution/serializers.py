@@ -1,6 +1,6 @@
 from AppResolution.models import User, Authentication, Claim, Request, Profile
 from rest_framework import serializers
-from django.contrib.auth.hashers import make_password
+from AppResolution.utils.passwords import hash_password
 
 class user_serializer(serializers.ModelSerializer):
     profile = serializers.PrimaryKeyRelatedField(read_only=True)
@@ -24,7 +24,7 @@ class user_serializer(serializers.ModelSerializer):
         if not validated_data.get('username'):
             validated_data['username'] = validated_data['email']
             
-        validated_data['password'] = make_password(validated_data['password'])
+        validated_data['password'] = hash_password(validated_data['password'])
         validated_data['verified'] = 0
         return super().create(validated_data)
 
@@ -50,3 +50,105 @@ class profile_serializer(serializers.ModelSerializer):
         fields = ['id', 'first_name','last_name','email','password','phone', 'photo']
 
         
+class preloaded_user_field(serializers.PrimaryKeyRelatedField):
+    """
+    Resuelve el usuario contra context['users'] (precargado con una sola consulta)
+    en vez de hacer un SELECT por cada elemento de un lote
+    """
+    def to_internal_value(self, data):
+        users = self.context.get('users')
+        if users is None:
+            return super().to_internal_value(data)
+        if isinstance(data, bool):
+            self.fail('incorrect_type', data_type=type(data).__name__)
+        try:
+            return users[int(data)]
+        except KeyError:
+            self.fail('does_not_exist', pk_value=data)
+        except (TypeError, ValueError):
+            self.fail('incorrect_type', data_type=type(data).__name__)
+
+class claim_bulk_serializer(claim_serializer):
+    user = preloaded_user_field(queryset=User.objects.all())
+
+class request_bulk_serializer(request_serializer):
+    user = preloaded_user_field(queryset=User.objects.all())
+
+
+class InvalidFields(ValueError):
+    """
+    El parámetro fields pide campos que el listado no tiene
+    """
+
+
+class read_serializer:
+    """
+    Serializador de solo lectura para listados. Obtiene las filas con .values() y solo convierte
+    los campos que lo necesitan (fechas), sin instanciar modelos ni recorrer los campos de DRF
+    por cada fila. Los campos y su orden salen del ModelSerializer original, de modo que la salida
+    es idéntica a la de `source`.
+    """
+    source = None
+
+    # Tipos cuyo valor en la base de datos ya es la representación de DRF
+    PASSTHROUGH_FIELDS = (
+        serializers.IntegerField,
+        serializers.CharField,
+        serializers.BooleanField,
+        serializers.PrimaryKeyRelatedField,
+    )
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        readable = [(name, field) for name, field in cls.source().fields.items() if not field.write_only]
+        cls.model = cls.source.Meta.model
+        cls.fields = tuple(name for name, _ in readable)
+        cls.converters = {
+            name: field.to_representation
+            for name, field in readable
+            if not isinstance(field, cls.PASSTHROUGH_FIELDS)
+        }
+
+    @classmethod
+    def parse_fields(cls, value):
+        """
+        Interpreta el parámetro fields=a,b,c. Devuelve los campos pedidos en el orden del serializador,
+        o todos si el parámetro está vacío.
+        """
+        if not value:
+            return cls.fields
+        requested = {name.strip() for name in value.split(',') if name.strip()}
+        unknown = requested - set(cls.fields)
+        if unknown:
+            raise InvalidFields(
+                f"Campos no válidos: {', '.join(sorted(unknown))}. Disponibles: {', '.join(cls.fields)}"
+            )
+        return tuple(name for name in cls.fields if name in requested)
+
+    @classmethod
+    def project(cls, queryset, fields=None):
+        return queryset.values(*(fields or cls.fields))
+
+    @classmethod
+    def serialize(cls, rows, fields=None):
+        converters = [
+            (name, convert) for name, convert in cls.converters.items() if fields is None or name in fields
+        ]
+        for row in rows:
+            for name, convert in converters:
+                value = row[name]
+                if value is not None:
+                    row[name] = convert(value)
+        return rows
+
+class claim_read_serializer(read_serializer):
+    source = claim_serializer
+
+class request_read_serializer(read_serializer):
+    source = request_serializer
+
+class user_read_serializer(read_serializer):
+    source = user_serializer
+
+class profile_read_serializer(read_serializer):
+    source = profile_serializer
@@ -0,0 +1,52 @@
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.dispatch import receiver
+
+from AppResolution.models import User, Claim, Request
+from AppResolution.utils.permissions import admin_flags
+from AppResolution.utils.rollup import record_created, record_deleted, record_status_change
+
+# Mantiene DailyStatusRollup al día con cada alta, cambio de estado o baja.
+# Las operaciones masivas (bulk_create, QuerySet.update/delete) no disparan estas señales
+# y deben actualizar el resumen por su cuenta.
+
+ROLLUP_KINDS = {Claim: 'claim', Request: 'request'}
+
+
+@receiver(pre_save, sender=Claim)
+@receiver(pre_save, sender=Request)
+def remember_previous_status(sender, instance, update_fields=None, **kwargs):
+    instance._rollup_previous_status = None
+    if instance.pk is None or (update_fields is not None and 'status' not in update_fields):
+        return
+    # Con la fila bloqueada dos cambios de estado simultáneos no pueden partir del mismo estado
+    # anterior y aplicar dos veces el mismo -1/+1; StatusCodeMixin.save abre la transacción
+    previous = sender.objects.select_for_update().filter(pk=instance.pk).values_list('status', 'created_at').first()
+    if previous is not None:
+        instance._rollup_previous_status = previous
+
+
+@receiver(post_save, sender=Claim)
+@receiver(post_save, sender=Request)
+def update_rollup_on_save(sender, instance, created, **kwargs):
+    kind = ROLLUP_KINDS[sender]
+    if created:
+        record_created(kind, instance.created_at, instance.status)
+        return
+    previous = getattr(instance, '_rollup_previous_status', None)
+    if previous is not None:
+        previous_status, created_at = previous
+        record_status_change(kind, created_at, previous_status, instance.status)
+
+
+@receiver(post_delete, sender=Claim)
+@receiver(post_delete, sender=Request)
+def update_rollup_on_delete(sender, instance, **kwargs):
+    record_deleted(ROLLUP_KINDS[sender], instance.created_at, instance.status)
+
+
+# Cualquier alta, cambio o baja de un usuario (por ejemplo UserView.patch con is_admin)
+# descarta su bandera de administrador en caché.
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_admin_flag(sender, instance, **kwargs):
+    admin_flags.invalidate(instance.pk)
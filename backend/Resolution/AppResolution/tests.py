@@ -1,19 +1,66 @@
+import asyncio
 import json
-from django.test import TestCase, Client
-from django.urls import reverse
+import os
+import threading
+import time
+import tracemalloc
+import csv
+import importlib
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from unittest import skipUnless
+from django.test import TestCase, TransactionTestCase, Client, AsyncClient
+from django.test.utils import CaptureQueriesContext
+from django.db import connection, transaction, IntegrityError
+from django.db.transaction import TransactionManagementError
+from django.core.exceptions import ImproperlyConfigured
+from django.db.migrations.executor import MigrationExecutor
+from django.db.models.query import QuerySet
+from django.db.utils import load_backend
+from django.core.management import call_command
+from django.core.cache import cache
+from io import StringIO, BytesIO
+from django.urls import reverse, resolve, path, include
+from asgiref.sync import async_to_sync
 from django.contrib.auth.hashers import check_password, make_password
 from django.utils import timezone
 from datetime import timedelta
-from rest_framework.test import APITestCase, APIClient
+from rest_framework.test import APITestCase, APIClient, APIRequestFactory
 from rest_framework import status
 from unittest.mock import patch, MagicMock
 
-from AppResolution.models import User, Authentication, Claim, Request, Profile
+from AppResolution.models import User, Authentication, Claim, Request, Profile, DailyStatusRollup, EmailOutbox
+from AppResolution.views import AuthenticationView
 from AppResolution.serializers import (
+    claim_read_serializer, request_read_serializer, user_read_serializer, profile_read_serializer,
     user_serializer, authentication_serializer, claim_serializer, 
     request_serializer, profile_serializer
 )
-from AppResolution.utils.authToken import generate_auth_code, get_latest_auth_code
+from AppResolution.utils.authToken import generate_auth_code, verify_auth_code, store_auth_code
+from AppResolution.utils.reports import build_report
+from AppResolution.utils.rollup import rebuild_rollup
+from AppResolution.utils.status import Status, status_code_for
+from AppResolution.utils.sweeper import purge_expired_auth_codes
+from AppResolution.utils.permissions import AdminFlagCache, admin_flags
+from AppResolution.utils.tokens import issue_token, read_token, InvalidToken
+from AppResolution.utils.filters import filter_items, search_queryset
+from AppResolution.utils import renderers as fast_renderers
+from AppResolution.utils.renderers import FastJSONRenderer, FastJSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.exceptions import ParseError
+from decimal import Decimal
+from django.utils.translation import gettext_lazy
+from django.test import override_settings
+from django.contrib.auth.hashers import PBKDF2PasswordHasher, identify_hasher
+from AppResolution.utils import passwords
+from AppResolution.utils.passwords import check_user_password, hash_password, verify_password, password_executor, shutdown_password_executor
+from AppResolution.utils.outbox import enqueue_auth_email, drain_outbox, FakeTransport
+from AppResolution.utils.send import EmailQuotaExceeded, send_email_message, render_auth_email
+from AppResolution.urls import build_urlpatterns
+from AppResolution.config import (
+    ACCESS_TOKEN_TTL_SECONDS, SEARCH_CONFIG,
+    AUTH_CODE_TTL_MINUTES, AUTH_CODE_RESEND_WINDOW_SECONDS, OUTBOX_MAX_ATTEMPTS, OUTBOX_RETRY_BASE_SECONDS, OUTBOX_QUOTA_BACKOFF_SECONDS
+)
 
 
 class UserModelTest(TestCase):
@@ -315,13 +362,11 @@ class AuthenticationViewTest(APITestCase):
             password='password123'
         )
     
-    @patch('AppResolution.views.send_auth_email')
+    @patch('AppResolution.views.enqueue_auth_email')
     @patch('AppResolution.views.generate_auth_code')
-    @patch('AppResolution.views.get_latest_auth_code')
-    def test_generate_auth_code(self, mock_get_code, mock_generate, mock_send_email):
+    def test_generate_auth_code(self, mock_generate, mock_send_email):
         """Test generar código de autenticación"""
         mock_generate.return_value = '123456'
-        mock_get_code.return_value = '123456'
         mock_send_email.return_value = True
         
         response = self.client.get(f'/api/auth/{self.user.id}')
@@ -370,6 +415,381 @@ class AuthenticationViewTest(APITestCase):
         self.assertTrue(response.data['success'])
 
 
+class AuthCodeExpiryTest(APITestCase):
+    """Tests para el vencimiento de los códigos de verificación"""
+    
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create(
+            first_name='Test',
+            last_name='User',
+            email='test@test.com',
+            password='password123'
+        )
+    
+    def test_expired_code_is_rejected(self):
+        """Test un código vencido no verifica aunque el barrido no se haya ejecutado"""
+        Authentication.objects.create(user=self.user, token='123456', expires_at=timezone.now() - timedelta(seconds=1))
+        data = {'user_id': self.user.id, 'code': '123456'}
+        
+        response = self.client.post('/api/auth', data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(response.data['success'])
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.verified, 0)
+        
+        response = self.client.put('/api/auth', data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+    
+    def test_new_code_expires_after_ttl(self):
+        """Test los códigos nuevos vencen según la vigencia configurada"""
+        before = timezone.now()
+        auth = Authentication.objects.create(user=self.user, token='123456')
+        self.assertGreaterEqual(auth.expires_at, before + timedelta(minutes=AUTH_CODE_TTL_MINUTES))
+        self.assertFalse(auth.is_expired())
+    
+    def test_sweeper_deletes_expired_in_batches(self):
+        """Test el barrido elimina solo los códigos vencidos"""
+        past = timezone.now() - timedelta(minutes=1)
+        for i in range(5):
+            user = User.objects.create(first_name='Test', last_name='User', email=f'expired{i}@test.com', password='x')
+            Authentication.objects.create(user=user, token=str(i), expires_at=past)
+        valid = Authentication.objects.create(user=self.user, token='999999')
+        
+        with self.assertNumQueries(6):
+            deleted = purge_expired_auth_codes(batch_size=2)
+        self.assertEqual(deleted, 5)
+        self.assertEqual(list(Authentication.objects.values_list('id', flat=True)), [valid.id])
+    
+    def test_sweeper_command(self):
+        """Test comando de barrido"""
+        Authentication.objects.create(user=self.user, token='1', expires_at=timezone.now() - timedelta(minutes=1))
+        out = StringIO()
+        call_command('purge_expired_auth_codes', stdout=out)
+        self.assertIn('1', out.getvalue())
+        self.assertEqual(Authentication.objects.count(), 0)
+
+
+class AuthCodeResendTest(APITestCase):
+    """Tests para la ventana de reenvío de códigos de verificación, con el reloj congelado"""
+    
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create(
+            first_name='Test',
+            last_name='User',
+            email='test@test.com',
+            password='password123'
+        )
+        self.url = f'/api/auth/{self.user.id}'
+        self.start = timezone.now()
+    
+    def get_at(self, moment):
+        with patch('django.utils.timezone.now', return_value=moment):
+            return self.client.get(self.url)
+    
+    def test_resend_within_window_reuses_code(self):
+        """Test un reenvío dentro de la ventana devuelve el mismo código sin escribir ni encolar correo"""
+        first = self.get_at(self.start)
+        self.assertEqual(first.status_code, status.HTTP_200_OK)
+        self.assertTrue(first.data['resent'])
+        self.assertEqual(EmailOutbox.objects.count(), 1)
+        
+        with CaptureQueriesContext(connection) as queries:
+            second = self.get_at(self.start + timedelta(seconds=AUTH_CODE_RESEND_WINDOW_SECONDS - 1))
+        self.assertEqual(second.status_code, status.HTTP_200_OK)
+        self.assertFalse(second.data['resent'])
+        self.assertEqual(second.data['auth_code'], first.data['auth_code'])
+        self.assertEqual(EmailOutbox.objects.count(), 1)
+        writes = [q['sql'] for q in queries.captured_queries if q['sql'].split()[0] in ('INSERT', 'UPDATE', 'DELETE')]
+        self.assertEqual(writes, [])
+    
+    def test_resend_after_window_replaces_code_in_place(self):
+        """Test pasada la ventana se genera un código nuevo en la misma fila y se encola otro correo"""
+        first = self.get_at(self.start)
+        auth_id = Authentication.objects.get(user=self.user).id
+        
+        later = self.start + timedelta(seconds=AUTH_CODE_RESEND_WINDOW_SECONDS)
+        with patch('AppResolution.views.generate_auth_code', return_value='654321'):
+            second = self.get_at(later)
+        self.assertTrue(second.data['resent'])
+        self.assertEqual(second.data['auth_code'], '654321')
+        self.assertNotEqual(first.data['auth_code'], '654321')
+        
+        auth = Authentication.objects.get(user=self.user)
+        self.assertEqual(auth.id, auth_id)
+        self.assertEqual(auth.token, '654321')
+        self.assertEqual(auth.expires_at, later + timedelta(minutes=AUTH_CODE_TTL_MINUTES))
+        self.assertEqual(EmailOutbox.objects.count(), 2)
+    
+    def test_expired_code_is_never_reused(self):
+        """Test un código vencido se reemplaza aunque se haya emitido dentro de la ventana"""
+        Authentication.objects.create(user=self.user, token='123456', expires_at=self.start)
+        with patch('AppResolution.models.AUTH_CODE_RESEND_WINDOW_SECONDS', AUTH_CODE_TTL_MINUTES * 60 * 2):
+            response = self.get_at(self.start)
+        self.assertTrue(response.data['resent'])
+        self.assertNotEqual(Authentication.objects.get(user=self.user).token, '123456')
+    
+    def test_reused_code_verifies(self):
+        """Test el código reutilizado sigue verificando al usuario"""
+        first = self.get_at(self.start)
+        second = self.get_at(self.start + timedelta(seconds=1))
+        self.assertEqual(second.data['auth_code'], first.data['auth_code'])
+        
+        with patch('django.utils.timezone.now', return_value=self.start + timedelta(seconds=2)):
+            response = self.client.post('/api/auth', {'user_id': self.user.id, 'code': second.data['auth_code']}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.data['success'])
+    
+    def test_new_code_is_a_single_statement(self):
+        """Test emitir o reemplazar un código escribe con una sola sentencia"""
+        for moment in (self.start, self.start + timedelta(seconds=AUTH_CODE_RESEND_WINDOW_SECONDS)):
+            with CaptureQueriesContext(connection) as queries:
+                response = self.get_at(moment)
+            self.assertTrue(response.data['resent'])
+            writes = [q['sql'] for q in queries.captured_queries if 'authentication' in q['sql'].lower() and q['sql'].split()[0] != 'SELECT']
+            self.assertEqual(len(writes), 1, writes)
+            if connection.vendor in ('postgresql', 'sqlite'):
+                self.assertIn('ON CONFLICT', writes[0])
+        self.assertEqual(Authentication.objects.filter(user=self.user).count(), 1)
+        self.assertEqual(response.data['data']['id'], Authentication.objects.get(user=self.user).id)
+
+
+class AuthenticationUpsertTest(TestCase):
+    """Tests para store_auth_code y la restricción de un código por usuario"""
+    
+    def setUp(self):
+        self.user = User.objects.create(first_name='Test', last_name='User', email='test@test.com', password='x')
+        self.expires_at = timezone.now() + timedelta(minutes=AUTH_CODE_TTL_MINUTES)
+    
+    def test_store_creates_then_replaces(self):
+        """Test la primera llamada crea la fila y las siguientes la reemplazan"""
+        first = store_auth_code(self.user.id, '111111', self.expires_at)
+        later = self.expires_at + timedelta(minutes=1)
+        second = store_auth_code(self.user.id, '222222', later)
+        self.assertEqual(first.id, second.id)
+        auth = Authentication.objects.get(user=self.user)
+        self.assertEqual((auth.id, auth.token, auth.expires_at), (first.id, '222222', later))
+    
+    def test_fallback_on_other_backends(self):
+        """Test en motores sin ON CONFLICT se usa update_or_create con el mismo resultado"""
+        with patch.object(connection, 'vendor', 'mysql'):
+            first = store_auth_code(self.user.id, '111111', self.expires_at)
+            second = store_auth_code(self.user.id, '222222', self.expires_at)
+        self.assertEqual(first.id, second.id)
+        self.assertEqual(Authentication.objects.get(user=self.user).token, '222222')
+    
+    def test_second_row_per_user_is_rejected(self):
+        """Test la base de datos rechaza un segundo código para el mismo usuario"""
+        Authentication.objects.create(user=self.user, token='111111')
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            Authentication.objects.create(user=self.user, token='222222')
+
+
+class AuthenticationDedupeMigrationTest(TransactionTestCase):
+    """Tests para la migración 0018, que deja un solo código por usuario"""
+    
+    migrate_from = [('AppResolution', '0017_search_indexes')]
+    migrate_to = [('AppResolution', '0018_authentication_unique_user')]
+    
+    def migrate(self, targets):
+        executor = MigrationExecutor(connection)
+        executor.migrate(targets)
+        return executor.loader.project_state(targets).apps
+    
+    def tearDown(self):
+        executor = MigrationExecutor(connection)
+        executor.migrate(executor.loader.graph.leaf_nodes())
+    
+    def test_keeps_latest_code_per_user(self):
+        """Test la migración conserva el código de mayor id de cada usuario"""
+        apps = self.migrate(self.migrate_from)
+        OldUser = apps.get_model('AppResolution', 'User')
+        OldAuthentication = apps.get_model('AppResolution', 'Authentication')
+        user = OldUser.objects.create(username='dup', email='dup@test.com', password='x')
+        other = OldUser.objects.create(username='single', email='single@test.com', password='x')
+        for token in ('111111', '222222', '333333'):
+            OldAuthentication.objects.create(user=user, token=token)
+        single = OldAuthentication.objects.create(user=other, token='444444')
+        
+        apps = self.migrate(self.migrate_to)
+        NewAuthentication = apps.get_model('AppResolution', 'Authentication')
+        self.assertEqual(
+            sorted(NewAuthentication.objects.values_list('user_id', 'token')),
+            sorted([(user.id, '333333'), (other.id, single.token)])
+        )
+
+
+class EmailOutboxTest(APITestCase):
+    """Tests para la cola de correos salientes"""
+    
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create(
+            first_name='Test',
+            last_name='User',
+            email='test@test.com',
+            password='password123'
+        )
+    
+    def enqueue(self, count):
+        for i in range(count):
+            enqueue_auth_email(f'{i:06d}', f'user{i}@test.com')
+    
+    def test_request_only_enqueues(self):
+        """Test AuthenticationView.get encola el correo sin llamar al proveedor"""
+        with patch('AppResolution.utils.outbox.send_email_message') as mock_send:
+            started = time.perf_counter()
+            response = self.client.get(f'/api/auth/{self.user.id}')
+            elapsed = time.perf_counter() - started
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        mock_send.assert_not_called()
+        message = EmailOutbox.objects.get()
+        self.assertEqual(message.to_email, 'test@test.com')
+        self.assertEqual(message.status, 'pending')
+        self.assertIn(response.data['auth_code'], message.text_body)
+        self.assertLess(elapsed, 1.0)
+    
+    def test_code_is_not_printed_or_logged(self):
+        """Test el código generado no se escribe en la consola ni en los logs"""
+        with patch('sys.stdout', new_callable=StringIO) as stdout, self.assertLogs('AppResolution.views', 'DEBUG') as logs:
+            response = self.client.get(f'/api/auth/{self.user.id}')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        code = response.data['auth_code']
+        self.assertNotIn(code, stdout.getvalue())
+        self.assertFalse([line for line in logs.output if code in line])
+    
+    def test_drain_sends_pending(self):
+        """Test el worker envía todos los mensajes pendientes"""
+        self.enqueue(7)
+        transport = FakeTransport()
+        stats = drain_outbox(transport, max_workers=3, batch_size=3)
+        self.assertEqual(stats['sent'], 7)
+        self.assertEqual(len(transport.sent), 7)
+        self.assertEqual(EmailOutbox.objects.filter(status='sent').count(), 7)
+        self.assertEqual(drain_outbox(transport)['sent'], 0)
+    
+    def test_sent_and_failed_messages_drop_the_code(self):
+        """Test los mensajes enviados o fallidos no conservan el código en el cuerpo"""
+        self.enqueue(2)
+        failing = EmailOutbox.objects.get(to_email='user1@test.com')
+        EmailOutbox.objects.filter(id=failing.id).update(attempts=OUTBOX_MAX_ATTEMPTS - 1)
+        transport = FakeTransport(fail=lambda message: Exception('500') if message.id == failing.id else None)
+        stats = drain_outbox(transport)
+        self.assertEqual((stats['sent'], stats['failed']), (1, 1))
+        self.assertEqual(transport.sent[0][0], 'user0@test.com')
+        self.assertIn('000000', transport.sent[0][2])
+        for message in EmailOutbox.objects.all():
+            self.assertEqual((message.html_body, message.text_body), ('', ''), message.status)
+            self.assertEqual(message.subject, 'Código de Verificación - Resolution')
+    
+    def test_loop_commands_close_old_connections(self):
+        """Test los comandos con --loop renuevan las conexiones en cada pasada"""
+        class StopLoop(Exception):
+            pass
+        
+        for name in ('drain_email_outbox', 'purge_expired_auth_codes'):
+            module = f'AppResolution.management.commands.{name}'
+            with patch(f'{module}.close_old_connections') as close, patch(f'{module}.time.sleep', side_effect=[None, StopLoop]):
+                with self.assertRaises(StopLoop):
+                    call_command(name, '--loop', stdout=StringIO())
+            self.assertEqual(close.call_count, 2, name)
+    
+    def test_failure_is_retried_with_backoff(self):
+        """Test un error se reintenta más tarde y termina en fallido tras el máximo de intentos"""
+        self.enqueue(1)
+        transport = FakeTransport(fail=lambda message: Exception('Error del servidor de correo: 500'))
+        before = timezone.now()
+        stats = drain_outbox(transport)
+        self.assertEqual(stats['retried'], 1)
+        message = EmailOutbox.objects.get()
+        self.assertEqual(message.status, 'pending')
+        self.assertEqual(message.attempts, 1)
+        self.assertGreaterEqual(message.next_attempt_at, before + timedelta(seconds=OUTBOX_RETRY_BASE_SECONDS))
+        
+        EmailOutbox.objects.update(attempts=OUTBOX_MAX_ATTEMPTS - 1, next_attempt_at=timezone.now())
+        stats = drain_outbox(transport)
+        self.assertEqual(stats['failed'], 1)
+        self.assertEqual(EmailOutbox.objects.get().status, 'failed')
+    
+    def test_quota_response_stops_draining(self):
+        """Test una respuesta 422 pospone los mensajes sin contarla como intento"""
+        self.enqueue(4)
+        transport = FakeTransport(fail=lambda message: EmailQuotaExceeded('422'))
+        stats = drain_outbox(transport, batch_size=2)
+        self.assertTrue(stats['quota_exceeded'])
+        # Solo se intentó el primer lote
+        self.assertEqual(EmailOutbox.objects.filter(last_error__startswith='Límite').count(), 2)
+        postponed = EmailOutbox.objects.filter(last_error__startswith='Límite').first()
+        self.assertEqual(postponed.attempts, 0)
+        self.assertGreater(postponed.next_attempt_at, timezone.now() + timedelta(seconds=OUTBOX_QUOTA_BACKOFF_SECONDS - 60))
+    
+    def test_mailersend_422_raises_quota(self):
+        """Test el transporte de MailerSend traduce la respuesta 422"""
+        with patch('AppResolution.utils.send.emails.NewEmail') as mock_mailer:
+            mock_mailer.return_value.send.return_value = 422
+            with self.assertRaises(EmailQuotaExceeded):
+                send_email_message('test@test.com', 'Asunto', '<p></p>', '')
+    
+    def test_auth_email_shows_configured_ttl(self):
+        """Test el correo del código indica la vigencia configurada"""
+        with patch('AppResolution.utils.send.AUTH_CODE_TTL_MINUTES', 25):
+            subject, html_content, text_content = render_auth_email('123456', 'test@test.com')
+        self.assertIn('<strong>25 minutos</strong>', html_content)
+        self.assertIn('expirará en 25 minutos', text_content)
+        self.assertNotIn('10 minutos', html_content + text_content)
+
+
+class AuthCodeConcurrencyTest(TestCase):
+    """Prueba de estrés: peticiones simultáneas a AuthenticationView.get"""
+    
+    CALLS = 2000
+    
+    def test_stored_token_matches_emailed_token(self):
+        """Test bajo concurrencia cada usuario recibe por correo el mismo código que se guarda"""
+        users = {
+            user_id: User(id=user_id, email=f'user{user_id}@test.com', first_name='Test', last_name='User')
+            for user_id in range(1, self.CALLS + 1)
+        }
+        stored, emailed, lock = {}, {}, threading.Lock()
+        
+        def create(user_id, token, expires_at):
+            with lock:
+                stored[int(user_id)] = token
+            return Authentication(id=int(user_id), user_id=int(user_id), token=token)
+        
+        def enqueue(token, email):
+            with lock:
+                emailed[email] = token
+        
+        # Sin base de datos: la prueba aísla la generación y el uso del código en la vista
+        view = AuthenticationView.as_view()
+        factory = APIRequestFactory()
+        
+        def call(user_id):
+            response = view(factory.get(f'/api/auth/{user_id}'), pkid=user_id)
+            return user_id, response.status_code, response.data['auth_code']
+        
+        locked_users = MagicMock()
+        locked_users.get.side_effect = lambda id: users[int(id)]
+        no_previous_code = MagicMock()
+        no_previous_code.first.return_value = None
+        
+        with patch.object(User.objects, 'select_for_update', return_value=locked_users), \
+             patch.object(Authentication.objects, 'filter', return_value=no_previous_code), \
+             patch('AppResolution.views.store_auth_code', side_effect=create), \
+             patch('AppResolution.views.enqueue_auth_email', side_effect=enqueue), \
+             patch('builtins.print'):
+            with ThreadPoolExecutor(max_workers=32) as pool:
+                results = list(pool.map(call, users))
+        
+        self.assertEqual(len(results), self.CALLS)
+        for user_id, status_code, returned_code in results:
+            self.assertEqual(status_code, status.HTTP_200_OK)
+            self.assertEqual(stored[user_id], emailed[users[user_id].email])
+            self.assertEqual(stored[user_id], returned_code)
+
+
 class ClaimViewTest(APITestCase):
     """Tests para ClaimView"""
     
@@ -558,6 +978,406 @@ class RequestViewTest(APITestCase):
         self.assertEqual(Request.objects.count(), 0)
 
 
+class ReadSerializerContractTest(APITestCase):
+    """Tests de contrato: los serializadores de lectura producen la misma salida que los ModelSerializer"""
+    
+    def setUp(self):
+        self.profile = Profile.objects.create(
+            first_name='Perfil', last_name='Ñúñez', email='perfil@test.com', password='hash', phone=None, photo='foto.png'
+        )
+        self.user = User.objects.create(
+            first_name='Test', last_name='Usuario', email='test@test.com', username='test@test.com',
+            password='hash', phone='555', verified=1, is_admin=True, profile=self.profile
+        )
+        User.objects.create(first_name='Sin', last_name='Perfil', email='otro@test.com', password='hash')
+        Claim.objects.create(user=self.user, subject='Reclamo «uno»', description='Línea\u2028dos', status='Pendiente')
+        Claim.objects.create(user=self.user, subject='Sin estado', description='D', status=None)
+        Claim.objects.filter(subject='Sin estado').update(created_at=timezone.now().replace(microsecond=0))
+        Request.objects.create(user=self.user, subject='Solicitud', description='D', status='En Proceso')
+    
+    def assertSameOutput(self, read_class, model_serializer, queryset):
+        queryset = queryset.order_by('pk')
+        expected = JSONRenderer().render(model_serializer(queryset, many=True).data)
+        actual = JSONRenderer().render(read_class.serialize(list(read_class.project(queryset))))
+        self.assertEqual(actual, expected)
+    
+    def test_outputs_are_byte_identical(self):
+        """Test cada serializador de lectura coincide byte a byte con el original"""
+        self.assertSameOutput(claim_read_serializer, claim_serializer, Claim.objects.all())
+        self.assertSameOutput(request_read_serializer, request_serializer, Request.objects.all())
+        self.assertSameOutput(user_read_serializer, user_serializer, User.objects.all())
+        self.assertSameOutput(profile_read_serializer, profile_serializer, Profile.objects.all())
+    
+    def test_fields_follow_model_serializer(self):
+        """Test los campos y su orden salen del ModelSerializer, sin los de solo escritura"""
+        self.assertEqual(claim_read_serializer.fields, ('id', 'user', 'subject', 'description', 'status', 'created_at'))
+        self.assertNotIn('password', user_read_serializer.fields)
+        self.assertEqual(set(claim_read_serializer.converters), {'created_at'})
+    
+    def test_list_endpoints_keep_their_output(self):
+        """Test los listados de la API devuelven lo mismo que antes, con y sin cursor"""
+        cases = [
+            ('/api/claim', claim_serializer, Claim.objects.order_by('pk')),
+            ('/api/request', request_serializer, Request.objects.order_by('pk')),
+            ('/api/user', user_serializer, User.objects.order_by('pk')),
+            ('/api/profile', profile_serializer, Profile.objects.order_by('pk')),
+        ]
+        for url, model_serializer, queryset in cases:
+            response = self.client.get(url)
+            self.assertEqual(response.content, JSONRenderer().render(model_serializer(queryset, many=True).data), url)
+        
+        response = self.client.get('/api/claim?page_size=1')
+        expected = claim_serializer(Claim.objects.order_by('-created_at', '-id')[:1], many=True).data
+        self.assertEqual(JSONRenderer().render(response.data['results']), JSONRenderer().render(expected))
+        response = self.client.get(f"/api/claim?page_size=1&cursor={response.data['next_cursor']}")
+        self.assertEqual(len(response.data['results']), 1)
+        self.assertIsNone(response.data['next_cursor'])
+
+
+class SparseFieldsetTest(APITestCase):
+    """Tests para el parámetro fields de los listados"""
+    
+    def setUp(self):
+        self.user = User.objects.create(first_name='Test', last_name='User', email='test@test.com', password='hash', phone='555')
+        Profile.objects.create(first_name='Perfil', last_name='P', email='perfil@test.com', password='hash', photo='foto.png')
+        for i in range(3):
+            Claim.objects.create(user=self.user, subject=f'Reclamo {i}', description='Descripción larga ' * 20, status='Pendiente')
+            Request.objects.create(user=self.user, subject=f'Solicitud {i}', description='Descripción larga ' * 20, status='Pendiente')
+    
+    def test_fields_limit_output_and_sql(self):
+        """Test solo se consultan y devuelven los campos pedidos"""
+        for url, table in (('/api/claim', Claim._meta.db_table), ('/api/request', Request._meta.db_table)):
+            with CaptureQueriesContext(connection) as context:
+                response = self.client.get(f'{url}?fields=status,id,subject,created_at')
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertEqual([list(item) for item in response.data], [['id', 'subject', 'status', 'created_at']] * 3)
+            sql = [q['sql'] for q in context.captured_queries if f'FROM "{table}"' in q['sql']]
+            self.assertEqual(len(sql), 1)
+            self.assertNotIn('"description"', sql[0])
+            self.assertNotIn('"user_id"', sql[0])
+    
+    def test_fields_with_cursor_pagination(self):
+        """Test las claves del cursor se consultan pero no se devuelven si no se pidieron"""
+        response = self.client.get('/api/claim?fields=subject&page_size=2')
+        self.assertEqual(response.data['results'], [{'subject': 'Reclamo 2'}, {'subject': 'Reclamo 1'}])
+        response = self.client.get(f"/api/claim?fields=subject&page_size=2&cursor={response.data['next_cursor']}")
+        self.assertEqual(response.data['results'], [{'subject': 'Reclamo 0'}])
+        self.assertIsNone(response.data['next_cursor'])
+        
+        response = self.client.get(f'/api/claim/user/{self.user.id}?fields=id&page_size=5')
+        self.assertEqual(len(response.data['results']), 3)
+        self.assertEqual(set(response.data['results'][0]), {'id'})
+    
+    def test_user_and_profile_lists(self):
+        """Test el parámetro fields también aplica a usuarios y perfiles"""
+        response = self.client.get('/api/user?fields=email,id')
+        self.assertEqual(response.data, [{'id': self.user.id, 'email': 'test@test.com'}])
+        response = self.client.get('/api/profile?fields=photo&page_size=10')
+        self.assertEqual(response.data['results'], [{'photo': 'foto.png'}])
+    
+    def test_invalid_fields(self):
+        """Test campos desconocidos o de solo escritura devuelven 400"""
+        response = self.client.get('/api/claim?fields=id,secreto')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('secreto', response.data['error'])
+        response = self.client.get('/api/user?fields=password')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+    
+    def test_empty_fields_returns_everything(self):
+        """Test fields vacío equivale a no enviarlo"""
+        self.assertEqual(self.client.get('/api/claim?fields=').content, self.client.get('/api/claim').content)
+
+
+class ListFilterTest(APITestCase):
+    """Tests para los filtros, la búsqueda y el ordenamiento de reclamos y solicitudes"""
+    
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create(first_name='Test', last_name='User', email='test@test.com', password='hash')
+        self.admin_user = User.objects.create(
+            first_name='Admin', last_name='User', email='admin@test.com', username='admin@test.com', password='hash', is_admin=True
+        )
+        now = timezone.now()
+        rows = [
+            ('Factura duplicada', 'Me cobraron dos veces', 'Pendiente', 10),
+            ('Internet lento', 'La conexión falla de noche', 'En Proceso', 5),
+            ('Cambio de plan', 'Quiero un plan con más datos', 'Completado', 1),
+            ('Sin estado', 'Registro antiguo', None, 0),
+        ]
+        self.claims = []
+        for subject, description, item_status, days_ago in rows:
+            claim = Claim.objects.create(user=self.user, subject=subject, description=description, status=item_status)
+            Claim.objects.filter(id=claim.id).update(created_at=now - timedelta(days=days_ago))
+            Request.objects.create(user=self.user, subject=subject, description=description, status=item_status)
+            self.claims.append(claim)
+    
+    def subjects(self, response):
+        data = response.data['results'] if isinstance(response.data, dict) else response.data
+        return [item['subject'] for item in data]
+    
+    def test_status_filter(self):
+        """Test filtro por uno o varios estados, con cualquier escritura"""
+        response = self.client.get('/api/claim?status=pendiente')
+        self.assertEqual(self.subjects(response), ['Factura duplicada'])
+        response = self.client.get('/api/request?status=EN_PROCESO,Completado')
+        self.assertEqual(self.subjects(response), ['Internet lento', 'Cambio de plan'])
+        response = self.client.get('/api/claim?status=sin_estado')
+        self.assertEqual(self.subjects(response), ['Sin estado'])
+    
+    def test_unknown_status_is_rejected(self):
+        """Test un estado mal escrito devuelve 400 en lugar de filtrar por 'otro'"""
+        response = self.client.get('/api/claim?status=pendinte')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('pendinte', response.data['error'])
+        response = self.client.get('/api/claim?status=pendiente,xyz')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.client.get('/api/claim?status=Otro')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+    
+    def test_status_filter_runs_on_status_code(self):
+        """Test el filtro de estado se resuelve en SQL sobre status_code"""
+        with CaptureQueriesContext(connection) as context:
+            self.client.get('/api/claim?status=Pendiente')
+        self.assertIn('"status_code" IN', context.captured_queries[-1]['sql'])
+    
+    def test_created_at_range(self):
+        """Test rango de fechas con días completos o fecha y hora"""
+        today = timezone.localdate()
+        response = self.client.get(f'/api/claim?created_from={today - timedelta(days=6)}&created_to={today - timedelta(days=1)}')
+        self.assertEqual(self.subjects(response), ['Internet lento', 'Cambio de plan'])
+        response = self.client.get(f'/api/claim?created_to={today - timedelta(days=10)}')
+        self.assertEqual(self.subjects(response), ['Factura duplicada'])
+        moment = (timezone.now() - timedelta(hours=12)).strftime('%Y-%m-%dT%H:%M:%S')
+        response = self.client.get(f'/api/claim?created_from={moment}')
+        self.assertEqual(self.subjects(response), ['Sin estado'])
+    
+    def test_search(self):
+        """Test búsqueda en asunto y descripción"""
+        response = self.client.get('/api/claim?search=factura')
+        self.assertEqual(self.subjects(response), ['Factura duplicada'])
+        response = self.client.get('/api/request?search=NOCHE')
+        self.assertEqual(self.subjects(response), ['Internet lento'])
+        response = self.client.get(f'/api/claim/user/{self.user.id}?search=plan&status=completado')
+        self.assertEqual(self.subjects(response), ['Cambio de plan'])
+    
+    def test_ordering(self):
+        """Test ordenamiento por fecha y por estado"""
+        response = self.client.get('/api/claim?ordering=created_at')
+        self.assertEqual(self.subjects(response), ['Factura duplicada', 'Internet lento', 'Cambio de plan', 'Sin estado'])
+        response = self.client.get('/api/claim?ordering=-status')
+        self.assertEqual(self.subjects(response)[:3], ['Cambio de plan', 'Internet lento', 'Factura duplicada'])
+    
+    def test_ascending_cursor_pagination(self):
+        """Test la paginación por cursor respeta el orden ascendente"""
+        response = self.client.get('/api/claim?ordering=created_at&page_size=3&fields=subject')
+        self.assertEqual(self.subjects(response), ['Factura duplicada', 'Internet lento', 'Cambio de plan'])
+        response = self.client.get(f"/api/claim?ordering=created_at&page_size=3&fields=subject&cursor={response.data['next_cursor']}")
+        self.assertEqual(self.subjects(response), ['Sin estado'])
+        self.assertIsNone(response.data['next_cursor'])
+    
+    def test_invalid_parameters(self):
+        """Test parámetros inválidos devuelven 400"""
+        for query in ('ordering=subject', 'created_from=ayer', 'created_to=2024-13-01', 'ordering=status&page_size=2'):
+            response = self.client.get(f'/api/claim?{query}')
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST, query)
+    
+    def test_admin_view_filters_and_totals(self):
+        """Test el panel de administrador solo trae y cuenta lo filtrado"""
+        response = self.client.get(f'/api/admin?user_id={self.admin_user.id}&status=pendiente,en proceso&search=a')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([item['subject'] for item in response.data['claims']], ['Internet lento', 'Factura duplicada'])
+        self.assertEqual(response.data['total_claims'], 2)
+        self.assertEqual(response.data['total_requests'], 2)
+
+
+class CursorPaginationTest(APITestCase):
+    """Tests para la paginación por cursor de los listados"""
+    
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create(
+            first_name='Test',
+            last_name='User',
+            email='test@test.com',
+            password='password123',
+            is_admin=True
+        )
+        same_time = timezone.now()
+        self.claims = [
+            Claim.objects.create(user=self.user, subject=f'Claim {i}', description='Description', status='pendiente')
+            for i in range(5)
+        ]
+        # Dos reclamos con la misma fecha para comprobar el desempate por id
+        Claim.objects.filter(id__in=[self.claims[1].id, self.claims[2].id]).update(created_at=same_time)
+    
+    def test_walk_all_pages(self):
+        """Test recorrer todas las páginas devuelve cada reclamo una sola vez en orden estable"""
+        seen = []
+        url = '/api/claim?page_size=2'
+        while True:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertLessEqual(len(response.data['results']), 2)
+            seen.extend(item['id'] for item in response.data['results'])
+            if not response.data['next_cursor']:
+                break
+            url = f"/api/claim?page_size=2&cursor={response.data['next_cursor']}"
+        self.assertEqual(len(seen), 5)
+        self.assertEqual(set(seen), {claim.id for claim in self.claims})
+        ordered = list(Claim.objects.order_by('-created_at', '-id').values_list('id', flat=True))
+        self.assertEqual(seen, ordered)
+    
+    def test_legacy_mode_returns_capped_list(self):
+        """Test los clientes sin cursor reciben una lista limitada"""
+        with patch('AppResolution.utils.pagination.LEGACY_MAX_ROWS', 3):
+            response = self.client.get('/api/claim')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIsInstance(response.data, list)
+        self.assertEqual(len(response.data), 3)
+        # el tope conserva los más recientes, en el orden ascendente de siempre
+        self.assertEqual([item['id'] for item in response.data], [claim.id for claim in self.claims[2:]])
+    
+    def test_invalid_cursor(self):
+        """Test un cursor inválido devuelve error"""
+        response = self.client.get('/api/claim?cursor=no-es-un-cursor')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+    
+    def test_users_paginated_by_id(self):
+        """Test paginación del listado de usuarios"""
+        response = self.client.get('/api/user?page_size=1')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data['results']), 1)
+        self.assertIsNone(response.data['next_cursor'])
+    
+    def test_admin_feed_paginated(self):
+        """Test paginación del panel de administrador"""
+        response = self.client.get(f'/api/admin?user_id={self.user.id}&page_size=3')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data['claims']), 3)
+        self.assertEqual(response.data['total_claims'], 5)
+        self.assertIsNotNone(response.data['next_claims_cursor'])
+        self.assertIsNone(response.data['next_requests_cursor'])
+        
+        response = self.client.get(
+            f"/api/admin?user_id={self.user.id}&page_size=3&claims_cursor={response.data['next_claims_cursor']}"
+        )
+        self.assertEqual(len(response.data['claims']), 2)
+        self.assertIsNone(response.data['next_claims_cursor'])
+        self.assertNotIn('total_claims', response.data)
+    
+    def test_admin_feed_counts_only_first_page(self):
+        """Test el panel cuenta los totales en la primera página y no en las siguientes"""
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(f'/api/admin?user_id={self.user.id}&page_size=3')
+        self.assertEqual(len([q for q in queries.captured_queries if 'COUNT(' in q['sql']]), 2)
+        
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(
+                f"/api/admin?user_id={self.user.id}&page_size=3&claims_cursor={response.data['next_claims_cursor']}"
+            )
+        self.assertEqual(len([q for q in queries.captured_queries if 'COUNT(' in q['sql']]), 0)
+    
+    def test_admin_feed_lists_advance_independently(self):
+        """Test una lista sin su cursor no repite su primera página mientras la otra avanza"""
+        Request.objects.create(user=self.user, subject='Solicitud', description='Description', status='pendiente')
+        response = self.client.get(f'/api/admin?user_id={self.user.id}&page_size=3')
+        self.assertEqual(len(response.data['requests']), 1)
+        self.assertIsNone(response.data['next_requests_cursor'])
+        
+        response = self.client.get(
+            f"/api/admin?user_id={self.user.id}&page_size=3&claims_cursor={response.data['next_claims_cursor']}"
+        )
+        self.assertEqual(len(response.data['claims']), 2)
+        self.assertEqual(response.data['requests'], [])
+        self.assertIsNone(response.data['next_requests_cursor'])
+        self.assertNotIn('total_requests', response.data)
+        
+        response = self.client.get(f'/api/admin?user_id={self.user.id}&page_size=3&claims_cursor=&requests_cursor=')
+        self.assertEqual(len(response.data['claims']), 3)
+        self.assertEqual(len(response.data['requests']), 1)
+        self.assertEqual(response.data['total_requests'], 1)
+    
+    def test_admin_legacy_totals_without_count(self):
+        """Test sin cursor los totales salen del listado si no alcanzó el tope"""
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(f'/api/admin?user_id={self.user.id}')
+        self.assertEqual(response.data['total_claims'], 5)
+        self.assertEqual(response.data['total_requests'], 0)
+        self.assertFalse([q for q in queries.captured_queries if 'COUNT(' in q['sql']])
+        
+        with patch('AppResolution.utils.pagination.LEGACY_MAX_ROWS', 3):
+            response = self.client.get(f'/api/admin?user_id={self.user.id}')
+        self.assertEqual(len(response.data['claims']), 3)
+        self.assertEqual(response.data['total_claims'], 5)
+
+
+class BulkCreateTest(APITestCase):
+    """Tests para el alta masiva de reclamos y solicitudes"""
+    
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create(
+            first_name='Test',
+            last_name='User',
+            email='test@test.com',
+            password='password123'
+        )
+    
+    def items(self, count):
+        return [
+            {'user': self.user.id, 'subject': f'Ticket {i}', 'description': 'Importado'}
+            for i in range(count)
+        ]
+    
+    def test_bulk_create_claims(self):
+        """Test alta masiva en lotes con un número de consultas acotado"""
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.post('/api/claim/bulk?chunk_size=10', self.items(25), format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['created'], 25)
+        self.assertEqual(response.data['errors'], [])
+        self.assertEqual(Claim.objects.count(), 25)
+        self.assertEqual(set(Claim.objects.values_list('status', 'status_code')), {('Pendiente', Status.PENDIENTE)})
+        inserts = [q for q in context.captured_queries if q['sql'].startswith('INSERT INTO "AppResolution_claim"')]
+        self.assertEqual(len(inserts), 3)
+        self.assertLess(len(context.captured_queries), 15)
+        # El resumen diario se actualiza aunque bulk_create no dispare señales
+        self.assertEqual(DailyStatusRollup.objects.get(kind='claim', normalized_status='pendiente').count, 25)
+    
+    def test_bulk_create_reports_item_errors(self):
+        """Test los elementos inválidos se reportan sin abortar el lote"""
+        items = self.items(3)
+        items[1]['user'] = 9999
+        items.append({'subject': 'Sin usuario'})
+        items.append({'user': self.user.id, 'subject': 'x' * 600})
+        response = self.client.post('/api/request/bulk', items, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['created'], 2)
+        self.assertEqual([error['index'] for error in response.data['errors']], [1, 3, 4])
+        self.assertIn('user', response.data['errors'][0]['errors'])
+        self.assertIn('subject', response.data['errors'][2]['errors'])
+        self.assertEqual(Request.objects.count(), 2)
+    
+    def test_bulk_create_rejects_non_scalar_user(self):
+        """Test un usuario enviado como lista u objeto se reporta como error del elemento"""
+        items = self.items(1) + [{'user': [self.user.id], 'subject': 'x'}, {'user': {'id': self.user.id}, 'subject': 'x'}]
+        response = self.client.post('/api/claim/bulk', items, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['created'], 1)
+        self.assertEqual([error['index'] for error in response.data['errors']], [1, 2])
+        for error in response.data['errors']:
+            self.assertIn('user', error['errors'])
+        
+        response = self.client.post('/api/claim/bulk', [{'user': [1], 'subject': 'x'}], format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('user', response.data['errors'][0]['errors'])
+    
+    def test_bulk_create_requires_list(self):
+        """Test el cuerpo debe ser una lista"""
+        response = self.client.post('/api/claim/bulk', {'user': self.user.id}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
 class ProfileViewTest(APITestCase):
     """Tests para ProfileView"""
     
@@ -609,6 +1429,245 @@ class ProfileViewTest(APITestCase):
         self.assertEqual(profile.phone, '0987654321')
 
 
+class DirtyFieldsTest(APITestCase):
+    """Tests para DirtyFieldsMixin: cada save() escribe solo las columnas modificadas"""
+    
+    def setUp(self):
+        self.client = APIClient()
+        self.profile = Profile.objects.create(first_name='Test', last_name='User', email='test@test.com', password='', phone='111', photo='')
+        self.user = User.objects.create(
+            first_name='Test',
+            last_name='User',
+            email='test@test.com',
+            password='password123',
+            profile=self.profile
+        )
+        self.claim = Claim.objects.create(user=self.user, subject='Ruido', description='Vecinos', status='Pendiente')
+    
+    def writes(self, queries, model):
+        table = connection.ops.quote_name(model._meta.db_table)
+        prefixes = (f'UPDATE {table} ', f'INSERT INTO {table} ', f'DELETE FROM {table} ')
+        return [q['sql'] for q in queries.captured_queries if q['sql'].startswith(prefixes)]
+    
+    def update_sql(self, model, assignments, pk):
+        quote = connection.ops.quote_name
+        table = quote(model._meta.db_table)
+        columns = ', '.join(f'{quote(column)} = {value}' for column, value in assignments)
+        return f'UPDATE {table} SET {columns} WHERE {table}.{quote("id")} = {pk}'
+    
+    def test_save_updates_only_changed_columns(self):
+        """Test save() sobre una fila leída escribe solo la columna cambiada"""
+        claim = Claim.objects.get(pk=self.claim.pk)
+        claim.subject = 'Ruido nocturno'
+        with CaptureQueriesContext(connection) as queries:
+            claim.save()
+        self.assertEqual(self.writes(queries, Claim), [self.update_sql(Claim, [('subject', "'Ruido nocturno'")], claim.pk)])
+        
+        claim.refresh_from_db()
+        self.assertEqual(claim.subject, 'Ruido nocturno')
+        self.assertEqual(claim.get_dirty_fields(), set())
+    
+    def test_save_reinserts_deleted_row(self):
+        """Test save() con cambios sobre una fila borrada la vuelve a insertar, como en Django"""
+        claim = Claim.objects.get(pk=self.claim.pk)
+        Claim.objects.filter(pk=claim.pk).delete()
+        claim.subject = 'Ruido nocturno'
+        with CaptureQueriesContext(connection) as queries:
+            claim.save()
+        self.assertEqual(len([sql for sql in self.writes(queries, Claim) if sql.startswith('INSERT')]), 1)
+        
+        stored = Claim.objects.get(pk=claim.pk)
+        self.assertEqual(stored.subject, 'Ruido nocturno')
+        self.assertEqual(stored.description, 'Vecinos')
+        self.assertEqual(claim.get_dirty_fields(), set())
+    
+    def test_reinsert_does_not_hide_earlier_failures(self):
+        """Test el reintento tras una fila borrada no limpia el rollback pendiente de un error anterior"""
+        claim = Claim.objects.get(pk=self.claim.pk)
+        Claim.objects.filter(pk=claim.pk).delete()
+        claim.subject = 'Ruido nocturno'
+        with transaction.atomic():
+            transaction.set_rollback(True)
+            with self.assertRaises(TransactionManagementError):
+                claim.save()
+            self.assertTrue(transaction.get_rollback())
+        self.assertFalse(Claim.objects.filter(pk=claim.pk).exists())
+    
+    def test_noop_save_runs_no_queries(self):
+        """Test save() sin cambios no ejecuta ninguna consulta ni dispara señales"""
+        claim = Claim.objects.get(pk=self.claim.pk)
+        user = User.objects.get(pk=self.user.pk)
+        user.first_name = 'Test'
+        with self.assertNumQueries(0):
+            claim.save()
+            user.save()
+            self.claim.save()
+    
+    def test_explicit_update_fields_are_respected(self):
+        """Test con update_fields explícito se escriben solo esos campos y el resto sigue pendiente"""
+        claim = Claim.objects.get(pk=self.claim.pk)
+        claim.subject = 'Otro asunto'
+        claim.description = 'Otra descripción'
+        with CaptureQueriesContext(connection) as queries:
+            claim.save(update_fields=['subject'])
+        self.assertEqual(self.writes(queries, Claim), [self.update_sql(Claim, [('subject', "'Otro asunto'")], claim.pk)])
+        self.assertEqual(claim.get_dirty_fields(), {'description'})
+    
+    def test_refresh_from_db_resets_loaded_values(self):
+        """Test tras refresh_from_db volver al valor anterior también se escribe"""
+        claim = Claim.objects.get(pk=self.claim.pk)
+        Claim.objects.filter(pk=claim.pk).update(subject='Cambiado por otro')
+        claim.refresh_from_db()
+        claim.subject = 'Ruido'
+        claim.save()
+        self.assertEqual(Claim.objects.get(pk=claim.pk).subject, 'Ruido')
+    
+    def test_claim_put_updates_changed_columns(self):
+        """Test ClaimView.put actualiza solo status y status_code, y nada si no hay cambios"""
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.put(f'/api/claim/{self.claim.pk}', {'status': 'Resuelto'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self.writes(queries, Claim), [
+            self.update_sql(Claim, [('status', "'Resuelto'"), ('status_code', status_code_for('Resuelto'))], self.claim.pk)
+        ])
+        
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.put(f'/api/claim/{self.claim.pk}', {'status': 'Resuelto', 'subject': 'Ruido'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self.writes(queries, Claim), [])
+    
+    def test_admin_patch_updates_status_columns(self):
+        """Test AdminView.patch actualiza solo el estado del reclamo"""
+        admin = User.objects.create(first_name='Admin', last_name='User', email='admin@test.com', password='x', is_admin=True)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.patch('/api/admin', {'user_id': admin.id, 'type': 'claim', 'id': self.claim.pk, 'status': 'En proceso'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self.writes(queries, Claim), [
+            self.update_sql(Claim, [('status', "'En proceso'"), ('status_code', status_code_for('En proceso'))], self.claim.pk)
+        ])
+    
+    def test_profile_patch_updates_changed_columns(self):
+        """Test ProfileView.patch actualiza solo el teléfono"""
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.patch(f'/api/profile/{self.profile.pk}', {'phone': '222', 'first_name': 'Test'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self.writes(queries, Profile), [self.update_sql(Profile, [('phone', "'222'")], self.profile.pk)])
+    
+    def test_user_patch_updates_user_and_profile_columns(self):
+        """Test UserView.patch escribe solo first_name en el usuario y en su perfil"""
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.patch(f'/api/user/{self.user.pk}', {'first_name': 'Nuevo', 'last_name': 'User'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self.writes(queries, User), [self.update_sql(User, [('first_name', "'Nuevo'")], self.user.pk)])
+        self.assertEqual(self.writes(queries, Profile), [self.update_sql(Profile, [('first_name', "'Nuevo'")], self.profile.pk)])
+        
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.patch(f'/api/user/{self.user.pk}', {'verified': 1}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self.writes(queries, User), [self.update_sql(User, [('verified', 1)], self.user.pk)])
+    
+    def test_verify_saves_user_once(self):
+        """Test verificar el código escribe el usuario una sola vez junto con su nuevo perfil"""
+        user = User.objects.create(first_name='Sin', last_name='Perfil', email='sin@test.com', password='x')
+        Authentication.objects.create(user=user, token='123456')
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post('/api/auth', {'user_id': user.id, 'code': '123456'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        user.refresh_from_db()
+        self.assertEqual(len(self.writes(queries, Profile)), 1)
+        self.assertEqual(self.writes(queries, User), [
+            self.update_sql(User, [('verified', 1), ('profile_id', user.profile_id)], user.pk)
+        ])
+    
+    def test_verify_is_atomic(self):
+        """Test si falla la creación del perfil el usuario no queda verificado"""
+        user = User.objects.create(first_name='Sin', last_name='Perfil', email='sin@test.com', password='x')
+        Authentication.objects.create(user=user, token='123456')
+        with patch.object(Profile.objects, 'create', side_effect=Exception('fallo al crear el perfil')):
+            response = self.client.post('/api/auth', {'user_id': user.id, 'code': '123456'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        user.refresh_from_db()
+        self.assertEqual((user.verified, user.profile_id), (0, None))
+
+
+class FastPBKDF2PasswordHasher(PBKDF2PasswordHasher):
+    """PBKDF2 con pocas iteraciones para que los tests de rehash sean rápidos"""
+    iterations = 10
+
+
+FAST_PBKDF2 = 'AppResolution.tests.FastPBKDF2PasswordHasher'
+MD5 = 'django.contrib.auth.hashers.MD5PasswordHasher'
+
+
+# El hash antiguo de setUp necesita MD5 habilitado en todas las pruebas
+@override_settings(PASSWORD_HASHERS=[FAST_PBKDF2, MD5])
+class PasswordHashingTest(APITestCase):
+    """Tests para la capa de hash de contraseñas"""
+    
+    def setUp(self):
+        self.user = User.objects.create(
+            first_name='Test', last_name='User', email='test@test.com',
+            password=make_password('secreta123', hasher='md5'), verified=1
+        )
+    
+    def test_hash_and_verify_inline(self):
+        """Test hash_password y verify_password equivalen a make_password y check_password"""
+        encoded = hash_password('clave')
+        self.assertTrue(check_password('clave', encoded))
+        self.assertEqual(verify_password('clave', encoded), (True, False))
+        self.assertEqual(verify_password('otra', encoded), (False, False))
+        self.assertEqual(verify_password('clave', 'basura'), (False, False))
+        self.assertFalse(check_password('x', hash_password(None)))
+    
+    def test_login_rehashes_legacy_hash(self):
+        """Test un login correcto migra el hash antiguo al hasher preferido una sola vez"""
+        response = self.client.post('/api/login', {'email': 'test@test.com', 'password': 'wrong'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.user.refresh_from_db()
+        self.assertEqual(identify_hasher(self.user.password).algorithm, 'md5')
+        
+        response = self.client.post('/api/login', {'email': 'test@test.com', 'password': 'secreta123'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.password.startswith('pbkdf2_sha256$10$'))
+        
+        with CaptureQueriesContext(connection) as context:
+            self.assertTrue(check_user_password(self.user, 'secreta123'))
+        self.assertEqual(context.captured_queries, [])
+    
+    def test_views_hash_with_preferred_hasher(self):
+        """Test el registro y la actualización de contraseña usan el hasher preferido"""
+        response = self.client.post('/api/user', {
+            'first_name': 'Nuevo', 'last_name': 'Usuario', 'email': 'nuevo@test.com', 'password': 'clave123'
+        }, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        created = User.objects.get(email='nuevo@test.com')
+        self.assertTrue(created.password.startswith('pbkdf2_sha256$10$'))
+        
+        self.client.patch(f'/api/user/{self.user.id}', {'password': 'nueva456'}, format='json')
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.password.startswith('pbkdf2_sha256$10$'))
+        self.assertTrue(check_password('nueva456', self.user.password))
+    
+    def test_process_pool(self):
+        """Test con RESOLUTION_PASSWORD_HASH_WORKERS > 0 el trabajo se hace en otro proceso"""
+        self.addCleanup(shutdown_password_executor)
+        with patch.object(passwords.config, 'PASSWORD_HASH_WORKERS', 2):
+            self.assertNotEqual(password_executor().submit(os.getpid).result(), os.getpid())
+            encoded = hash_password('clave')
+            self.assertTrue(encoded.startswith('pbkdf2_sha256$10$'))
+            self.assertEqual(verify_password('clave', encoded), (True, False))
+            self.assertEqual(verify_password('otra', encoded), (False, False))
+            self.assertTrue(check_user_password(self.user, 'secreta123'))
+        self.user.refresh_from_db()
+        self.assertTrue(check_password('secreta123', self.user.password))
+        self.assertTrue(self.user.password.startswith('pbkdf2_sha256$10$'))
+    
+    def test_pool_disabled_by_default(self):
+        """Test sin configurar el pool no se crean procesos"""
+        self.assertIsNone(password_executor())
+
+
 class LoginViewTest(APITestCase):
     """Tests para LoginView"""
     
@@ -665,6 +1724,114 @@ class LoginViewTest(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
 
 
+class SignedTokenTest(APITestCase):
+    """Tests para los tokens de acceso firmados"""
+    
+    def setUp(self):
+        self.client = APIClient()
+        self.password = 'password123'
+        self.admin_user = User.objects.create(
+            first_name='Admin',
+            last_name='User',
+            email='admin@test.com',
+            password=make_password(self.password),
+            verified=1,
+            is_admin=True
+        )
+        self.regular_user = User.objects.create(
+            first_name='Regular',
+            last_name='User',
+            email='user@test.com',
+            username='user@test.com',
+            password=make_password(self.password),
+            verified=1
+        )
+    
+    def login(self, email):
+        response = self.client.post('/api/login', {'email': email, 'password': self.password}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data
+    
+    def test_login_issues_signed_tokens(self):
+        """Test el login devuelve un token de acceso firmado y un refresh_token"""
+        data = self.login('admin@test.com')
+        self.assertNotEqual(data['token'], 'dummy-token')
+        self.assertEqual(data['expires_in'], ACCESS_TOKEN_TTL_SECONDS)
+        self.assertEqual(read_token(data['token']), {'uid': self.admin_user.id, 'adm': True})
+        self.assertEqual(read_token(data['refresh_token'], 'refresh')['uid'], self.admin_user.id)
+    
+    def test_admin_views_with_token_skip_user_lookup(self):
+        """Test con token no se necesita user_id ni se consulta la tabla de usuarios"""
+        token = self.login('admin@test.com')['token']
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+        table = User._meta.db_table
+        for url in ('/api/reports/', '/api/admin'):
+            with CaptureQueriesContext(connection) as context:
+                response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            user_lookups = [q['sql'] for q in context.captured_queries if f'FROM "{table}"' in q['sql'].split('INNER JOIN')[0]]
+            self.assertEqual(user_lookups, [])
+    
+    def test_regular_user_token_is_denied(self):
+        """Test un token de usuario normal no da acceso al panel de administrador"""
+        token = self.login('user@test.com')['token']
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+        response = self.client.get(f'/api/admin?user_id={self.admin_user.id}')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+    
+    def test_invalid_or_expired_token_falls_back_to_user_id(self):
+        """Test un token inválido o expirado se trata como anónimo y se sigue aceptando user_id"""
+        token = self.login('admin@test.com')['token']
+        for bad in ('dummy-token', token[:-2] + 'xx', issue_token(self.admin_user, 'refresh')):
+            self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {bad}')
+            self.assertEqual(self.client.get('/api/admin').status_code, status.HTTP_400_BAD_REQUEST)
+            self.assertEqual(self.client.get(f'/api/admin?user_id={self.admin_user.id}').status_code, status.HTTP_200_OK)
+        
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+        with patch('django.core.signing.time.time', return_value=time.time() + ACCESS_TOKEN_TTL_SECONDS + 1):
+            with self.assertRaises(InvalidToken):
+                read_token(token)
+            response = self.client.get('/api/admin')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+    
+    def test_refresh_reflects_current_admin_flag(self):
+        """Test la renovación relee el usuario y emite un token con is_admin actualizado"""
+        tokens = self.login('admin@test.com')
+        User.objects.filter(id=self.admin_user.id).update(is_admin=False)
+        
+        response = self.client.post('/api/token/refresh', {'refresh_token': tokens['refresh_token']}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(read_token(response.data['token']), {'uid': self.admin_user.id, 'adm': False})
+        
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {response.data['token']}")
+        self.assertEqual(self.client.get('/api/admin').status_code, status.HTTP_403_FORBIDDEN)
+    
+    def test_demoted_admin_token_loses_access(self):
+        """Test un administrador degradado con UserView.patch pierde el acceso aunque su token siga vigente"""
+        token = self.login('admin@test.com')['token']
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+        self.assertEqual(self.client.get('/api/admin').status_code, status.HTTP_200_OK)
+        
+        response = self.client.patch(f'/api/user/{self.admin_user.id}', {'is_admin': False}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self.client.get('/api/admin').status_code, status.HTTP_403_FORBIDDEN)
+        self.assertEqual(self.client.get('/api/reports/').status_code, status.HTTP_403_FORBIDDEN)
+    
+    def test_refresh_rejects_invalid_tokens(self):
+        """Test la renovación rechaza tokens de acceso, alterados o ausentes"""
+        tokens = self.login('admin@test.com')
+        response = self.client.post('/api/token/refresh', {'refresh_token': tokens['token']}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        response = self.client.post('/api/token/refresh', {'refresh_token': 'abc'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        response = self.client.post('/api/token/refresh', {}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        
+        self.admin_user.delete()
+        response = self.client.post('/api/token/refresh', {'refresh_token': tokens['refresh_token']}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
 class AdminViewTest(APITestCase):
     """Tests para AdminView"""
     
@@ -740,8 +1907,8 @@ class AdminViewTest(APITestCase):
         self.assertEqual(self.request.status, 'en proceso')
 
 
-class ReportsViewTest(APITestCase):
-    """Tests para ReportsView"""
+class AdminViewQueryCountTest(APITestCase):
+    """Tests de regresión del número de consultas de AdminView.get"""
     
     def setUp(self):
         self.client = APIClient()
@@ -752,14 +1919,356 @@ class ReportsViewTest(APITestCase):
             password='password123',
             is_admin=True
         )
-        self.regular_user = User.objects.create(
-            first_name='Regular',
-            last_name='User',
-            email='user@test.com',
-            password='password123',
-            is_admin=False
-        )
-        
+    
+    def create_items(self, count, start=0):
+        for i in range(start, start + count):
+            user = User.objects.create(
+                first_name=f'User {i}',
+                last_name='Test',
+                email=f'user{i}@test.com',
+                username=f'user{i}@test.com',
+                password='password123'
+            )
+            Claim.objects.create(user=user, subject=f'Claim {i}', description='Description', status='pendiente')
+            Request.objects.create(user=user, subject=f'Request {i}', description='Description', status='pendiente')
+    
+    def count_admin_queries(self):
+        # Medir siempre con la caché de permisos fría para comparar en igualdad de condiciones
+        admin_flags.invalidate(self.admin_user.id)
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(f'/api/admin?user_id={self.admin_user.id}')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return len(context.captured_queries), response
+    
+    def test_query_count_does_not_grow_with_rows(self):
+        """Test el número de consultas es constante sin importar la cantidad de filas"""
+        self.create_items(2)
+        few_queries, _ = self.count_admin_queries()
+        
+        self.create_items(10, start=2)
+        many_queries, response = self.count_admin_queries()
+        
+        self.assertEqual(few_queries, many_queries)
+        self.assertEqual(len(response.data['claims']), 12)
+        self.assertEqual(len(response.data['requests']), 12)
+    
+    def test_user_info_is_included(self):
+        """Test cada elemento incluye la información de su usuario"""
+        self.create_items(1)
+        _, response = self.count_admin_queries()
+        claim = response.data['claims'][0]
+        self.assertEqual(claim['user_info']['email'], 'user0@test.com')
+        self.assertEqual(claim['user_info']['id'], claim['user'])
+        self.assertEqual(set(claim['user_info']), {'id', 'first_name', 'last_name', 'email'})
+    
+    def test_rows_match_model_serializer(self):
+        """Test el panel lee con .values() y devuelve lo mismo que el ModelSerializer más user_info"""
+        self.create_items(3)
+        with patch.object(claim_serializer, 'to_representation') as claim_model_serializer:
+            _, response = self.count_admin_queries()
+        claim_model_serializer.assert_not_called()
+        for key, model, model_serializer in (('claims', Claim, claim_serializer), ('requests', Request, request_serializer)):
+            expected = []
+            for item in model.objects.select_related('user').order_by('-created_at'):
+                data = model_serializer(item).data
+                data['user_info'] = {
+                    'id': item.user.id, 'first_name': item.user.first_name, 'last_name': item.user.last_name, 'email': item.user.email
+                }
+                expected.append(data)
+            self.assertEqual(JSONRenderer().render(response.data[key]), JSONRenderer().render(expected), key)
+        
+        response = self.client.get(f'/api/admin?user_id={self.admin_user.id}&ordering=-status')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotIn('status_code', response.data['claims'][0])
+
+
+class AdminBulkTransitionTest(APITestCase):
+    """Tests para el cambio de estado masivo del panel de administrador"""
+    
+    def setUp(self):
+        self.client = APIClient()
+        self.admin_user = User.objects.create(
+            first_name='Admin',
+            last_name='User',
+            email='admin@test.com',
+            password='password123',
+            is_admin=True
+        )
+        self.claims = Claim.objects.bulk_create([
+            Claim(user=self.admin_user, subject=f'Claim {i}', description='D', status='Pendiente', status_code=Status.PENDIENTE)
+            for i in range(60)
+        ])
+        self.requests = Request.objects.bulk_create([
+            Request(user=self.admin_user, subject=f'Request {i}', description='D', status='Pendiente', status_code=Status.PENDIENTE)
+            for i in range(40)
+        ])
+        rebuild_rollup()
+    
+    def test_bulk_transition_uses_set_based_updates(self):
+        """Test muchos cambios se aplican en pocas consultas"""
+        items = [
+            {'type': 'claim', 'id': claim.id, 'status': 'Completado' if i % 2 else 'En Proceso'}
+            for i, claim in enumerate(self.claims)
+        ] + [
+            {'type': 'request', 'id': req.id, 'status': 'Completado'}
+            for req in self.requests
+        ] + [
+            {'type': 'claim', 'id': 999999, 'status': 'Completado'},
+            {'type': 'otro', 'id': 1, 'status': 'Completado'},
+        ]
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.patch('/api/admin/bulk', {'user_id': self.admin_user.id, 'items': items}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['updated'], {'claim': 60, 'request': 40})
+        self.assertEqual(response.data['missing'], {'claim': [999999], 'request': []})
+        self.assertEqual([error['index'] for error in response.data['errors']], [101])
+        statements = [q['sql'] for q in context.captured_queries if not q['sql'].upper().startswith(('SAVEPOINT', 'RELEASE'))]
+        # admin + (SELECT + UPDATE por estado) por tipo + resumen diario
+        self.assertLessEqual(len(statements), 7)
+        
+        self.assertEqual(Claim.objects.filter(status='Completado', status_code=Status.COMPLETADO).count(), 30)
+        self.assertEqual(Claim.objects.filter(status='En Proceso', status_code=Status.EN_PROCESO).count(), 30)
+        self.assertEqual(Request.objects.filter(status_code=Status.COMPLETADO).count(), 40)
+        
+        rollup = {(row.kind, row.normalized_status): row.count for row in DailyStatusRollup.objects.all() if row.count}
+        self.assertEqual(rollup, {('claim', 'completado'): 30, ('claim', 'en_proceso'): 30, ('request', 'completado'): 40})
+    
+    def test_bulk_transition_locks_rows_before_computing_deltas(self):
+        """Test los estados anteriores se leen con SELECT ... FOR UPDATE dentro de la transacción"""
+        select_for_update = QuerySet.select_for_update
+        items = [{'type': 'claim', 'id': self.claims[0].id, 'status': 'Completado'}]
+        with patch.object(QuerySet, 'select_for_update', autospec=True, side_effect=select_for_update) as locked:
+            response = self.client.patch('/api/admin/bulk', {'user_id': self.admin_user.id, 'items': items}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([call.args[0].model for call in locked.call_args_list], [Claim])
+    
+    def test_single_status_change_locks_row(self):
+        """Test un cambio de estado individual también lee el estado anterior con SELECT ... FOR UPDATE"""
+        select_for_update = QuerySet.select_for_update
+        claim = Claim.objects.get(pk=self.claims[0].pk)
+        claim.status = 'Completado'
+        with patch.object(QuerySet, 'select_for_update', autospec=True, side_effect=select_for_update) as locked:
+            with patch('AppResolution.models.transaction.atomic', wraps=transaction.atomic) as atomic:
+                claim.save()
+        self.assertEqual([call.args[0].model for call in locked.call_args_list], [Claim])
+        self.assertTrue(any(call.kwargs.get('savepoint') is False for call in atomic.call_args_list))
+        rollup = {row.normalized_status: row.count for row in DailyStatusRollup.objects.filter(kind='claim')}
+        self.assertEqual(rollup.get('completado'), 1)
+    
+    def test_bulk_transition_denied_for_regular_user(self):
+        """Test solo los administradores pueden cambiar estados en masa"""
+        user = User.objects.create(first_name='R', last_name='U', email='user@test.com', username='user@test.com', password='x')
+        items = [{'type': 'claim', 'id': self.claims[0].id, 'status': 'Completado'}]
+        response = self.client.patch('/api/admin/bulk', {'user_id': user.id, 'items': items}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+
+class AdminExportTest(APITestCase):
+    """Tests para la exportación en streaming del panel de administrador"""
+    
+    def setUp(self):
+        self.client = APIClient()
+        self.admin_user = User.objects.create(
+            first_name='Admin',
+            last_name='User',
+            email='admin@test.com',
+            password='password123',
+            is_admin=True
+        )
+    
+    def create_claims(self, count):
+        Claim.objects.bulk_create([
+            Claim(user=self.admin_user, subject=f'Claim {i}', description='Descripción ' * 20, status='Pendiente')
+            for i in range(count)
+        ])
+    
+    def export(self, params=''):
+        response = self.client.get(f'/api/admin/export?user_id={self.admin_user.id}{params}')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        return response
+    
+    def test_csv_export(self):
+        """Test el CSV incluye cabecera, ambos tipos y los datos del usuario"""
+        self.create_claims(2)
+        Request.objects.create(user=self.admin_user, subject='Request, con coma', description='D', status='En Proceso')
+        response = self.export()
+        self.assertTrue(response['Content-Type'].startswith('text/csv'))
+        self.assertIn('attachment;', response['Content-Disposition'])
+        rows = list(csv.reader(StringIO(b''.join(response.streaming_content).decode())))
+        self.assertEqual(rows[0], ['type', 'id', 'user', 'subject', 'description', 'status', 'created_at',
+                                   'user_first_name', 'user_last_name', 'user_email'])
+        self.assertEqual([row[0] for row in rows[1:]], ['claim', 'claim', 'request'])
+        self.assertEqual(rows[3][3], 'Request, con coma')
+        self.assertEqual(rows[3][7:], ['Admin', 'User', 'admin@test.com'])
+    
+    def test_ndjson_matches_admin_view(self):
+        """Test cada línea NDJSON coincide con el elemento de AdminView.get"""
+        self.create_claims(3)
+        response = self.export('&type=claim&output=ndjson')
+        self.assertTrue(response['Content-Type'].startswith('application/x-ndjson'))
+        lines = [json.loads(line) for line in b''.join(response.streaming_content).decode().splitlines()]
+        
+        admin_claims = self.client.get(f'/api/admin?user_id={self.admin_user.id}').data['claims']
+        expected = sorted((dict(item, type='claim') for item in admin_claims), key=lambda item: item['id'])
+        self.assertEqual(lines, json.loads(json.dumps(expected)))
+    
+    def test_invalid_parameters_and_permissions(self):
+        """Test parámetros inválidos y usuarios sin permisos"""
+        response = self.client.get(f'/api/admin/export?user_id={self.admin_user.id}&type=otro')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.client.get(f'/api/admin/export?user_id={self.admin_user.id}&output=xml')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        
+        user = User.objects.create(first_name='R', last_name='U', email='user@test.com', username='user@test.com', password='x')
+        response = self.client.get(f'/api/admin/export?user_id={user.id}')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+    
+    def peak_export_memory(self, chunk_size):
+        with patch('AppResolution.utils.export.EXPORT_CHUNK_SIZE', chunk_size):
+            response = self.export('&type=claim')
+            tracemalloc.start()
+            try:
+                rows = sum(chunk.count(b'\n') for chunk in response.streaming_content)
+                _, peak = tracemalloc.get_traced_memory()
+            finally:
+                tracemalloc.stop()
+        return rows, peak
+    
+    def test_peak_memory_is_flat(self):
+        """Test la memoria máxima no crece con el número de filas exportadas"""
+        self.create_claims(500)
+        small_rows, small_peak = self.peak_export_memory(chunk_size=100)
+        self.create_claims(4500)
+        large_rows, large_peak = self.peak_export_memory(chunk_size=100)
+        
+        self.assertEqual(small_rows, 501)
+        self.assertEqual(large_rows, 5001)
+        # 10 veces más filas sin que el pico de memoria se duplique
+        self.assertLess(large_peak, small_peak * 2)
+
+
+class AdminPermissionCacheTest(APITestCase):
+    """Tests para la caché de permisos de administrador"""
+    
+    def setUp(self):
+        self.client = APIClient()
+        self.admin_user = User.objects.create(
+            first_name='Admin',
+            last_name='User',
+            email='admin@test.com',
+            password='password123',
+            is_admin=True
+        )
+        self.regular_user = User.objects.create(
+            first_name='Regular',
+            last_name='User',
+            email='user@test.com',
+            username='user@test.com',
+            password='password123'
+        )
+        admin_flags.reset_stats()
+    
+    def user_lookups(self, context):
+        table = User._meta.db_table
+        return [q['sql'] for q in context.captured_queries if f'FROM "{table}"' in q['sql']]
+    
+    def test_repeated_admin_requests_skip_user_lookup(self):
+        """Test la segunda petición del mismo administrador no consulta la tabla de usuarios"""
+        with CaptureQueriesContext(connection) as first:
+            response = self.client.get(f'/api/reports/?user_id={self.admin_user.id}')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(self.user_lookups(first)), 1)
+        
+        with CaptureQueriesContext(connection) as second:
+            response = self.client.get(f'/api/reports/?user_id={self.admin_user.id}')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self.user_lookups(second), [])
+        self.assertEqual(admin_flags.stats(), {'hits': 1, 'misses': 1, 'hit_rate': 0.5})
+    
+    def test_patch_is_admin_invalidates_cache(self):
+        """Test revocar is_admin desde UserView.patch surte efecto de inmediato"""
+        response = self.client.get(f'/api/admin?user_id={self.admin_user.id}')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        
+        response = self.client.patch(f'/api/user/{self.admin_user.id}', {'is_admin': False}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        
+        response = self.client.get(f'/api/admin?user_id={self.admin_user.id}')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        
+        response = self.client.patch(f'/api/user/{self.regular_user.id}', {'is_admin': True}, format='json')
+        self.client.get(f'/api/admin?user_id={self.regular_user.id}')
+        response = self.client.get(f'/api/admin?user_id={self.regular_user.id}')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+    
+    def test_error_responses_are_preserved(self):
+        """Test se mantienen las respuestas 400, 404 y 403 originales"""
+        response = self.client.get('/api/admin')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data['error'], 'Se requiere user_id')
+        
+        response = self.client.patch('/api/admin', {'user_id': 999999}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(response.data['error'], 'Usuario no encontrado')
+        
+        for _ in range(2):
+            response = self.client.get(f'/api/reports/?user_id={self.regular_user.id}')
+            self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        self.assertEqual(admin_flags.stats()['hits'], 1)
+        
+        response = self.client.get('/api/admin?user_id=abc')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+    
+    def test_cache_stats_endpoint(self):
+        """Test el endpoint de contadores devuelve aciertos y fallos"""
+        self.client.get(f'/api/admin/cache-stats?user_id={self.admin_user.id}')
+        response = self.client.get(f'/api/admin/cache-stats?user_id={self.admin_user.id}')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['misses'], 1)
+        self.assertEqual(response.data['hits'], 1)
+    
+    def test_stats_are_shared_between_processes(self):
+        """Test los contadores se guardan en la caché compartida y no en cada instancia"""
+        worker_a = AdminFlagCache()
+        worker_b = AdminFlagCache()
+        worker_a.is_admin(self.admin_user.id)
+        worker_b.is_admin(self.admin_user.id)
+        async_to_sync(worker_b.ais_admin)(self.admin_user.id)
+        self.assertEqual(admin_flags.stats(), {'hits': 2, 'misses': 1, 'hit_rate': 0.6667})
+        
+        worker_a.reset_stats()
+        self.assertEqual(worker_b.stats(), {'hits': 0, 'misses': 0, 'hit_rate': 0.0})
+    
+    def test_deleted_user_is_not_served_from_cache(self):
+        """Test un administrador eliminado deja de tener acceso"""
+        self.client.get(f'/api/admin?user_id={self.admin_user.id}')
+        admin_id = self.admin_user.id
+        self.admin_user.delete()
+        response = self.client.get(f'/api/admin?user_id={admin_id}')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class ReportsViewTest(APITestCase):
+    """Tests para ReportsView"""
+    
+    def setUp(self):
+        self.client = APIClient()
+        self.admin_user = User.objects.create(
+            first_name='Admin',
+            last_name='User',
+            email='admin@test.com',
+            password='password123',
+            is_admin=True
+        )
+        self.regular_user = User.objects.create(
+            first_name='Regular',
+            last_name='User',
+            email='user@test.com',
+            password='password123',
+            is_admin=False
+        )
+        
         # Crear datos de prueba
         Claim.objects.create(
             user=self.regular_user,
@@ -830,6 +2339,811 @@ class ReportsViewTest(APITestCase):
         self.assertIn('total', chart_item)
 
 
+class ReportsAggregationTest(APITestCase):
+    """Tests para el cálculo agregado de ReportsView"""
+    
+    def setUp(self):
+        self.client = APIClient()
+        self.admin_user = User.objects.create(
+            first_name='Admin',
+            last_name='User',
+            email='admin@test.com',
+            password='password123',
+            is_admin=True
+        )
+        Claim.objects.create(user=self.admin_user, subject='Claim 1', description='Description', status='Pendiente')
+        Claim.objects.create(user=self.admin_user, subject='Claim 2', description='Description', status='en proceso')
+        old_claim = Claim.objects.create(user=self.admin_user, subject='Claim 3', description='Description', status='completado')
+        Claim.objects.filter(id=old_claim.id).update(created_at=timezone.now() - timedelta(days=3))
+        Request.objects.create(user=self.admin_user, subject='Request 1', description='Description', status=None)
+        # update() no dispara las señales, así que el resumen se reconstruye
+        rebuild_rollup()
+    
+    def test_report_uses_two_queries(self):
+        """Test el reporte completo se calcula en dos consultas"""
+        today = timezone.localdate()
+        with self.assertNumQueries(2):
+            report = build_report(today - timedelta(days=29), today)
+        self.assertEqual(report['claims_stats'], {'total': 3, 'pendiente': 1, 'en_proceso': 1, 'completado': 1})
+        self.assertEqual(report['requests_stats'], {'total': 1, 'pendiente': 0, 'en_proceso': 0, 'completado': 0})
+    
+    def test_daily_buckets(self):
+        """Test conteos por día y días sin datos en cero"""
+        response = self.client.get(f'/api/reports/?user_id={self.admin_user.id}&days=7')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        chart = response.data['claims_chart_data']
+        self.assertEqual(len(chart), 7)
+        self.assertEqual(chart[-1], {'date': timezone.localdate().strftime('%Y-%m-%d'), 'pendiente': 1, 'en_proceso': 1, 'completado': 0, 'total': 2})
+        self.assertEqual(chart[-4]['completado'], 1)
+        self.assertEqual(chart[0]['total'], 0)
+        # Las solicitudes sin estado se cuentan como pendientes en las gráficas
+        self.assertEqual(response.data['requests_chart_data'][-1]['pendiente'], 1)
+    
+    def test_start_and_end_window(self):
+        """Test ventana explícita con start y end"""
+        response = self.client.get(f'/api/reports/?user_id={self.admin_user.id}&start=2024-01-01&end=2024-01-10')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data['claims_chart_data']), 10)
+        self.assertEqual(response.data['date_range'], {'start_date': '2024-01-01', 'end_date': '2024-01-10'})
+    
+    def test_invalid_window(self):
+        """Test parámetros de ventana inválidos"""
+        for query in ('days=0', 'days=abc', 'start=2024-02-01&end=2024-01-01', 'days=100000'):
+            response = self.client.get(f'/api/reports/?user_id={self.admin_user.id}&{query}')
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST, query)
+
+
+class ReportsCacheTest(APITestCase):
+    """Tests para la caché y las respuestas condicionales de ReportsView"""
+    
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.admin_user = User.objects.create(
+            first_name='Admin',
+            last_name='User',
+            email='admin@test.com',
+            password='password123',
+            is_admin=True
+        )
+        self.claim = Claim.objects.create(user=self.admin_user, subject='Claim 1', description='Description', status='Pendiente')
+        self.url = f'/api/reports/?user_id={self.admin_user.id}'
+    
+    def test_second_identical_call_runs_no_queries(self):
+        """Test la segunda consulta idéntica no ejecuta SQL"""
+        first = self.client.get(self.url)
+        self.assertEqual(first.status_code, status.HTTP_200_OK)
+        with self.assertNumQueries(0):
+            second = self.client.get(self.url)
+        self.assertEqual(second.status_code, status.HTTP_200_OK)
+        self.assertEqual(second.data, first.data)
+        self.assertEqual(second['ETag'], first['ETag'])
+        self.assertIn('Last-Modified', second)
+    
+    def test_conditional_requests_return_304(self):
+        """Test If-None-Match e If-Modified-Since devuelven 304 sin cuerpo"""
+        first = self.client.get(self.url)
+        with self.assertNumQueries(0):
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response.content, b'')
+        self.assertEqual(response['ETag'], first['ETag'])
+        
+        response = self.client.get(self.url, HTTP_IF_MODIFIED_SINCE=first['Last-Modified'])
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH='"otro"')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+    
+    def test_window_is_part_of_the_key(self):
+        """Test cada ventana de fechas tiene su propia entrada y ETag"""
+        week = self.client.get(self.url + '&days=7')
+        month = self.client.get(self.url)
+        self.assertNotEqual(week['ETag'], month['ETag'])
+        self.assertEqual(len(week.data['claims_chart_data']), 7)
+        self.assertEqual(len(month.data['claims_chart_data']), 30)
+    
+    def test_create_and_status_changes_invalidate(self):
+        """Test crear o cambiar el estado de reclamos y solicitudes invalida el reporte"""
+        first = self.client.get(self.url)
+        self.assertEqual(first.data['claims_stats']['pendiente'], 1)
+        
+        Request.objects.create(user=self.admin_user, subject='Request 1', description='Description', status='Pendiente')
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['requests_stats']['total'], 1)
+        
+        etag = response['ETag']
+        self.client.patch('/api/admin', {'user_id': self.admin_user.id, 'type': 'claim', 'id': self.claim.id, 'status': 'Completado'}, format='json')
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['claims_stats']['completado'], 1)
+        
+        etag = response['ETag']
+        items = [{'type': 'claim', 'id': self.claim.id, 'status': 'En Proceso'}]
+        self.client.patch('/api/admin/bulk', {'user_id': self.admin_user.id, 'items': items}, format='json')
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['claims_stats']['en_proceso'], 1)
+    
+    def test_unchanged_status_keeps_cache(self):
+        """Test guardar un reclamo sin cambiar su estado no invalida el reporte"""
+        first = self.client.get(self.url)
+        self.claim.subject = 'Otro asunto'
+        self.claim.save()
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+
+# URLconf de las pruebas de vistas asíncronas: /api con los GET async y /sync con las APIView
+urlpatterns = [
+    path('api/', include(build_urlpatterns(async_reads=True))),
+    path('sync/', include(build_urlpatterns(async_reads=False))),
+]
+
+
+@override_settings(ROOT_URLCONF='AppResolution.tests')
+class AsyncViewsTest(TestCase):
+    """Tests para las vistas de lectura asíncronas: mismas respuestas que las APIView síncronas"""
+    
+    def setUp(self):
+        cache.clear()
+        self.profile = Profile.objects.create(first_name='Test', last_name='User', email='test@test.com', password='x')
+        self.user = User.objects.create(
+            first_name='Test',
+            last_name='User',
+            email='test@test.com',
+            password='password123',
+            profile=self.profile
+        )
+        self.admin_user = User.objects.create(
+            first_name='Admin',
+            last_name='User',
+            email='admin@test.com',
+            password='password123',
+            is_admin=True
+        )
+        for i in range(5):
+            Claim.objects.create(user=self.user, subject=f'Reclamo {i}', description='Ruido de noche', status='Pendiente' if i % 2 else 'Resuelto')
+            Request.objects.create(user=self.user, subject=f'Solicitud {i}', description='Cambio de horario', status='Pendiente')
+        self.claim = Claim.objects.first()
+        self.req = Request.objects.first()
+    
+    async def assertSameResponse(self, url, status_code=status.HTTP_200_OK):
+        async_response = await self.async_client.get(f'/api/{url}')
+        sync_response = await self.async_client.get(f'/sync/{url}')
+        self.assertEqual(async_response.status_code, status_code)
+        self.assertEqual(sync_response.status_code, status_code)
+        self.assertEqual(async_response['Content-Type'], 'application/json')
+        self.assertEqual(async_response.content, sync_response.content)
+        return async_response
+    
+    def test_routes_use_async_views_only_when_enabled(self):
+        """Test build_urlpatterns monta las vistas async solo con async_reads"""
+        for url in ('/api/claim', '/api/request/1', '/api/profile/user/1', '/api/reports/'):
+            self.assertTrue(asyncio.iscoroutinefunction(resolve(url).func))
+            self.assertFalse(asyncio.iscoroutinefunction(resolve(url.replace('/api/', '/sync/')).func))
+        self.assertFalse(asyncio.iscoroutinefunction(resolve('/api/admin').func))
+    
+    async def test_lists_match_sync_views(self):
+        """Test los listados async devuelven exactamente el mismo JSON que los síncronos"""
+        await self.assertSameResponse('claim')
+        await self.assertSameResponse(f'claim/user/{self.user.id}?status=Pendiente&ordering=status')
+        await self.assertSameResponse(f'request?user_id={self.user.id}&search=horario&fields=id,subject')
+        await self.assertSameResponse('profile')
+        
+        first = await self.assertSameResponse('claim?page_size=2')
+        next_cursor = json.loads(first.content)['next_cursor']
+        self.assertIsNotNone(next_cursor)
+        await self.assertSameResponse(f'claim?page_size=2&cursor={next_cursor}')
+    
+    async def test_single_items_match_sync_views(self):
+        """Test las lecturas por ID y por usuario coinciden con las síncronas"""
+        await self.assertSameResponse(f'claim/{self.claim.id}')
+        await self.assertSameResponse(f'request/{self.req.id}')
+        await self.assertSameResponse(f'profile/{self.profile.id}')
+        await self.assertSameResponse(f'profile/user/{self.user.id}')
+    
+    async def test_errors_match_sync_views(self):
+        """Test los errores async tienen el mismo código y cuerpo que los síncronos"""
+        await self.assertSameResponse('claim/999999', status.HTTP_404_NOT_FOUND)
+        await self.assertSameResponse('request/999999', status.HTTP_404_NOT_FOUND)
+        await self.assertSameResponse('profile/999999', status.HTTP_404_NOT_FOUND)
+        await self.assertSameResponse('profile/user/999999', status.HTTP_404_NOT_FOUND)
+        await self.assertSameResponse(f'profile/user/{self.admin_user.id}', status.HTTP_404_NOT_FOUND)
+        await self.assertSameResponse('claim?user_id=abc', status.HTTP_400_BAD_REQUEST)
+        await self.assertSameResponse('claim?cursor=invalido', status.HTTP_400_BAD_REQUEST)
+        await self.assertSameResponse('claim?ordering=subject', status.HTTP_400_BAD_REQUEST)
+        await self.assertSameResponse('request?fields=password', status.HTTP_400_BAD_REQUEST)
+    
+    async def test_reports_admin_checks(self):
+        """Test el reporte async mantiene las respuestas de admin_required"""
+        await self.assertSameResponse('reports/', status.HTTP_400_BAD_REQUEST)
+        await self.assertSameResponse('reports/?user_id=999999', status.HTTP_404_NOT_FOUND)
+        await self.assertSameResponse(f'reports/?user_id={self.user.id}', status.HTTP_403_FORBIDDEN)
+        
+        token = issue_token(self.user)
+        response = await self.async_client.get('/api/reports/', headers={'Authorization': f'Bearer {token}'})
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        token = issue_token(self.admin_user)
+        response = await self.async_client.get('/api/reports/', headers={'Authorization': f'Bearer {token}'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+    
+    async def test_reports_cache_and_conditional_requests(self):
+        """Test el reporte async coincide con el síncrono y responde 304 con el mismo ETag"""
+        url = f'reports/?user_id={self.admin_user.id}'
+        first = await self.assertSameResponse(url)
+        self.assertEqual(first['Cache-Control'], 'private, no-cache')
+        self.assertEqual(json.loads(first.content)['claims_stats']['total'], 5)
+        
+        response = await self.async_client.get(f'/api/{url}', headers={'If-None-Match': first['ETag']})
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response.content, b'')
+        response = await self.async_client.get(f'/api/{url}', headers={'If-Modified-Since': first['Last-Modified']})
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        response = await self.async_client.get(f'/api/{url}', headers={'If-None-Match': '"otro"'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+    
+    async def test_other_methods_use_sync_views(self):
+        """Test POST, PUT y DELETE siguen pasando por las APIView"""
+        response = await self.async_client.post(
+            '/api/claim',
+            {'user': self.user.id, 'subject': 'Nuevo', 'description': 'Desc'},
+            content_type='application/json'
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        claim_id = json.loads(response.content)['id']
+        
+        response = await self.async_client.put(f'/api/claim/{claim_id}', {'status': 'Resuelto'}, content_type='application/json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual((await Claim.objects.aget(pk=claim_id)).status, 'Resuelto')
+        
+        response = await self.async_client.delete(f'/api/claim/{claim_id}')
+        self.assertIn(response.status_code, (status.HTTP_200_OK, status.HTTP_204_NO_CONTENT))
+        self.assertFalse(await Claim.objects.filter(pk=claim_id).aexists())
+
+
+class DailyStatusRollupTest(APITestCase):
+    """Tests para el resumen diario incremental de reclamos y solicitudes"""
+    
+    def setUp(self):
+        self.client = APIClient()
+        self.admin_user = User.objects.create(
+            first_name='Admin',
+            last_name='User',
+            email='admin@test.com',
+            password='password123',
+            is_admin=True
+        )
+        self.today = timezone.localdate()
+    
+    def rollup_counts(self, kind):
+        return {
+            row.normalized_status: row.count
+            for row in DailyStatusRollup.objects.filter(kind=kind, date=self.today)
+            if row.count
+        }
+    
+    def test_incremental_updates_through_views(self):
+        """Test el resumen se actualiza al crear, cambiar de estado y eliminar"""
+        response = self.client.post('/api/claim', {'user': self.admin_user.id, 'subject': 'A', 'description': 'B'}, format='json')
+        claim_id = response.data['id']
+        self.client.post('/api/request', {'user': self.admin_user.id, 'subject': 'A', 'description': 'B', 'status': 'en proceso'}, format='json')
+        self.assertEqual(self.rollup_counts('claim'), {'pendiente': 1})
+        self.assertEqual(self.rollup_counts('request'), {'en_proceso': 1})
+        
+        self.client.patch('/api/admin', {'user_id': self.admin_user.id, 'type': 'claim', 'id': claim_id, 'status': 'Completado'}, format='json')
+        self.assertEqual(self.rollup_counts('claim'), {'completado': 1})
+        
+        self.client.put(f'/api/claim/{claim_id}', {'subject': 'Nuevo asunto'}, format='json')
+        self.assertEqual(self.rollup_counts('claim'), {'completado': 1})
+        
+        self.client.delete(f'/api/claim/{claim_id}')
+        self.assertEqual(self.rollup_counts('claim'), {})
+    
+    def test_rebuild_matches_incremental(self):
+        """Test la reconstrucción completa produce los mismos conteos"""
+        for status_value in ('pendiente', 'Pendiente', 'en proceso', None, 'otro estado'):
+            Claim.objects.create(user=self.admin_user, subject='A', description='B', status=status_value)
+        incremental = self.rollup_counts('claim')
+        call_command('rebuild_rollup', stdout=StringIO())
+        self.assertEqual(self.rollup_counts('claim'), incremental)
+        self.assertEqual(incremental, {'pendiente': 2, 'en_proceso': 1, 'sin_estado': 1, 'otro': 1})
+    
+    def test_report_does_not_scan_source_tables(self):
+        """Test ReportsView solo consulta la tabla de resumen"""
+        Claim.objects.create(user=self.admin_user, subject='A', description='B', status='pendiente')
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(f'/api/reports/?user_id={self.admin_user.id}')
+        self.assertEqual(response.data['claims_stats']['pendiente'], 1)
+        tables = ' '.join(query['sql'] for query in context.captured_queries)
+        self.assertNotIn('appresolution_claim', tables.lower())
+        self.assertNotIn('appresolution_request', tables.lower())
+
+
+@skipUnless(os.environ.get('RESOLUTION_BENCHMARK'), 'Benchmarks desactivados (defina RESOLUTION_BENCHMARK=1)')
+class EmailOutboxBenchmarkTest(TestCase):
+    """Benchmark de encolado y envío con un transporte falso que simula la latencia del proveedor"""
+    
+    MESSAGES = int(os.environ.get('RESOLUTION_BENCHMARK_EMAILS', 500))
+    
+    def test_enqueue_and_drain_throughput(self):
+        started = time.perf_counter()
+        for i in range(self.MESSAGES):
+            enqueue_auth_email(f'{i:06d}', f'user{i}@test.com')
+        enqueue_elapsed = time.perf_counter() - started
+        
+        transport = FakeTransport(delay=0.01)
+        started = time.perf_counter()
+        stats = drain_outbox(transport, max_workers=8, batch_size=100)
+        drain_elapsed = time.perf_counter() - started
+        print(f"\nEncolado: {enqueue_elapsed / self.MESSAGES * 1000:.2f} ms/correo, "
+              f"envío: {self.MESSAGES / drain_elapsed:.0f} correos/s")
+        self.assertEqual(stats['sent'], self.MESSAGES)
+
+
+@skipUnless(os.environ.get('RESOLUTION_BENCHMARK'), 'Benchmarks desactivados (defina RESOLUTION_BENCHMARK=1)')
+class BulkCreateBenchmarkTest(APITestCase):
+    """Benchmark de filas por segundo: alta masiva frente a una petición por reclamo"""
+    
+    ROWS = int(os.environ.get('RESOLUTION_BENCHMARK_BULK_ROWS', 2000))
+    
+    def test_bulk_vs_single_item(self):
+        user = User.objects.create(first_name='Bench', last_name='User', email='bench@test.com', password='x')
+        items = [{'user': user.id, 'subject': f'Ticket {i}', 'description': 'Importado'} for i in range(self.ROWS)]
+        
+        started = time.perf_counter()
+        for item in items:
+            self.client.post('/api/claim', item, format='json')
+        single_rate = self.ROWS / (time.perf_counter() - started)
+        
+        started = time.perf_counter()
+        response = self.client.post('/api/claim/bulk', items, format='json')
+        bulk_rate = self.ROWS / (time.perf_counter() - started)
+        
+        print(f"\nAlta individual: {single_rate:.0f} filas/s, alta masiva: {bulk_rate:.0f} filas/s")
+        self.assertEqual(response.data['created'], self.ROWS)
+        self.assertGreater(bulk_rate, single_rate)
+
+
+@skipUnless(os.environ.get('RESOLUTION_BENCHMARK'), 'Benchmarks desactivados (defina RESOLUTION_BENCHMARK=1)')
+class JSONRendererBenchmarkTest(TestCase):
+    """Benchmark del tiempo de codificación de 10k reclamos serializados"""
+    
+    ROWS = int(os.environ.get('RESOLUTION_BENCHMARK_JSON_ROWS', 10000))
+    
+    def test_fast_vs_default_renderer(self):
+        user = User.objects.create(first_name='Bench', last_name='User', email='bench@test.com', password='x')
+        Claim.objects.bulk_create([
+            Claim(user=user, subject=f'Reclamo {i}', description='Descripción del reclamo ' * 5, status='Pendiente')
+            for i in range(self.ROWS)
+        ])
+        data = claim_serializer(Claim.objects.all(), many=True).data
+        
+        def best_of(renderer, repeat=5):
+            timings = []
+            for _ in range(repeat):
+                started = time.perf_counter()
+                body = renderer.render(data)
+                timings.append(time.perf_counter() - started)
+            return min(timings), body
+        
+        default_time, default_body = best_of(JSONRenderer())
+        fast_time, fast_body = best_of(FastJSONRenderer())
+        print(f"\nJSONRenderer: {default_time * 1000:.1f} ms, FastJSONRenderer (orjson={fast_renderers.USE_ORJSON}): {fast_time * 1000:.1f} ms")
+        self.assertEqual(fast_body, default_body)
+
+
+@skipUnless(os.environ.get('RESOLUTION_BENCHMARK'), 'Benchmarks desactivados (defina RESOLUTION_BENCHMARK=1)')
+class ReadSerializerBenchmarkTest(TestCase):
+    """Benchmark de filas por segundo: ModelSerializer frente a read_serializer sobre .values()"""
+    
+    ROWS = int(os.environ.get('RESOLUTION_BENCHMARK_READ_ROWS', 100000))
+    
+    def test_read_serializer_throughput(self):
+        user = User.objects.create(first_name='Bench', last_name='User', email='bench@test.com', password='x')
+        Claim.objects.bulk_create(
+            [Claim(user=user, subject=f'Reclamo {i}', description='Descripción', status='Pendiente') for i in range(self.ROWS)],
+            batch_size=5000,
+        )
+        queryset = Claim.objects.order_by('pk')
+        
+        started = time.perf_counter()
+        model_data = claim_serializer(queryset, many=True).data
+        model_rate = self.ROWS / (time.perf_counter() - started)
+        
+        started = time.perf_counter()
+        read_data = claim_read_serializer.serialize(list(claim_read_serializer.project(queryset)))
+        read_rate = self.ROWS / (time.perf_counter() - started)
+        
+        print(f"\nclaim_serializer: {model_rate:.0f} filas/s, claim_read_serializer: {read_rate:.0f} filas/s")
+        self.assertEqual(JSONRenderer().render(read_data), JSONRenderer().render(model_data))
+        self.assertGreater(read_rate, model_rate)
+
+
+@skipUnless(os.environ.get('RESOLUTION_BENCHMARK'), 'Benchmarks desactivados (defina RESOLUTION_BENCHMARK=1)')
+class ConnectionReuseBenchmarkTest(TestCase):
+    """Benchmark de latencia por petición: conexión nueva en cada petición frente a conexión persistente"""
+    
+    REQUESTS = int(os.environ.get('RESOLUTION_BENCHMARK_CONN_REQUESTS', 500))
+    
+    def latency(self, conn_max_age, settings_dict):
+        wrapper = load_backend(settings_dict['ENGINE']).DatabaseWrapper(
+            {**settings_dict, 'CONN_MAX_AGE': conn_max_age, 'CONN_HEALTH_CHECKS': True}, 'benchmark'
+        )
+        started = time.perf_counter()
+        for _ in range(self.REQUESTS):
+            # Mismo ciclo que las señales request_started / request_finished de Django
+            wrapper.close_if_unusable_or_obsolete()
+            with wrapper.cursor() as cursor:
+                cursor.execute('SELECT 1')
+            wrapper.close_if_unusable_or_obsolete()
+        elapsed = time.perf_counter() - started
+        wrapper.close()
+        return elapsed / self.REQUESTS * 1000
+    
+    def test_persistent_vs_new_connection(self):
+        settings_dict = dict(connection.settings_dict)
+        if connection.vendor == 'sqlite':
+            # Una base SQLite en memoria no se cierra nunca; se usa un archivo como sustituto
+            settings_dict['NAME'] = os.path.join(tempfile.mkdtemp(), 'benchmark.sqlite3')
+        per_request = self.latency(0, settings_dict)
+        persistent = self.latency(60, settings_dict)
+        print(f"\n{connection.vendor}: conexión por petición {per_request:.3f} ms, conexión persistente {persistent:.3f} ms")
+        self.assertLess(persistent, per_request)
+
+
+@skipUnless(os.environ.get('RESOLUTION_BENCHMARK'), 'Benchmarks desactivados (defina RESOLUTION_BENCHMARK=1)')
+class PasswordHashingBenchmarkTest(TestCase):
+    """Benchmark de logins por segundo (verificación PBKDF2) con 1, 4 y 16 clientes concurrentes"""
+    
+    LOGINS_PER_CLIENT = int(os.environ.get('RESOLUTION_BENCHMARK_LOGINS_PER_CLIENT', 2))
+    WORKERS = int(os.environ.get('RESOLUTION_BENCHMARK_HASH_WORKERS', os.cpu_count() or 1))
+    
+    def logins_per_second(self, clients, user):
+        total = clients * self.LOGINS_PER_CLIENT
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=clients) as pool:
+            results = list(pool.map(lambda _: check_user_password(user, 'secreta123'), range(total)))
+        self.assertTrue(all(results))
+        return total / (time.perf_counter() - started)
+    
+    @override_settings(PASSWORD_HASHERS=['django.contrib.auth.hashers.PBKDF2PasswordHasher'])
+    def test_logins_per_second(self):
+        user = User(email='bench@test.com', password=make_password('secreta123'))
+        self.addCleanup(shutdown_password_executor)
+        print()
+        for clients in (1, 4, 16):
+            inline = self.logins_per_second(clients, user)
+            with patch.object(passwords.config, 'PASSWORD_HASH_WORKERS', self.WORKERS):
+                password_executor().submit(os.getpid).result()
+                pooled = self.logins_per_second(clients, user)
+            shutdown_password_executor()
+            print(f"{clients:>2} clientes: en el hilo {inline:.1f} logins/s, pool de {self.WORKERS} procesos {pooled:.1f} logins/s")
+
+
+@skipUnless(os.environ.get('RESOLUTION_BENCHMARK'), 'Benchmarks desactivados (defina RESOLUTION_BENCHMARK=1)')
+@override_settings(ROOT_URLCONF='AppResolution.tests')
+class AsyncViewsBenchmarkTest(TransactionTestCase):
+    """Benchmark de GET /claim concurrentes: APIView en un pool de hilos (WSGI) frente a la vista async (ASGI)"""
+    
+    REQUESTS = int(os.environ.get('RESOLUTION_BENCHMARK_ASYNC_REQUESTS', 200))
+    CONCURRENCY = int(os.environ.get('RESOLUTION_BENCHMARK_ASYNC_CONCURRENCY', 16))
+    DB_LATENCY_MS = float(os.environ.get('RESOLUTION_BENCHMARK_DB_LATENCY_MS', 5))
+    
+    def setUp(self):
+        user = User.objects.create(first_name='Bench', last_name='User', email='bench@test.com', password='x')
+        Claim.objects.bulk_create([
+            Claim(user=user, subject=f'Bench {i}', description='Bench', status='Pendiente') for i in range(200)
+        ])
+        self.url = f'claim/user/{user.id}?page_size=20'
+    
+    def db_latency(self, execute, sql, params, many, context):
+        # Latencia de red simulada de la base de datos remota
+        time.sleep(self.DB_LATENCY_MS / 1000)
+        return execute(sql, params, many, context)
+    
+    def wsgi_requests_per_second(self):
+        def call(_):
+            with connection.execute_wrapper(self.db_latency):
+                return Client().get(f'/sync/{self.url}').status_code
+        
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=self.CONCURRENCY) as pool:
+            codes = list(pool.map(call, range(self.REQUESTS)))
+        elapsed = time.perf_counter() - started
+        self.assertEqual(set(codes), {status.HTTP_200_OK})
+        return self.REQUESTS / elapsed
+    
+    def asgi_requests_per_second(self, prefix):
+        client = AsyncClient()
+        
+        async def run():
+            semaphore = asyncio.Semaphore(self.CONCURRENCY)
+            
+            async def call():
+                async with semaphore:
+                    return (await client.get(f'/{prefix}/{self.url}')).status_code
+            return await asyncio.gather(*(call() for _ in range(self.REQUESTS)))
+        
+        started = time.perf_counter()
+        # El ORM async (y las vistas síncronas bajo ASGI) ejecutan las consultas en el hilo que llama a async_to_sync
+        with connection.execute_wrapper(self.db_latency):
+            codes = async_to_sync(run)()
+        elapsed = time.perf_counter() - started
+        self.assertEqual(set(codes), {status.HTTP_200_OK})
+        return self.REQUESTS / elapsed
+    
+    def test_concurrent_reads(self):
+        wsgi = self.wsgi_requests_per_second()
+        asgi_sync = self.asgi_requests_per_second('sync')
+        asgi = self.asgi_requests_per_second('api')
+        print(
+            f"\n{self.REQUESTS} peticiones, {self.CONCURRENCY} concurrentes, {self.DB_LATENCY_MS:g} ms por consulta: "
+            f"WSGI {wsgi:.1f} req/s, ASGI con APIView {asgi_sync:.1f} req/s, ASGI con vistas async {asgi:.1f} req/s"
+        )
+        if self.async_views_enabled_by_default():
+            self.assertGreater(asgi, wsgi, 'asgi.py activa las vistas async por defecto pero rinden menos que WSGI')
+    
+    def async_views_enabled_by_default(self):
+        import Resolution.asgi as project_asgi
+        with patch.dict(os.environ):
+            os.environ.pop('RESOLUTION_ASYNC_VIEWS', None)
+            importlib.reload(project_asgi)
+            return os.environ.get('RESOLUTION_ASYNC_VIEWS', '0') == '1'
+
+
+@skipUnless(os.environ.get('RESOLUTION_BENCHMARK'), 'Benchmarks desactivados (defina RESOLUTION_BENCHMARK=1)')
+class ReportsBenchmarkTest(TestCase):
+    """Benchmark de ReportsView con una tabla grande de reclamos"""
+    
+    ROWS = int(os.environ.get('RESOLUTION_BENCHMARK_ROWS', 1000000))
+    BUDGET_SECONDS = float(os.environ.get('RESOLUTION_REPORT_BUDGET', 5.0))
+    
+    @classmethod
+    def setUpTestData(cls):
+        user = User.objects.create(first_name='Bench', last_name='User', email='bench@test.com', password='x')
+        statuses = ['pendiente', 'en proceso', 'completado']
+        now = timezone.now()
+        batch = []
+        for i in range(cls.ROWS):
+            batch.append(Claim(user=user, subject='Bench', description='', status=statuses[i % 3]))
+            if len(batch) == 10000:
+                Claim.objects.bulk_create(batch)
+                batch = []
+        Claim.objects.bulk_create(batch)
+        Claim.objects.update(created_at=now - timedelta(days=7))
+        rebuild_rollup()
+    
+    def test_report_latency(self):
+        today = timezone.localdate()
+        started = time.perf_counter()
+        report = build_report(today - timedelta(days=29), today)
+        elapsed = time.perf_counter() - started
+        print(f"\nReportsView: {self.ROWS} filas en {elapsed:.3f}s")
+        self.assertEqual(report['claims_stats']['total'], self.ROWS)
+        self.assertLess(elapsed, self.BUDGET_SECONDS)
+
+
+class StatusCodeTest(APITestCase):
+    """Tests para el código de estado normalizado"""
+    
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create(
+            first_name='Test',
+            last_name='User',
+            email='test@test.com',
+            password='password123',
+            is_admin=True
+        )
+    
+    def test_status_code_for(self):
+        """Test normalización de los textos de estado"""
+        self.assertEqual(status_code_for('Pendiente'), Status.PENDIENTE)
+        self.assertEqual(status_code_for('pendiente'), Status.PENDIENTE)
+        self.assertEqual(status_code_for(' en  proceso '), Status.EN_PROCESO)
+        self.assertEqual(status_code_for('EN_PROCESO'), Status.EN_PROCESO)
+        self.assertEqual(status_code_for('Completado'), Status.COMPLETADO)
+        self.assertEqual(status_code_for('cerrado'), Status.OTRO)
+        self.assertIsNone(status_code_for(None))
+    
+    def test_api_keeps_status_text(self):
+        """Test la API acepta y devuelve el texto original del estado"""
+        response = self.client.post('/api/claim', {'user': self.user.id, 'subject': 'A', 'description': 'B', 'status': 'En Proceso'}, format='json')
+        self.assertEqual(response.data['status'], 'En Proceso')
+        claim = Claim.objects.get(id=response.data['id'])
+        self.assertEqual(claim.status_code, Status.EN_PROCESO)
+        
+        self.client.patch('/api/admin', {'user_id': self.user.id, 'type': 'claim', 'id': claim.id, 'status': 'Completado'}, format='json')
+        claim.refresh_from_db()
+        self.assertEqual(claim.status, 'Completado')
+        self.assertEqual(claim.status_code, Status.COMPLETADO)
+    
+    def test_update_fields_includes_status_code(self):
+        """Test guardar solo el estado también actualiza su código"""
+        request_obj = Request.objects.create(user=self.user, subject='A', description='B', status='pendiente')
+        request_obj.status = 'completado'
+        request_obj.save(update_fields=['status'])
+        request_obj.refresh_from_db()
+        self.assertEqual(request_obj.status_code, Status.COMPLETADO)
+
+
+class IndexUsageTest(TestCase):
+    """Tests con EXPLAIN que comprueban que el planificador usa los índices de las rutas frecuentes"""
+    
+    def setUp(self):
+        self.user = User.objects.create(
+            first_name='Test',
+            last_name='User',
+            email='test@test.com',
+            password='password123'
+        )
+        for i in range(20):
+            Claim.objects.create(user=self.user, subject=f'Claim {i}', description='Description', status='pendiente')
+            Request.objects.create(user=self.user, subject=f'Request {i}', description='Description', status='completado')
+        Authentication.objects.create(user=self.user, token='123456')
+        if connection.vendor == 'postgresql':
+            # Con tablas tan pequeñas Postgres prefiere un recorrido secuencial
+            with connection.cursor() as cursor:
+                cursor.execute('SET enable_seqscan = off')
+    
+    def assertUsesIndex(self, queryset, index_name):
+        plan = queryset.explain()
+        self.assertIn(index_name, plan, plan)
+    
+    def test_user_created_at_index(self):
+        """Test filtro por usuario ordenado por fecha"""
+        self.assertUsesIndex(Claim.objects.filter(user_id=self.user.id).order_by('created_at'), 'claim_user_created_idx')
+        self.assertUsesIndex(Request.objects.filter(user_id=self.user.id).order_by('created_at'), 'request_user_created_idx')
+    
+    def test_status_created_at_index(self):
+        """Test filtro por código de estado y rango de fechas"""
+        since = timezone.now() - timedelta(days=30)
+        self.assertUsesIndex(Claim.objects.filter(status_code=Status.PENDIENTE, created_at__gte=since), 'claim_status_created_idx')
+        self.assertUsesIndex(Request.objects.filter(status_code=Status.COMPLETADO, created_at__gte=since), 'request_status_created_idx')
+    
+    def test_authentication_user_index(self):
+        """Test el código de autenticación de un usuario se busca por la restricción única"""
+        # SQLite crea la restricción única como un índice automático sin el nombre de la restricción
+        index_name = 'sqlite_autoindex' if connection.vendor == 'sqlite' else 'auth_user_unique'
+        self.assertUsesIndex(Authentication.objects.filter(user_id=self.user.id), index_name)
+    
+    def test_status_filter_uses_status_index(self):
+        """Test el filtro status de los listados usa el índice de código de estado"""
+        queryset, _, _ = filter_items(Claim.objects.all(), {'status': 'Pendiente', 'created_from': '2020-01-01'})
+        self.assertUsesIndex(queryset, 'claim_status_created_idx')
+    
+    @skipUnless(connection.vendor == 'postgresql', 'La búsqueda de texto completo requiere Postgres')
+    def test_search_uses_gin_index(self):
+        """Test la búsqueda de texto completo usa el índice GIN"""
+        self.assertUsesIndex(search_queryset(Claim.objects.all(), 'claim'), 'claim_search_idx')
+        self.assertUsesIndex(search_queryset(Request.objects.all(), 'request'), 'request_search_idx')
+
+
+class HistoricalMigrationsTest(TestCase):
+    """Tests para que las migraciones no dependan del código actual de la aplicación"""
+    
+    def test_migrations_do_not_import_app_code(self):
+        """Test ninguna migración importa AppResolution.utils ni AppResolution.config"""
+        directory = os.path.join(os.path.dirname(__file__), 'migrations')
+        for name in sorted(os.listdir(directory)):
+            if not name.endswith('.py'):
+                continue
+            with open(os.path.join(directory, name), encoding='utf-8') as migration:
+                source = migration.read()
+            for module in ('AppResolution.utils', 'AppResolution.config'):
+                self.assertNotIn(f'from {module}', source, name)
+                self.assertNotIn(f'import {module}', source, name)
+    
+    def test_search_config_matches_indexes(self):
+        """Test la configuración de búsqueda coincide con la de los índices GIN"""
+        migration = importlib.import_module('AppResolution.migrations.0017_search_indexes')
+        self.assertEqual(SEARCH_CONFIG, migration.SEARCH_CONFIG)
+
+
+class FastJSONTest(APITestCase):
+    """Tests para el renderer y el parser JSON rápidos"""
+    
+    def setUp(self):
+        self.user = User.objects.create(first_name='Test', last_name='User', email='test@test.com', password='x')
+    
+    def assertSameAsDRF(self, data):
+        self.assertEqual(FastJSONRenderer().render(data), JSONRenderer().render(data))
+    
+    def test_serialized_claims_are_byte_identical(self):
+        """Test la salida de los serializadores es idéntica a la de JSONRenderer"""
+        Claim.objects.create(user=self.user, subject='Reclamo ñandú', description='Línea\u2028separada', status='Pendiente')
+        Claim.objects.create(user=self.user, subject='Otro', description='D', status=None)
+        self.assertSameAsDRF(claim_serializer(Claim.objects.all(), many=True).data)
+    
+    def test_special_values_match_drf_encoder(self):
+        """Test fechas, decimales, textos perezosos y claves no textuales"""
+        moment = timezone.now().replace(microsecond=123456)
+        self.assertSameAsDRF({
+            'created_at': moment,
+            'naive': moment.replace(tzinfo=None),
+            'date': moment.date(),
+            'amount': Decimal('10.50'),
+            'lazy': gettext_lazy('Texto'),
+            'nested': [{'a': 1, 'b': None, 'c': True, 'd': 1.5}],
+            1: 'clave numérica',
+            'big': 2 ** 70,
+        })
+        self.assertEqual(FastJSONRenderer().render(None), b'')
+    
+    def test_indent_uses_stdlib(self):
+        """Test las respuestas con sangría conservan el formato de DRF"""
+        data = {'a': [1, 2]}
+        context = {'indent': 4}
+        self.assertEqual(FastJSONRenderer().render(data, renderer_context=context), JSONRenderer().render(data, renderer_context=context))
+    
+    def test_stdlib_backend(self):
+        """Test con RESOLUTION_JSON_BACKEND=stdlib se usa el JSON de DRF"""
+        with patch.object(fast_renderers, 'USE_ORJSON', False):
+            self.assertSameAsDRF({'created_at': timezone.now()})
+            self.assertEqual(FastJSONParser().parse(BytesIO(b'{"a": 1}')), {'a': 1})
+    
+    def test_parser(self):
+        """Test el parser decodifica JSON válido y rechaza el inválido"""
+        data = FastJSONParser().parse(BytesIO('{"subject": "ñ", "items": [1, 2]}'.encode()))
+        self.assertEqual(data, {'subject': 'ñ', 'items': [1, 2]})
+        with self.assertRaises(ParseError):
+            FastJSONParser().parse(BytesIO(b'{"a": '))
+        with self.assertRaises(ParseError):
+            FastJSONParser().parse(BytesIO(b'{"a": NaN}'))
+    
+    def test_api_uses_fast_renderer(self):
+        """Test las vistas responden con el renderer configurado"""
+        Claim.objects.create(user=self.user, subject='Reclamo', description='D', status='Pendiente')
+        response = self.client.post('/api/claim', {'user': self.user.id, 'subject': 'Nuevo', 'description': 'D'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        response = self.client.get('/api/claim')
+        self.assertIsInstance(response.accepted_renderer, FastJSONRenderer)
+        self.assertEqual(response.content, JSONRenderer().render(response.data))
+
+
+class DatabaseSettingsTest(TestCase):
+    """Tests de la configuración de conexiones a la base de datos por variables de entorno"""
+    
+    def load_settings(self, **environ):
+        import Resolution.settings as project_settings
+        self.addCleanup(importlib.reload, project_settings)
+        with patch.dict(os.environ, environ):
+            return importlib.reload(project_settings).DATABASES['default']
+    
+    def test_persistent_connections_by_default(self):
+        """Test por defecto las conexiones duran 60 segundos y se verifican antes de reutilizarse"""
+        database = self.load_settings()
+        self.assertEqual(database['CONN_MAX_AGE'], 60)
+        self.assertTrue(database['CONN_HEALTH_CHECKS'])
+        self.assertNotIn('pool', database['OPTIONS'])
+    
+    def test_environment_overrides(self):
+        """Test CONN_MAX_AGE y CONN_HEALTH_CHECKS desde el entorno"""
+        database = self.load_settings(RESOLUTION_DB_CONN_MAX_AGE='none', RESOLUTION_DB_CONN_HEALTH_CHECKS='0')
+        self.assertIsNone(database['CONN_MAX_AGE'])
+        self.assertFalse(database['CONN_HEALTH_CHECKS'])
+    
+    def with_driver(self, *installed):
+        find_spec = importlib.util.find_spec
+        return patch('importlib.util.find_spec', side_effect=lambda name, *args: object() if name in installed else find_spec(name, *args))
+    
+    def test_pool_replaces_persistent_connections(self):
+        """Test con el pool activado CONN_MAX_AGE queda en 0"""
+        with self.with_driver('psycopg', 'psycopg_pool'):
+            database = self.load_settings(RESOLUTION_DB_POOL='1', RESOLUTION_DB_POOL_MAX_SIZE='20')
+        self.assertEqual(database['CONN_MAX_AGE'], 0)
+        self.assertEqual(database['OPTIONS']['pool'], {'min_size': 2, 'max_size': 20, 'timeout': 10})
+        self.assertEqual(database['OPTIONS']['sslmode'], 'require')
+    
+    def test_pool_requires_psycopg3(self):
+        """Test activar el pool sin psycopg 3 falla al cargar la configuración y no al conectar"""
+        with patch('importlib.util.find_spec', return_value=None):
+            with self.assertRaisesMessage(ImproperlyConfigured, 'psycopg[pool]'):
+                self.load_settings(RESOLUTION_DB_POOL='1')
+
+
 class UtilsTest(TestCase):
     """Tests para funciones de utilidad"""
     
@@ -841,12 +3155,19 @@ class UtilsTest(TestCase):
         self.assertEqual(len(code), 6)
         self.assertTrue(code.isdigit())
     
-    def test_get_latest_auth_code(self):
-        """Test obtener último código de autenticación"""
-        # Primero generar un código
-        generate_auth_code()
-        latest_code = get_latest_auth_code()
-        self.assertIsNotNone(latest_code)
+    def test_generate_auth_code_has_no_shared_state(self):
+        """Test cada llamada devuelve su propio código, sin variable global"""
+        import AppResolution.utils.authToken as auth_token
+        codes = {generate_auth_code() for _ in range(200)}
+        self.assertGreater(len(codes), 150)
+        self.assertFalse(hasattr(auth_token, 'latest_auth_code'))
+    
+    def test_verify_auth_code(self):
+        """Test comparación de códigos"""
+        self.assertTrue(verify_auth_code('012345', '012345'))
+        self.assertTrue(verify_auth_code('123456', 123456))
+        self.assertFalse(verify_auth_code('012345', '012346'))
+        self.assertFalse(verify_auth_code(None, '012345'))
 
 
 class IntegrationTest(APITestCase):
@@ -871,12 +3192,10 @@ class IntegrationTest(APITestCase):
         user_id = response.data['id']
         
         # 2. Generar código de verificación
-        with patch('AppResolution.views.send_auth_email'), \
-             patch('AppResolution.views.generate_auth_code') as mock_generate, \
-             patch('AppResolution.views.get_latest_auth_code') as mock_get_code:
+        with patch('AppResolution.views.enqueue_auth_email'), \
+             patch('AppResolution.views.generate_auth_code') as mock_generate:
             
             mock_generate.return_value = '123456'
-            mock_get_code.return_value = '123456'
             
             response = self.client.get(f'/api/auth/{user_id}')
             self.assertEqual(response.status_code, status.HTTP_200_OK)
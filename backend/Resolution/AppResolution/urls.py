@@ -1,38 +1,66 @@
 from django.urls import path
 
-from AppResolution.views import UserView, ClaimView, RequestView, ProfileView, AuthenticationView, LoginView, AdminView, ReportsView
-
-urlpatterns = [
-    # User endpoints
-    path('user', UserView.as_view()),
-    path('user/<int:pk>', UserView.as_view()),
-    
-    # Login endpoint
-    path('login', LoginView.as_view()),
-
-    # Auth endpoints
-    path('auth', AuthenticationView.as_view()),
-    path('auth/<int:pkid>', AuthenticationView.as_view()),
-    path('auth/verify', AuthenticationView.as_view()),
-
-    # Claim endpoints
-    path('claim', ClaimView.as_view()),
-    path('claim/<int:pk>', ClaimView.as_view()),
-    path('claim/user/<int:user_id>', ClaimView.as_view()),
-    
-    # Request endpoints
-    path('request', RequestView.as_view()),
-    path('request/<int:pk>', RequestView.as_view()),
-    path('request/user/<int:user_id>', RequestView.as_view()),
-    
-    # Profile endpoints
-    path('profile', ProfileView.as_view()),
-    path('profile/<int:pk>', ProfileView.as_view()),
-    path('profile/user/<int:user_id>', ProfileView.as_view()),
-    
-    # Admin endpoints
-    path('admin', AdminView.as_view()),
-    
-    # Reports endpoints
-    path('reports/', ReportsView.as_view()),
-]
+from AppResolution.config import ASYNC_VIEWS
+from AppResolution.views import UserView, ClaimView, RequestView, ProfileView, AuthenticationView, LoginView, AdminView, ReportsView, ClaimBulkView, RequestBulkView, AdminBulkView, AdminCacheStatsView, TokenRefreshView, AdminExportView
+
+
+def build_urlpatterns(async_reads=ASYNC_VIEWS):
+    """
+    Rutas de la API. Con async_reads los GET de reclamos, solicitudes, perfiles y reportes
+    usan las vistas asíncronas (despliegue ASGI); el resto de métodos siguen en las APIView.
+    """
+    if async_reads:
+        from AppResolution.async_views import hybrid_view, claim_get, request_get, profile_get, reports_get
+        claim_view = hybrid_view(claim_get, ClaimView)
+        request_view = hybrid_view(request_get, RequestView)
+        profile_view = hybrid_view(profile_get, ProfileView)
+        reports_view = hybrid_view(reports_get, ReportsView)
+    else:
+        claim_view = ClaimView.as_view()
+        request_view = RequestView.as_view()
+        profile_view = ProfileView.as_view()
+        reports_view = ReportsView.as_view()
+
+    return [
+        # User endpoints
+        path('user', UserView.as_view()),
+        path('user/<int:pk>', UserView.as_view()),
+
+        # Login endpoint
+        path('login', LoginView.as_view()),
+        path('token/refresh', TokenRefreshView.as_view()),
+
+        # Auth endpoints
+        path('auth', AuthenticationView.as_view()),
+        path('auth/<int:pkid>', AuthenticationView.as_view()),
+        path('auth/verify', AuthenticationView.as_view()),
+
+        # Claim endpoints
+        path('claim', claim_view),
+        path('claim/<int:pk>', claim_view),
+        path('claim/user/<int:user_id>', claim_view),
+        path('claim/bulk', ClaimBulkView.as_view()),
+
+        # Request endpoints
+        path('request', request_view),
+        path('request/<int:pk>', request_view),
+        path('request/user/<int:user_id>', request_view),
+        path('request/bulk', RequestBulkView.as_view()),
+
+        # Profile endpoints
+        path('profile', profile_view),
+        path('profile/<int:pk>', profile_view),
+        path('profile/user/<int:user_id>', profile_view),
+
+        # Admin endpoints
+        path('admin', AdminView.as_view()),
+        path('admin/bulk', AdminBulkView.as_view()),
+        path('admin/export', AdminExportView.as_view()),
+        path('admin/cache-stats', AdminCacheStatsView.as_view()),
+
+        # Reports endpoints
+        path('reports/', reports_view),
+    ]
+
+
+urlpatterns = build_urlpatterns()
@@ -1,24 +1,47 @@
-import random
+import secrets
 
-# Variable global para almacenar el último código generado
-latest_auth_code = None
+from django.db import connections, router
 
 def generate_auth_code():
     """
-    Genera un código de autenticación aleatorio de 6 dígitos y lo almacena en la variable global
+    Genera un código de autenticación aleatorio de 6 dígitos con el módulo secrets.
+    Cada llamada devuelve su propio valor; no hay estado compartido entre peticiones.
     """
-    global latest_auth_code
-    latest_auth_code = ''.join(str(random.randint(0, 9)) for _ in range(6))
-    return latest_auth_code
+    return f'{secrets.randbelow(10 ** 6):06d}'
 
-def get_latest_auth_code():
+def verify_auth_code(stored_code, input_code):
     """
-    Devuelve el último código de autenticación generado
+    Verifica si el código introducido coincide con el código almacenado
     """
-    return latest_auth_code
+    if stored_code is None or input_code is None:
+        return False
+    return secrets.compare_digest(str(stored_code), str(input_code))
 
-def verify_auth_code(stored_code, input_code):
+def store_auth_code(user_id, token, expires_at):
     """
-    Verifica si el código introducido coincide con el código almacenado
+    Guarda el código en la única fila de Authentication del usuario, creándola o reemplazándola.
+    En Postgres y SQLite es un único INSERT ... ON CONFLICT DO UPDATE; en otros motores, update_or_create.
     """
-    return stored_code == input_code
+    from AppResolution.models import Authentication
+
+    connection = connections[router.db_for_write(Authentication)]
+    if connection.vendor in ('postgresql', 'sqlite'):
+        quote = connection.ops.quote_name
+        table = quote(Authentication._meta.db_table)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'INSERT INTO {table} ({quote("user_id")}, {quote("token")}, {quote("expires_at")}) '
+                f'VALUES (%s, %s, %s) '
+                f'ON CONFLICT ({quote("user_id")}) '
+                f'DO UPDATE SET {quote("token")} = EXCLUDED.{quote("token")}, {quote("expires_at")} = EXCLUDED.{quote("expires_at")} '
+                f'RETURNING {quote("id")}',
+                [user_id, token, connection.ops.adapt_datetimefield_value(expires_at)],
+            )
+            auth_id = cursor.fetchone()[0]
+        return Authentication(id=auth_id, user_id=user_id, token=token, expires_at=expires_at)
+
+    auth_record, _ = Authentication.objects.update_or_create(
+        user_id=user_id,
+        defaults={'token': token, 'expires_at': expires_at},
+    )
+    return auth_record
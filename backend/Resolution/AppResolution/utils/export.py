@@ -0,0 +1,93 @@
+import csv
+import json
+
+from rest_framework import serializers
+
+from AppResolution.config import EXPORT_CHUNK_SIZE
+from AppResolution.models import Claim, Request
+
+# Tipos exportables, con el mismo nombre que usa AdminView.patch
+EXPORT_MODELS = {'claim': Claim, 'request': Request}
+
+EXPORT_FORMATS = {
+    'csv': 'text/csv; charset=utf-8',
+    'ndjson': 'application/x-ndjson; charset=utf-8',
+}
+
+ITEM_FIELDS = ('id', 'user', 'subject', 'description', 'status', 'created_at')
+USER_INFO_FIELDS = ('id', 'first_name', 'last_name', 'email')
+
+CSV_HEADER = ('type',) + ITEM_FIELDS + tuple(f'user_{field}' for field in USER_INFO_FIELDS[1:])
+
+# Mismo formato de fecha que los serializadores de la API
+_created_at_field = serializers.DateTimeField()
+
+
+class InvalidExport(ValueError):
+    pass
+
+
+def parse_export_params(params):
+    """
+    Devuelve (tipos, formato) a partir de los parámetros type y output
+    """
+    item_type = params.get('type')
+    if item_type and item_type not in EXPORT_MODELS:
+        raise InvalidExport("Tipo inválido. Use 'claim' o 'request'")
+    output = params.get('output') or 'csv'
+    if output not in EXPORT_FORMATS:
+        raise InvalidExport("Formato inválido. Use 'csv' o 'ndjson'")
+    return ([item_type] if item_type else list(EXPORT_MODELS)), output
+
+
+def iter_export_rows(item_types, chunk_size=None):
+    """
+    Recorre reclamos y solicitudes con su usuario mediante un cursor del servidor,
+    sin crear instancias de modelo ni cargar la tabla completa en memoria
+    """
+    chunk_size = chunk_size or EXPORT_CHUNK_SIZE
+    columns = ('id', 'user_id', 'subject', 'description', 'status', 'created_at',
+               'user__first_name', 'user__last_name', 'user__email')
+    for item_type in item_types:
+        queryset = EXPORT_MODELS[item_type].objects.order_by('id').values_list(*columns)
+        for row_id, user_id, subject, description, status, created_at, first_name, last_name, email in queryset.iterator(chunk_size=chunk_size):
+            yield {
+                'type': item_type,
+                'id': row_id,
+                'user': user_id,
+                'subject': subject,
+                'description': description,
+                'status': status,
+                'created_at': _created_at_field.to_representation(created_at),
+                'user_info': {'id': user_id, 'first_name': first_name, 'last_name': last_name, 'email': email},
+            }
+
+
+class _Echo:
+    """
+    Pseudo archivo para csv.writer que devuelve cada línea en lugar de guardarla
+    """
+    def write(self, value):
+        return value
+
+
+def stream_csv(rows):
+    writer = csv.writer(_Echo())
+    yield writer.writerow(CSV_HEADER)
+    for row in rows:
+        user = row['user_info']
+        yield writer.writerow(
+            [row['type']] + [row[field] for field in ITEM_FIELDS] + [user[field] for field in USER_INFO_FIELDS[1:]]
+        )
+
+
+def stream_ndjson(rows):
+    for row in rows:
+        yield json.dumps(row, ensure_ascii=False) + '\n'
+
+
+STREAMERS = {'csv': stream_csv, 'ndjson': stream_ndjson}
+
+
+def export_stream(item_types, output):
+    return STREAMERS[output](iter_export_rows(item_types))
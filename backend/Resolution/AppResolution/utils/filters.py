@@ -0,0 +1,119 @@
+from datetime import datetime, time, timedelta
+
+from django.db import connections
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+
+from AppResolution.config import SEARCH_CONFIG
+from AppResolution.utils.rollup import NULL_STATUS
+from AppResolution.utils.status import STATUS_KEYS, Status, status_code_for
+
+# ordering -> (claves de ordenamiento y del cursor, descendente)
+ORDERINGS = {
+    '-created_at': (('created_at', 'id'), True),
+    'created_at': (('created_at', 'id'), False),
+    '-id': (('id',), True),
+    'id': (('id',), False),
+    '-status': (('status_code', 'created_at', 'id'), True),
+    'status': (('status_code', 'created_at', 'id'), False),
+}
+
+# El estado puede ser nulo, así que no sirve como clave de un cursor
+CURSOR_ORDERINGS = ('-created_at', 'created_at', '-id', 'id')
+
+DEFAULT_KEYS = ORDERINGS['-created_at']
+
+
+class InvalidFilter(ValueError):
+    """
+    Un parámetro de filtrado, búsqueda u ordenamiento no es válido
+    """
+
+
+def parse_bound(value, name):
+    """
+    Acepta AAAA-MM-DD o una fecha y hora ISO 8601. Devuelve (momento, es_fecha_sola).
+    """
+    # parse_datetime también acepta una fecha sola, así que se prueba primero parse_date
+    try:
+        day = parse_date(value)
+        moment = None if day is not None else parse_datetime(value)
+    except ValueError:
+        moment = day = None
+    if moment is None and day is None:
+        raise InvalidFilter(f'{name} debe tener el formato AAAA-MM-DD o AAAA-MM-DDTHH:MM:SS')
+    if moment is None:
+        moment = datetime.combine(day, time.min)
+    if timezone.is_naive(moment):
+        moment = timezone.make_aware(moment)
+    return moment, day is not None
+
+
+def status_filter(value):
+    """
+    status=Pendiente,en_proceso filtra por status_code; sin_estado selecciona los nulos.
+    Un estado desconocido es un error: status_code_for lo convertiría en 'otro'.
+    """
+    codes, include_null = set(), False
+    for raw in value.split(','):
+        raw = raw.strip()
+        if not raw:
+            continue
+        if raw.lower() == NULL_STATUS:
+            include_null = True
+            continue
+        code = status_code_for(raw)
+        if code == Status.OTRO and raw.lower() != STATUS_KEYS[Status.OTRO]:
+            raise InvalidFilter(f'Estado no válido: {raw}')
+        codes.add(code)
+    condition = Q(status_code__in=codes) if codes else Q()
+    if include_null:
+        condition |= Q(status_code__isnull=True)
+    return condition
+
+
+def search_queryset(queryset, term):
+    """
+    En Postgres usa búsqueda de texto completo sobre subject y description (índice GIN de la
+    migración 0017); en otros motores, icontains sobre ambos campos.
+    """
+    if connections[queryset.db].vendor == 'postgresql':
+        from django.contrib.postgres.search import SearchQuery, SearchVector
+
+        return queryset.alias(
+            search_vector=SearchVector('subject', 'description', config=SEARCH_CONFIG)
+        ).filter(search_vector=SearchQuery(term, config=SEARCH_CONFIG, search_type='websearch'))
+    return queryset.filter(Q(subject__icontains=term) | Q(description__icontains=term))
+
+
+def filter_items(queryset, params, cursor=False):
+    """
+    Aplica status, created_from, created_to, search y ordering a un queryset de reclamos o solicitudes.
+    Devuelve (queryset, claves, descendente) para paginate_queryset.
+    """
+    if params.get('status'):
+        queryset = queryset.filter(status_filter(params['status']))
+    if params.get('created_from'):
+        moment, _ = parse_bound(params['created_from'], 'created_from')
+        queryset = queryset.filter(created_at__gte=moment)
+    if params.get('created_to'):
+        moment, date_only = parse_bound(params['created_to'], 'created_to')
+        if date_only:
+            # Una fecha sola como límite final incluye todo ese día
+            queryset = queryset.filter(created_at__lt=moment + timedelta(days=1))
+        else:
+            queryset = queryset.filter(created_at__lte=moment)
+    search = (params.get('search') or '').strip()
+    if search:
+        queryset = search_queryset(queryset, search)
+
+    ordering = params.get('ordering')
+    if not ordering:
+        return queryset, *DEFAULT_KEYS
+    if ordering not in ORDERINGS:
+        raise InvalidFilter(f"ordering inválido. Use uno de: {', '.join(ORDERINGS)}")
+    if cursor and ordering not in CURSOR_ORDERINGS:
+        raise InvalidFilter(f"Con paginación por cursor ordering debe ser uno de: {', '.join(CURSOR_ORDERINGS)}")
+    keys, descending = ORDERINGS[ordering]
+    return queryset.order_by(*[f'-{key}' if descending else key for key in keys]), keys, descending
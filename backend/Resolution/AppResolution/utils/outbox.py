@@ -0,0 +1,162 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from AppResolution.config import (
+    EMAIL_DEVELOPMENT_MODE, OUTBOX_MAX_WORKERS, OUTBOX_BATCH_SIZE, OUTBOX_MAX_ATTEMPTS,
+    OUTBOX_RETRY_BASE_SECONDS, OUTBOX_QUOTA_BACKOFF_SECONDS, OUTBOX_SEND_LEASE_SECONDS,
+)
+from AppResolution.models import EmailOutbox
+from AppResolution.utils.send import render_auth_email, send_email_message, EmailQuotaExceeded
+
+
+class MailerSendTransport:
+    """
+    Envía los correos de la cola por MailerSend
+    """
+
+    def send(self, message):
+        send_email_message(message.to_email, message.subject, message.html_body, message.text_body)
+
+
+class ConsoleTransport:
+    """
+    Modo desarrollo: muestra el correo en la consola del servidor
+    """
+
+    def send(self, message):
+        print("=" * 70)
+        print(f"📧 Destinatario: {message.to_email}")
+        print(f"📋 Asunto: {message.subject}")
+        print(message.text_body)
+        print("=" * 70)
+
+
+class FakeTransport:
+    """
+    Transporte en memoria para pruebas y benchmarks, sin red.
+    `delay` simula la latencia del proveedor y `fail` es una función opcional que
+    recibe el mensaje y devuelve la excepción a lanzar (o None).
+    """
+
+    def __init__(self, delay=0, fail=None):
+        self.delay = delay
+        self.fail = fail
+        self.sent = []
+        self._lock = threading.Lock()
+
+    def send(self, message):
+        if self.delay:
+            time.sleep(self.delay)
+        error = self.fail(message) if self.fail else None
+        if error is not None:
+            raise error
+        with self._lock:
+            self.sent.append((message.to_email, message.subject, message.text_body))
+
+
+def get_default_transport():
+    return ConsoleTransport() if EMAIL_DEVELOPMENT_MODE else MailerSendTransport()
+
+
+def enqueue_auth_email(token, user_email):
+    """
+    Encola el correo con el código de verificación. No hace ninguna llamada de red.
+    """
+    subject, html_content, text_content = render_auth_email(token, user_email)
+    return EmailOutbox.objects.create(
+        to_email=user_email,
+        subject=subject,
+        html_body=html_content,
+        text_body=text_content,
+    )
+
+
+def claim_batch(batch_size, now):
+    """
+    Reserva un lote de mensajes vencidos. Los mensajes en 'sending' cuya reserva expiró
+    (por ejemplo si el worker se detuvo) vuelven a tomarse.
+    """
+    with transaction.atomic():
+        ids = list(
+            EmailOutbox.objects.select_for_update(skip_locked=True)
+            .filter(status__in=['pending', 'sending'], next_attempt_at__lte=now)
+            .order_by('next_attempt_at')
+            .values_list('id', flat=True)[:batch_size]
+        )
+        if ids:
+            EmailOutbox.objects.filter(id__in=ids).update(
+                status='sending',
+                attempts=F('attempts') + 1,
+                next_attempt_at=now + timedelta(seconds=OUTBOX_SEND_LEASE_SECONDS),
+            )
+    return list(EmailOutbox.objects.filter(id__in=ids)) if ids else []
+
+
+# El cuerpo lleva el código de verificación en claro: se borra cuando el mensaje ya no se va a
+# enviar (enviado o fallido) y la fila queda solo como registro del destinatario y el asunto
+REDACTED_BODY = {'html_body': '', 'text_body': ''}
+
+
+def retry_delay(attempts):
+    return timedelta(seconds=OUTBOX_RETRY_BASE_SECONDS * 2 ** (attempts - 1))
+
+
+def drain_outbox(transport=None, max_workers=OUTBOX_MAX_WORKERS, batch_size=OUTBOX_BATCH_SIZE):
+    """
+    Envía los mensajes pendientes con un pool de hilos acotado hasta vaciar la cola.
+    Los errores se reintentan con espera exponencial y una respuesta 422 (cuota agotada)
+    detiene el envío y pospone los mensajes afectados.
+    Los hilos solo hacen la llamada de red; todas las escrituras en la base ocurren en este hilo.
+    """
+    transport = transport or get_default_transport()
+    stats = {'sent': 0, 'retried': 0, 'failed': 0, 'quota_exceeded': False}
+
+    def send(message):
+        try:
+            transport.send(message)
+            return message, None
+        except Exception as e:
+            return message, e
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        while True:
+            now = timezone.now()
+            messages = claim_batch(batch_size, now)
+            if not messages:
+                return stats
+
+            sent_ids, quota_ids = [], []
+            for message, error in pool.map(send, messages):
+                if error is None:
+                    sent_ids.append(message.id)
+                elif isinstance(error, EmailQuotaExceeded):
+                    quota_ids.append(message.id)
+                elif message.attempts >= OUTBOX_MAX_ATTEMPTS:
+                    EmailOutbox.objects.filter(id=message.id).update(status='failed', last_error=str(error), **REDACTED_BODY)
+                    stats['failed'] += 1
+                else:
+                    EmailOutbox.objects.filter(id=message.id).update(
+                        status='pending', last_error=str(error), next_attempt_at=now + retry_delay(message.attempts)
+                    )
+                    stats['retried'] += 1
+
+            now = timezone.now()
+            if sent_ids:
+                EmailOutbox.objects.filter(id__in=sent_ids).update(status='sent', sent_at=now, last_error='', **REDACTED_BODY)
+                stats['sent'] += len(sent_ids)
+            if quota_ids:
+                # La cuota no es culpa del mensaje: no cuenta como intento
+                EmailOutbox.objects.filter(id__in=quota_ids).update(
+                    status='pending',
+                    attempts=F('attempts') - 1,
+                    last_error='Límite de cuota de correos alcanzado',
+                    next_attempt_at=now + timedelta(seconds=OUTBOX_QUOTA_BACKOFF_SECONDS),
+                )
+                stats['quota_exceeded'] = True
+                return stats
@@ -0,0 +1,142 @@
+import base64
+import json
+
+from django.db.models import Q
+
+from AppResolution.config import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, LEGACY_MAX_ROWS
+
+
+class InvalidCursor(ValueError):
+    """
+    El cursor o el tamaño de página enviados por el cliente no son válidos
+    """
+
+
+def encode_cursor(values):
+    """
+    Convierte los valores de la última fila en un token opaco para la siguiente página
+    """
+    raw = json.dumps([value.isoformat() if hasattr(value, 'isoformat') else value for value in values])
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+
+def decode_cursor(token, model, keys):
+    """
+    Recupera los valores de ordenamiento guardados en un cursor
+    """
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()).decode())
+        if not isinstance(values, list) or len(values) != len(keys):
+            raise InvalidCursor('Cursor inválido')
+        return [model._meta.get_field(key).to_python(value) for key, value in zip(keys, values)]
+    except InvalidCursor:
+        raise
+    except Exception:
+        raise InvalidCursor('Cursor inválido')
+
+
+def get_page_size(request):
+    page_size = request.query_params.get('page_size')
+    if page_size in (None, ''):
+        return DEFAULT_PAGE_SIZE
+    try:
+        page_size = int(page_size)
+    except ValueError:
+        raise InvalidCursor('page_size debe ser un número entero')
+    if page_size < 1:
+        raise InvalidCursor('page_size debe ser mayor que cero')
+    return min(page_size, MAX_PAGE_SIZE)
+
+
+def is_paginated(request, cursor_param='cursor'):
+    """
+    El cliente usa paginación por cursor si envía el cursor (aunque esté vacío) o page_size
+    """
+    return cursor_param in request.query_params or 'page_size' in request.query_params
+
+
+def keyset_filter(keys, values, descending=True):
+    """
+    Construye la condición (k1, k2, ...) < (v1, v2, ...) para orden descendente, o > para ascendente
+    """
+    comparison = 'lt' if descending else 'gt'
+    condition = Q()
+    for index, key in enumerate(keys):
+        step = Q(**{f'{key}__{comparison}': values[index]})
+        for previous_key, previous_value in zip(keys[:index], values[:index]):
+            step &= Q(**{previous_key: previous_value})
+        condition |= step
+    return condition
+
+
+def page_queryset(request, queryset, keys=('created_at', 'id'), cursor_param='cursor', descending=True):
+    """
+    Prepara el queryset de una página sin evaluarlo. Devuelve (queryset, page_size);
+    page_size es None para los clientes sin cursor.
+    """
+    if not is_paginated(request, cursor_param):
+        if not queryset.ordered:
+            # Se mantiene el orden ascendente por pk de siempre, pero el tope conserva las
+            # LEGACY_MAX_ROWS filas más recientes y no las más antiguas
+            newest = queryset.order_by('-pk').values('pk')[:LEGACY_MAX_ROWS]
+            return queryset.filter(pk__in=newest).order_by('pk'), None
+        return queryset[:LEGACY_MAX_ROWS], None
+
+    page_size = get_page_size(request)
+    queryset = queryset.order_by(*[f'-{key}' if descending else key for key in keys])
+
+    token = request.query_params.get(cursor_param)
+    if token:
+        values = decode_cursor(token, queryset.model, keys)
+        queryset = queryset.filter(keyset_filter(keys, values, descending))
+    return queryset[:page_size + 1], page_size
+
+
+def page_result(rows, page_size, keys=('created_at', 'id')):
+    """
+    Recorta las filas leídas por page_queryset y calcula el siguiente cursor
+    """
+    if page_size is None:
+        return rows, None, False
+    next_cursor = None
+    if len(rows) > page_size:
+        rows = rows[:page_size]
+        last = rows[-1]
+        if isinstance(last, dict):
+            next_cursor = encode_cursor([last[key] for key in keys])
+        else:
+            next_cursor = encode_cursor([getattr(last, key) for key in keys])
+    return rows, next_cursor, True
+
+
+def paginate_queryset(request, queryset, keys=('created_at', 'id'), cursor_param='cursor', descending=True):
+    """
+    Pagina un queryset por keyset sobre `keys` en orden descendente (o ascendente).
+
+    Devuelve (filas, siguiente_cursor, paginado). Si el cliente no pidió paginación
+    se devuelve el queryset original limitado a LEGACY_MAX_ROWS filas.
+    """
+    queryset, page_size = page_queryset(request, queryset, keys, cursor_param, descending)
+    return page_result(list(queryset), page_size, keys)
+
+
+def page_total(request, queryset, rows, paginated, cursor_param='cursor'):
+    """
+    Total de filas del queryset filtrado para acompañar una página. Sin cursor se toma del propio
+    listado cuando no alcanzó LEGACY_MAX_ROWS; con cursor se cuenta solo en la primera página y
+    en las siguientes se devuelve None, ya que el cliente lo recibió al empezar.
+    """
+    if not paginated:
+        return len(rows) if len(rows) < LEGACY_MAX_ROWS else queryset.count()
+    if request.query_params.get(cursor_param):
+        return None
+    return queryset.count()
+
+
+async def apaginate_queryset(request, queryset, keys=('created_at', 'id'), cursor_param='cursor', descending=True):
+    """
+    Versión asíncrona de paginate_queryset para las vistas ASGI
+    """
+    queryset, page_size = page_queryset(request, queryset, keys, cursor_param, descending)
+    return page_result([row async for row in queryset], page_size, keys)
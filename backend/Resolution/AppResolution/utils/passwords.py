@@ -0,0 +1,124 @@
+import atexit
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+import django
+
+from django.contrib.auth.hashers import (
+    UNUSABLE_PASSWORD_SUFFIX_LENGTH,
+    get_hasher,
+    identify_hasher,
+    is_password_usable,
+    make_password,
+)
+from django.utils.crypto import get_random_string
+
+from AppResolution import config
+
+# Equivalentes a make_password y check_password de Django, pero el trabajo costoso del hasher
+# (PBKDF2, argon2...) puede ejecutarse en un pool de procesos acotado para no ocupar la CPU ni
+# el GIL del proceso que atiende las peticiones. El hasher se resuelve en el proceso principal
+# con PASSWORD_HASHERS y se envía ya construido a los procesos del pool.
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def password_executor():
+    """
+    Pool de procesos compartido, creado la primera vez que se usa. None si está desactivado.
+    """
+    global _executor
+    if config.PASSWORD_HASH_WORKERS <= 0:
+        return None
+    with _executor_lock:
+        if _executor is None:
+            # spawn: hacer fork de un servidor con varios hilos no es seguro
+            _executor = ProcessPoolExecutor(
+                max_workers=config.PASSWORD_HASH_WORKERS,
+                mp_context=multiprocessing.get_context('spawn'),
+                initializer=_init_worker,
+            )
+        return _executor
+
+
+def shutdown_password_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=True, cancel_futures=True)
+            _executor = None
+
+
+atexit.register(shutdown_password_executor)
+
+
+def _init_worker():
+    # Cargar Django permite recibir hashers definidos en cualquier aplicación instalada
+    if os.environ.get('DJANGO_SETTINGS_MODULE'):
+        django.setup()
+
+
+def _encode(hasher, password, salt):
+    return hasher.encode(password, salt)
+
+
+def _verify(hasher, password, encoded, harden_runtime):
+    is_correct = hasher.verify(password, encoded)
+    if not is_correct and harden_runtime:
+        hasher.harden_runtime(password, encoded)
+    return is_correct
+
+
+def _run(function, *args):
+    executor = password_executor()
+    if executor is None:
+        return function(*args)
+    return executor.submit(function, *args).result(timeout=config.PASSWORD_HASH_TIMEOUT_SECONDS)
+
+
+def hash_password(password):
+    """
+    Igual que make_password con el hasher preferido
+    """
+    if password is None or not isinstance(password, (bytes, str)):
+        # Contraseña inutilizable o tipo inválido: make_password resuelve o lanza el error sin hashear
+        return make_password(password)
+    hasher = get_hasher()
+    return _run(_encode, hasher, password, hasher.salt())
+
+
+def verify_password(password, encoded):
+    """
+    Igual que django.contrib.auth.hashers.verify_password: devuelve (es_correcta, debe_actualizarse)
+    """
+    fake_runtime = password is None or not is_password_usable(encoded)
+    preferred = get_hasher()
+    try:
+        hasher = identify_hasher(encoded)
+    except ValueError:
+        fake_runtime = True
+
+    if fake_runtime:
+        # Mismo costo que una contraseña real para no revelar qué cuentas existen
+        hash_password(get_random_string(UNUSABLE_PASSWORD_SUFFIX_LENGTH))
+        return False, False
+
+    hasher_changed = hasher.algorithm != preferred.algorithm
+    must_update = hasher_changed or preferred.must_update(encoded)
+    is_correct = _run(_verify, hasher, password, encoded, not hasher_changed and must_update)
+    return is_correct, must_update
+
+
+def check_user_password(user, password):
+    """
+    Verifica la contraseña del usuario y, si es correcta pero usa un hasher o parámetros antiguos,
+    la vuelve a hashear con el hasher preferido y la guarda.
+    """
+    is_correct, must_update = verify_password(password, user.password)
+    if is_correct and must_update:
+        user.password = hash_password(password)
+        user.save(update_fields=['password'])
+    return is_correct
@@ -0,0 +1,166 @@
+from functools import wraps
+
+from django.core.cache import cache
+from rest_framework import status
+from rest_framework.response import Response
+
+from AppResolution.config import ADMIN_CACHE_TTL_SECONDS
+from AppResolution.models import User
+
+
+class AdminFlagCache:
+    """
+    Caché con vencimiento de la bandera is_admin de cada usuario. Los contadores de aciertos y
+    fallos también viven en la caché, así que suman los de todos los procesos que la comparten
+    """
+
+    STATS = ('hits', 'misses')
+
+    def __init__(self, ttl=ADMIN_CACHE_TTL_SECONDS, prefix='admin_flag'):
+        self.ttl = ttl
+        self.prefix = prefix
+
+    def key(self, user_id):
+        return f'{self.prefix}:{user_id}'
+
+    def stats_key(self, name):
+        return f'{self.prefix}:stats:{name}'
+
+    def count(self, name):
+        key = self.stats_key(name)
+        try:
+            cache.incr(key)
+        except ValueError:
+            # Primer conteo, o la caché descartó el contador; add() evita pisar el de otro proceso
+            if not cache.add(key, 1, None):
+                cache.incr(key)
+
+    async def acount(self, name):
+        key = self.stats_key(name)
+        try:
+            await cache.aincr(key)
+        except ValueError:
+            if not await cache.aadd(key, 1, None):
+                await cache.aincr(key)
+
+    def is_admin(self, user_id):
+        """
+        Devuelve True/False, o None si el usuario no existe
+        """
+        user_id = int(user_id)
+        cached = cache.get(self.key(user_id))
+        if cached is not None:
+            self.count('hits')
+            return cached
+
+        self.count('misses')
+        flag = User.objects.filter(id=user_id).values_list('is_admin', flat=True).first()
+        if flag is not None:
+            cache.set(self.key(user_id), bool(flag), self.ttl)
+        return flag
+
+    async def ais_admin(self, user_id):
+        """
+        Versión asíncrona de is_admin para las vistas ASGI
+        """
+        user_id = int(user_id)
+        cached = await cache.aget(self.key(user_id))
+        if cached is not None:
+            await self.acount('hits')
+            return cached
+
+        await self.acount('misses')
+        flag = await User.objects.filter(id=user_id).values_list('is_admin', flat=True).afirst()
+        if flag is not None:
+            await cache.aset(self.key(user_id), bool(flag), self.ttl)
+        return flag
+
+    def remember(self, user):
+        """
+        Guarda la bandera de un usuario recién leído (login o renovación del token) para que
+        las peticiones con su token la encuentren en la caché
+        """
+        cache.set(self.key(user.id), bool(user.is_admin), self.ttl)
+
+    def invalidate(self, user_id):
+        cache.delete(self.key(user_id))
+
+    def stats(self):
+        values = cache.get_many([self.stats_key(name) for name in self.STATS])
+        hits, misses = (values.get(self.stats_key(name), 0) for name in self.STATS)
+        total = hits + misses
+        return {
+            'hits': hits,
+            'misses': misses,
+            'hit_rate': round(hits / total, 4) if total else 0.0,
+        }
+
+    def reset_stats(self):
+        cache.delete_many([self.stats_key(name) for name in self.STATS])
+
+
+admin_flags = AdminFlagCache()
+
+
+def get_request_user_id(request):
+    if request.method in ('GET', 'HEAD', 'OPTIONS'):
+        return request.query_params.get('user_id')
+    data = request.data
+    return data.get('user_id') if hasattr(data, 'get') else None
+
+
+ADMIN_DENIED = "Acceso denegado. Solo administradores."
+
+
+def _admin_error(is_admin):
+    if is_admin is None:
+        return {"error": "Usuario no encontrado"}, status.HTTP_404_NOT_FOUND
+    if not is_admin:
+        return {"error": ADMIN_DENIED}, status.HTTP_403_FORBIDDEN
+    return None
+
+
+def admin_error(request):
+    """
+    Devuelve None si la petición es de un administrador, o (cuerpo, código) con el error a responder
+    """
+    # Con token se usa su id pero no la bandera firmada en él: la caché respeta las
+    # invalidaciones, así que un administrador degradado pierde el acceso al momento
+    user_id = request.user.id if request.user.is_authenticated else get_request_user_id(request)
+    if not user_id:
+        return {"error": "Se requiere user_id"}, status.HTTP_400_BAD_REQUEST
+    try:
+        is_admin = admin_flags.is_admin(user_id)
+    except (TypeError, ValueError) as e:
+        return {"error": str(e)}, status.HTTP_400_BAD_REQUEST
+    return _admin_error(is_admin)
+
+
+async def aadmin_error(request):
+    """
+    Versión asíncrona de admin_error para las vistas ASGI
+    """
+    user_id = request.user.id if request.user.is_authenticated else get_request_user_id(request)
+    if not user_id:
+        return {"error": "Se requiere user_id"}, status.HTTP_400_BAD_REQUEST
+    try:
+        is_admin = await admin_flags.ais_admin(user_id)
+    except (TypeError, ValueError) as e:
+        return {"error": str(e)}, status.HTTP_400_BAD_REQUEST
+    return _admin_error(is_admin)
+
+
+def admin_required(view_method):
+    """
+    Decorador para métodos de APIView que exige un user_id de administrador.
+    Con un token de acceso válido se toma el usuario del token y su bandera de la caché de AdminFlagCache;
+    si no, mantiene las respuestas originales: 400 sin user_id, 404 si no existe y 403 si no es administrador.
+    """
+    @wraps(view_method)
+    def wrapper(self, request, *args, **kwargs):
+        error = admin_error(request)
+        if error is not None:
+            body, code = error
+            return Response(body, status=code)
+        return view_method(self, request, *args, **kwargs)
+    return wrapper
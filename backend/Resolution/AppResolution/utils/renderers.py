@@ -0,0 +1,60 @@
+import codecs
+
+from django.conf import settings
+from rest_framework import renderers, parsers
+from rest_framework.exceptions import ParseError
+from rest_framework.utils.encoders import JSONEncoder
+
+from AppResolution.config import JSON_BACKEND
+
+try:
+    import orjson
+except ImportError:  # orjson es opcional; sin él se usa el JSON de DRF
+    orjson = None
+
+USE_ORJSON = orjson is not None and JSON_BACKEND != 'stdlib'
+
+# Las fechas, decimales y textos perezosos pasan por el codificador de DRF para que
+# la salida sea idéntica a la de JSONRenderer (por ejemplo created_at con milisegundos y 'Z')
+_drf_default = JSONEncoder().default
+
+ORJSON_OPTIONS = (
+    (orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS) if orjson is not None else 0
+)
+
+
+class FastJSONRenderer(renderers.JSONRenderer):
+    """
+    JSONRenderer que codifica con orjson cuando está disponible.
+    Las respuestas con sangría (API navegable o `indent` en Accept) siguen usando el módulo json.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if not USE_ORJSON or data is None:
+            return super().render(data, accepted_media_type, renderer_context)
+        if self.get_indent(accepted_media_type, renderer_context or {}):
+            return super().render(data, accepted_media_type, renderer_context)
+        try:
+            ret = orjson.dumps(data, default=_drf_default, option=ORJSON_OPTIONS)
+        except orjson.JSONEncodeError:
+            # Valores que orjson no admite (por ejemplo enteros de más de 64 bits)
+            return super().render(data, accepted_media_type, renderer_context)
+        # Igual que JSONRenderer: U+2028 y U+2029 escapados para que la salida sea JavaScript válido
+        return ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+
+
+class FastJSONParser(parsers.JSONParser):
+    """
+    JSONParser que decodifica con orjson los cuerpos en UTF-8
+    """
+    renderer_class = FastJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get('encoding', settings.DEFAULT_CHARSET)
+        if not USE_ORJSON or codecs.lookup(encoding).name != 'utf-8':
+            return super().parse(stream, media_type, parser_context)
+        try:
+            return orjson.loads(stream.read())
+        except orjson.JSONDecodeError as exc:
+            raise ParseError('JSON parse error - %s' % str(exc))
@@ -0,0 +1,204 @@
+import hashlib
+import uuid
+from datetime import datetime, timedelta
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Sum
+from django.utils import timezone
+
+from AppResolution.config import DEFAULT_REPORT_DAYS, MAX_REPORT_DAYS, REPORT_CACHE_TTL_SECONDS
+from AppResolution.models import DailyStatusRollup
+from AppResolution.utils.rollup import NULL_STATUS
+
+# Claves del reporte, que coinciden con los estados normalizados del resumen diario
+REPORT_STATUSES = ('pendiente', 'en_proceso', 'completado')
+
+# Nombre de cada tipo de DailyStatusRollup en la respuesta
+REPORT_KINDS = {'claim': 'claims', 'request': 'requests'}
+
+
+class InvalidReportWindow(ValueError):
+    """
+    Los parámetros days, start o end del reporte no son válidos
+    """
+
+
+def parse_report_window(params):
+    """
+    Obtiene (start_date, end_date) a partir de los parámetros days, start y end.
+    Por defecto son los últimos DEFAULT_REPORT_DAYS días incluyendo hoy.
+    """
+    try:
+        end_date = datetime.strptime(params['end'], '%Y-%m-%d').date() if params.get('end') else timezone.localdate()
+        if params.get('start'):
+            start_date = datetime.strptime(params['start'], '%Y-%m-%d').date()
+        else:
+            days = int(params.get('days') or DEFAULT_REPORT_DAYS)
+            if days < 1:
+                raise InvalidReportWindow('days debe ser mayor que cero')
+            start_date = end_date - timedelta(days=days - 1)
+    except InvalidReportWindow:
+        raise
+    except (TypeError, ValueError, OverflowError):
+        raise InvalidReportWindow('Parámetros de fecha inválidos. Use days=N, start=AAAA-MM-DD y end=AAAA-MM-DD')
+
+    if start_date > end_date:
+        raise InvalidReportWindow('start no puede ser posterior a end')
+    if (end_date - start_date).days + 1 > MAX_REPORT_DAYS:
+        raise InvalidReportWindow(f'El rango máximo es de {MAX_REPORT_DAYS} días')
+    return start_date, end_date
+
+
+def empty_counts():
+    return {**{key: 0 for key in REPORT_STATUSES}, 'total': 0}
+
+
+def report_querysets(start_date, end_date):
+    """
+    Las dos consultas del reporte: totales por estado y filas diarias de la ventana
+    """
+    totals = DailyStatusRollup.objects.values('kind', 'normalized_status').annotate(n=Sum('count'))
+    daily_rows = DailyStatusRollup.objects.filter(date__gte=start_date, date__lte=end_date).values_list(
+        'kind', 'date', 'normalized_status', 'count'
+    )
+    return totals, daily_rows
+
+
+def build_report(start_date, end_date):
+    """
+    Calcula las estadísticas y los datos de las gráficas desde DailyStatusRollup en dos consultas:
+    una con los totales por estado y otra con las filas de la ventana, de modo que el costo
+    depende del número de días y no del número de reclamos y solicitudes.
+    """
+    totals, daily_rows = report_querysets(start_date, end_date)
+    return assemble_report(list(totals), list(daily_rows), start_date, end_date)
+
+
+async def abuild_report(start_date, end_date):
+    totals, daily_rows = report_querysets(start_date, end_date)
+    return assemble_report(
+        [row async for row in totals], [row async for row in daily_rows], start_date, end_date
+    )
+
+
+def assemble_report(totals, daily_rows, start_date, end_date):
+    """
+    Arma la respuesta del reporte a partir de las filas ya leídas
+    """
+    stats = {kind: {'total': 0, **{key: 0 for key in REPORT_STATUSES}} for kind in REPORT_KINDS.values()}
+    for row in totals:
+        kind_stats = stats[REPORT_KINDS[row['kind']]]
+        kind_stats['total'] += row['n']
+        if row['normalized_status'] in REPORT_STATUSES:
+            kind_stats[row['normalized_status']] += row['n']
+
+    # Completar en Python los días sin datos sobre el resultado ya agregado
+    charts = {kind: {} for kind in REPORT_KINDS.values()}
+    for kind, day, normalized_status, count in daily_rows:
+        counts = charts[REPORT_KINDS[kind]].setdefault(day, empty_counts())
+        counts['total'] += count
+        # Los registros sin estado se muestran como pendientes en las gráficas
+        if normalized_status == NULL_STATUS:
+            normalized_status = 'pendiente'
+        if normalized_status in REPORT_STATUSES:
+            counts[normalized_status] += count
+
+    date_range = [start_date + timedelta(days=offset) for offset in range((end_date - start_date).days + 1)]
+
+    def chart_array(kind):
+        return [
+            {'date': day.strftime('%Y-%m-%d'), **charts[kind].get(day, empty_counts())}
+            for day in date_range
+        ]
+
+    return {
+        "claims_stats": stats['claims'],
+        "requests_stats": stats['requests'],
+        "claims_chart_data": chart_array('claims'),
+        "requests_chart_data": chart_array('requests'),
+        "date_range": {
+            "start_date": start_date.strftime('%Y-%m-%d'),
+            "end_date": end_date.strftime('%Y-%m-%d')
+        }
+    }
+
+
+# Versión de los datos del reporte: cambia con cada modificación del resumen diario
+REPORT_STATE_KEY = 'reports:state'
+
+
+def _new_report_state():
+    return {'version': uuid.uuid4().hex, 'last_modified': int(timezone.now().timestamp())}
+
+
+def get_report_state():
+    state = cache.get(REPORT_STATE_KEY)
+    if state is None:
+        state = _new_report_state()
+        # add() evita pisar una versión publicada al mismo tiempo por otra petición
+        if not cache.add(REPORT_STATE_KEY, state, None):
+            state = cache.get(REPORT_STATE_KEY) or state
+    return state
+
+
+async def aget_report_state():
+    """
+    Versión asíncrona de get_report_state para las vistas ASGI
+    """
+    state = await cache.aget(REPORT_STATE_KEY)
+    if state is None:
+        state = _new_report_state()
+        if not await cache.aadd(REPORT_STATE_KEY, state, None):
+            state = await cache.aget(REPORT_STATE_KEY) or state
+    return state
+
+
+def _bump_report_state():
+    cache.set(REPORT_STATE_KEY, _new_report_state(), None)
+
+
+def invalidate_reports():
+    """
+    Descarta todos los reportes en caché. Se invalida de inmediato y otra vez al confirmar la
+    transacción, para no conservar un reporte calculado antes de que los cambios fueran visibles.
+    """
+    _bump_report_state()
+    if transaction.get_connection().in_atomic_block:
+        transaction.on_commit(_bump_report_state)
+
+
+def report_cache_entry(state, start_date, end_date):
+    """
+    Clave de caché y ETag del reporte de una ventana para una versión de los datos
+    """
+    window = f'{start_date.isoformat()}:{end_date.isoformat()}'
+    etag = '"%s"' % hashlib.sha1(f'{state["version"]}:{window}'.encode()).hexdigest()
+    return f'reports:{state["version"]}:{window}', etag
+
+
+def get_cached_report(start_date, end_date):
+    """
+    Devuelve (reporte, etag, last_modified) para la ventana pedida, calculándolo solo si
+    no está en caché para la versión actual de los datos. last_modified es un timestamp Unix.
+    """
+    state = get_report_state()
+    key, etag = report_cache_entry(state, start_date, end_date)
+    report = cache.get(key)
+    if report is None:
+        report = build_report(start_date, end_date)
+        cache.set(key, report, REPORT_CACHE_TTL_SECONDS)
+    return report, etag, state['last_modified']
+
+
+async def aget_cached_report(start_date, end_date):
+    """
+    Versión asíncrona de get_cached_report para las vistas ASGI
+    """
+    state = await aget_report_state()
+    key, etag = report_cache_entry(state, start_date, end_date)
+    report = await cache.aget(key)
+    if report is None:
+        report = await abuild_report(start_date, end_date)
+        await cache.aset(key, report, REPORT_CACHE_TTL_SECONDS)
+    return report, etag, state['last_modified']
@@ -0,0 +1,120 @@
+from collections import Counter
+
+from django.db import IntegrityError, connections, router, transaction
+from django.db.models import Count, F
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from AppResolution.utils.status import STATUS_KEYS, status_code_for
+
+# Estado normalizado de los registros sin estado
+NULL_STATUS = 'sin_estado'
+
+
+def normalize_status(value):
+    """
+    Convierte el estado libre de un reclamo o solicitud en la clave normalizada del resumen
+    """
+    code = status_code_for(value)
+    return NULL_STATUS if code is None else STATUS_KEYS[code]
+
+
+def rollup_date(created_at):
+    return timezone.localtime(created_at).date() if timezone.is_aware(created_at) else created_at.date()
+
+
+def apply_rollup_deltas(deltas):
+    """
+    Suma los incrementos {(kind, fecha, estado): n} a la tabla de resumen diario.
+    En Postgres y SQLite se aplica con un único INSERT ... ON CONFLICT DO UPDATE.
+    """
+    from AppResolution.models import DailyStatusRollup
+
+    from AppResolution.utils.reports import invalidate_reports
+
+    deltas = {key: delta for key, delta in deltas.items() if delta}
+    if not deltas:
+        return
+    invalidate_reports()
+
+    connection = connections[router.db_for_write(DailyStatusRollup)]
+    if connection.vendor in ('postgresql', 'sqlite'):
+        quote = connection.ops.quote_name
+        table = quote(DailyStatusRollup._meta.db_table)
+        placeholders = ', '.join(['(%s, %s, %s, %s)'] * len(deltas))
+        params = []
+        for (kind, date, normalized_status), delta in deltas.items():
+            params.extend([kind, date, normalized_status, delta])
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'INSERT INTO {table} ({quote("kind")}, {quote("date")}, {quote("normalized_status")}, {quote("count")}) '
+                f'VALUES {placeholders} '
+                f'ON CONFLICT ({quote("kind")}, {quote("date")}, {quote("normalized_status")}) '
+                f'DO UPDATE SET {quote("count")} = {table}.{quote("count")} + EXCLUDED.{quote("count")}',
+                params,
+            )
+        return
+
+    with transaction.atomic(using=connection.alias):
+        for (kind, date, normalized_status), delta in deltas.items():
+            lookup = {'kind': kind, 'date': date, 'normalized_status': normalized_status}
+            updated = DailyStatusRollup.objects.filter(**lookup).update(count=F('count') + delta)
+            if updated:
+                continue
+            try:
+                with transaction.atomic(using=connection.alias):
+                    DailyStatusRollup.objects.create(count=delta, **lookup)
+            except IntegrityError:
+                # Otra petición creó la fila al mismo tiempo
+                DailyStatusRollup.objects.filter(**lookup).update(count=F('count') + delta)
+
+
+def record_created(kind, created_at, status):
+    apply_rollup_deltas({(kind, rollup_date(created_at), normalize_status(status)): 1})
+
+
+def record_deleted(kind, created_at, status):
+    apply_rollup_deltas({(kind, rollup_date(created_at), normalize_status(status)): -1})
+
+
+def record_status_change(kind, created_at, old_status, new_status):
+    old_code, new_code = normalize_status(old_status), normalize_status(new_status)
+    if old_code == new_code:
+        return
+    date = rollup_date(created_at)
+    apply_rollup_deltas({(kind, date, old_code): -1, (kind, date, new_code): 1})
+
+
+def aggregate_rollup_rows(sources):
+    """
+    Calcula los conteos por (kind, fecha, estado) directamente desde las tablas de origen.
+    `sources` es una lista de pares (kind, modelo).
+    """
+    counts = Counter()
+    for kind, model in sources:
+        rows = model.objects.annotate(day=TruncDate('created_at')).values('day', 'status').annotate(n=Count('id'))
+        for row in rows:
+            counts[(kind, row['day'], normalize_status(row['status']))] += row['n']
+    return counts
+
+
+def rebuild_rollup():
+    """
+    Reconstruye DailyStatusRollup desde cero a partir de Claim y Request
+    """
+    from AppResolution.models import Claim, Request, DailyStatusRollup
+    from AppResolution.utils.reports import invalidate_reports
+
+    counts = aggregate_rollup_rows([('claim', Claim), ('request', Request)])
+    with transaction.atomic():
+        DailyStatusRollup.objects.all().delete()
+        DailyStatusRollup.objects.bulk_create(
+            [
+                DailyStatusRollup(kind=kind, date=date, normalized_status=normalized_status, count=count)
+                for (kind, date, normalized_status), count in counts.items()
+                if count
+            ],
+            batch_size=1000,
+        )
+    invalidate_reports()
+    return len(counts)
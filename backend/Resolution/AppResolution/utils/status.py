@@ -0,0 +1,35 @@
+from django.db import models
+
+
+class Status(models.IntegerChoices):
+    PENDIENTE = 1, 'Pendiente'
+    EN_PROCESO = 2, 'En Proceso'
+    COMPLETADO = 3, 'Completado'
+    OTRO = 9, 'Otro'
+
+
+# Texto normalizado -> código de estado
+STATUS_ALIASES = {
+    'pendiente': Status.PENDIENTE,
+    'en proceso': Status.EN_PROCESO,
+    'completado': Status.COMPLETADO,
+}
+
+# Código de estado -> clave usada en reportes y en el resumen diario
+STATUS_KEYS = {
+    Status.PENDIENTE: 'pendiente',
+    Status.EN_PROCESO: 'en_proceso',
+    Status.COMPLETADO: 'completado',
+    Status.OTRO: 'otro',
+}
+
+
+def status_code_for(value):
+    """
+    Convierte el estado libre ('Pendiente', 'en proceso', 'EN_PROCESO', ...) en su código.
+    Un estado vacío no tiene código.
+    """
+    if value is None:
+        return None
+    normalized = ' '.join(str(value).replace('_', ' ').split()).lower()
+    return STATUS_ALIASES.get(normalized, Status.OTRO)
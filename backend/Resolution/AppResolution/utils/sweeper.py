@@ -0,0 +1,22 @@
+from django.utils import timezone
+
+from AppResolution.models import Authentication
+
+
+def purge_expired_auth_codes(batch_size=1000, now=None):
+    """
+    Elimina por lotes los códigos de verificación vencidos y devuelve cuántos se borraron.
+    La verificación ya rechaza los códigos vencidos, así que esto solo libera espacio.
+    """
+    now = now or timezone.now()
+    deleted = 0
+    while True:
+        ids = list(
+            Authentication.objects.filter(expires_at__lte=now).values_list('id', flat=True)[:batch_size]
+        )
+        if not ids:
+            return deleted
+        count, _ = Authentication.objects.filter(id__in=ids).delete()
+        deleted += count
+        if len(ids) < batch_size:
+            return deleted
@@ -0,0 +1,83 @@
+from django.core import signing
+from rest_framework.authentication import BaseAuthentication, get_authorization_header
+
+from AppResolution.config import ACCESS_TOKEN_TTL_SECONDS, REFRESH_TOKEN_TTL_SECONDS
+
+# Cada tipo de token se firma con su propia sal para que un refresh no sirva como acceso y viceversa
+TOKEN_SALTS = {
+    'access': 'AppResolution.tokens.access',
+    'refresh': 'AppResolution.tokens.refresh',
+}
+TOKEN_TTLS = {
+    'access': ACCESS_TOKEN_TTL_SECONDS,
+    'refresh': REFRESH_TOKEN_TTL_SECONDS,
+}
+
+
+class InvalidToken(ValueError):
+    pass
+
+
+class TokenUser:
+    """
+    Usuario reconstruido a partir de los datos firmados del token, sin consultar la base de datos
+    """
+    is_authenticated = True
+    is_anonymous = False
+
+    def __init__(self, payload):
+        self.id = self.pk = payload['uid']
+        self.is_admin = bool(payload.get('adm'))
+
+    def __repr__(self):
+        return f'TokenUser(id={self.id}, is_admin={self.is_admin})'
+
+
+def issue_token(user, kind='access'):
+    """
+    Firma con SECRET_KEY (HMAC) el id y la bandera is_admin del usuario
+    """
+    return signing.dumps({'uid': user.id, 'adm': bool(user.is_admin)}, salt=TOKEN_SALTS[kind], compress=True)
+
+
+def read_token(token, kind='access'):
+    """
+    Verifica la firma y el vencimiento del token y devuelve sus datos
+    """
+    try:
+        return signing.loads(token, salt=TOKEN_SALTS[kind], max_age=TOKEN_TTLS[kind])
+    except signing.SignatureExpired:
+        raise InvalidToken('El token ha expirado')
+    except signing.BadSignature:
+        raise InvalidToken('Token inválido')
+
+
+def issue_token_pair(user):
+    return {
+        'token': issue_token(user, 'access'),
+        'refresh_token': issue_token(user, 'refresh'),
+        'expires_in': ACCESS_TOKEN_TTL_SECONDS,
+    }
+
+
+class SignedTokenAuthentication(BaseAuthentication):
+    """
+    Autenticación DRF por cabecera "Authorization: Bearer <token>" sin acceso a la base de datos.
+    Un token ausente, inválido o expirado deja la petición como anónima para que los clientes
+    que todavía envían user_id sigan funcionando igual que antes.
+    """
+    keyword = b'bearer'
+
+    def authenticate(self, request):
+        parts = get_authorization_header(request).split()
+        if len(parts) != 2 or parts[0].lower() != self.keyword:
+            return None
+        try:
+            token = parts[1].decode()
+            payload = read_token(token)
+        except (UnicodeDecodeError, InvalidToken):
+            return None
+        return TokenUser(payload), token
+
+    def authenticate_header(self, request):
+        return 'Bearer'
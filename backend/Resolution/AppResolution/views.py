@@ -1,18 +1,81 @@
 import json
+import logging
 from django.shortcuts import render, get_object_or_404
 from rest_framework.decorators import APIView
 from rest_framework.response import Response
 from rest_framework import status, permissions
 from rest_framework.permissions import AllowAny
 from AppResolution.models import User, Authentication, Claim, Request, Profile
-from AppResolution.serializers import user_serializer, authentication_serializer, claim_serializer, request_serializer, profile_serializer
-from AppResolution.utils.send import send_auth_email
-from AppResolution.utils.authToken import generate_auth_code, verify_auth_code, get_latest_auth_code
+from AppResolution.serializers import user_serializer, authentication_serializer, claim_serializer, request_serializer, profile_serializer, claim_bulk_serializer, request_bulk_serializer, claim_read_serializer, request_read_serializer, user_read_serializer, profile_read_serializer, InvalidFields
+from AppResolution.utils.outbox import enqueue_auth_email
+from AppResolution.utils.authToken import generate_auth_code, verify_auth_code, store_auth_code
+from AppResolution.utils.pagination import paginate_queryset, page_total, is_paginated, InvalidCursor
+from AppResolution.utils.filters import filter_items, InvalidFilter
+from AppResolution.utils.reports import get_cached_report, parse_report_window, InvalidReportWindow
+from AppResolution.utils.rollup import apply_rollup_deltas, normalize_status, rollup_date
+from AppResolution.utils.status import status_code_for
+from AppResolution.utils.permissions import admin_required, admin_flags
+from AppResolution.utils.tokens import issue_token_pair, read_token, InvalidToken
+from AppResolution.utils.export import EXPORT_FORMATS, InvalidExport, export_stream, parse_export_params
+from django.http import StreamingHttpResponse
+from AppResolution.config import AUTH_CODE_TTL_MINUTES, AUTH_CODE_RESEND_WINDOW_SECONDS, BULK_CREATE_CHUNK_SIZE, BULK_MAX_ITEMS
+from django.db import transaction
+from rest_framework.exceptions import ValidationError
+from collections import Counter
 from django.utils import timezone
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
 from datetime import timedelta
-import threading
-import time
-from django.contrib.auth.hashers import check_password, make_password
+from AppResolution.utils.passwords import check_user_password, hash_password
+
+logger = logging.getLogger(__name__)
+
+def list_projection(request, queryset, serializer_class, keys):
+    """
+    Aplica fields=a,b,c al queryset: solo se consultan esos campos más las claves del cursor.
+    Devuelve (queryset, campos, claves_del_cursor_a_descartar).
+    """
+    fields = serializer_class.parse_fields(request.query_params.get('fields'))
+    cursor_keys = [key for key in keys if key not in fields] if is_paginated(request) else []
+    return serializer_class.project(queryset, fields + tuple(cursor_keys)), fields, cursor_keys
+
+
+def list_payload(serializer_class, rows, next_cursor, paginated, fields, cursor_keys):
+    """
+    Cuerpo de la respuesta de un listado a partir de las filas de la página
+    """
+    if cursor_keys:
+        for row in rows:
+            for key in cursor_keys:
+                del row[key]
+    data = serializer_class.serialize(rows, fields)
+    if paginated:
+        return {"results": data, "next_cursor": next_cursor}
+    return data
+
+
+def paginated_response(request, queryset, serializer_class, keys=('created_at', 'id'), descending=True):
+    """
+    Serializa un listado paginado por cursor, o como lista simple para los clientes sin cursor.
+    `serializer_class` es un read_serializer: las filas se leen con .values() y no como instancias.
+    Con fields=a,b,c solo se consultan y devuelven esos campos (más las claves del cursor, que se descartan).
+    """
+    try:
+        queryset, fields, cursor_keys = list_projection(request, queryset, serializer_class, keys)
+        page = paginate_queryset(request, queryset, keys, descending=descending)
+    except (InvalidCursor, InvalidFields) as e:
+        return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    return Response(list_payload(serializer_class, *page, fields, cursor_keys))
+
+def filtered_response(request, queryset, serializer_class):
+    """
+    Listado de reclamos o solicitudes con los filtros status, created_from, created_to, search y ordering
+    """
+    try:
+        queryset, keys, descending = filter_items(queryset, request.query_params, cursor=is_paginated(request))
+    except InvalidFilter as e:
+        return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    return paginated_response(request, queryset, serializer_class, keys, descending)
 
 #creates
 #usuario
@@ -63,9 +126,7 @@ class UserView(APIView):
                 return Response({"error": "Usuario no encontrado"}, status=status.HTTP_404_NOT_FOUND)
         
         # Si no hay ID, devolver todos los usuarios
-        users = User.objects.all()
-        serializer = user_serializer(users, many=True)
-        return Response(serializer.data)
+        return paginated_response(request, User.objects.all(), user_read_serializer, keys=('id',))
     
     def put(self, request):
         data = {
@@ -113,40 +174,42 @@ class UserView(APIView):
         
         # Si se están actualizando otros campos del perfil
         try:
-            # Actualizar campos del usuario si están presentes
-            if 'first_name' in request_data:
-                user.first_name = request_data.get('first_name')
-            if 'last_name' in request_data:
-                user.last_name = request_data.get('last_name')
-            if 'email' in request_data:
-                user.email = request_data.get('email')
-            if 'phone' in request_data:
-                user.phone = request_data.get('phone')
-            if 'password' in request_data:
-                # Hashear la contraseña antes de guardarla
-                user.password = make_password(request_data.get('password'))
-            if 'is_admin' in request_data:
-                user.is_admin = request_data.get('is_admin')
-            user.save()
-            
-            # También actualizar el perfil asociado si existe
-            if hasattr(user, 'profile') and user.profile:
-                profile = user.profile
+            # Usuario y perfil en una sola transacción; cada save() escribe solo las columnas que cambian
+            with transaction.atomic():
+                # Actualizar campos del usuario si están presentes
                 if 'first_name' in request_data:
-                    profile.first_name = request_data.get('first_name')
+                    user.first_name = request_data.get('first_name')
                 if 'last_name' in request_data:
-                    profile.last_name = request_data.get('last_name')
+                    user.last_name = request_data.get('last_name')
                 if 'email' in request_data:
-                    profile.email = request_data.get('email')
+                    user.email = request_data.get('email')
                 if 'phone' in request_data:
-                    profile.phone = request_data.get('phone')
-                if 'password' in request_data:
-                    # Hashear la contraseña antes de guardarla en el perfil
-                    profile.password = make_password(request_data.get('password'))
+                    user.phone = request_data.get('phone')
+                # Hashear la contraseña una sola vez para el usuario y su perfil
+                password_hash = hash_password(request_data.get('password')) if 'password' in request_data else None
+                if password_hash is not None:
+                    user.password = password_hash
                 if 'is_admin' in request_data:
-                    profile.is_admin = request_data.get('is_admin')
-                
-                profile.save()
+                    user.is_admin = request_data.get('is_admin')
+                user.save()
+
+                # También actualizar el perfil asociado si existe
+                if hasattr(user, 'profile') and user.profile:
+                    profile = user.profile
+                    if 'first_name' in request_data:
+                        profile.first_name = request_data.get('first_name')
+                    if 'last_name' in request_data:
+                        profile.last_name = request_data.get('last_name')
+                    if 'email' in request_data:
+                        profile.email = request_data.get('email')
+                    if 'phone' in request_data:
+                        profile.phone = request_data.get('phone')
+                    if password_hash is not None:
+                        profile.password = password_hash
+                    if 'is_admin' in request_data:
+                        profile.is_admin = request_data.get('is_admin')
+
+                    profile.save()
             
             # Devolver los datos actualizados del usuario
             user_data = {
@@ -187,53 +250,53 @@ class AuthenticationView(APIView):
         user_id = pkid or request.query_params.get('user_id')
         if user_id:
             try:
-                user = User.objects.get(id=user_id)
-                
-                # Primero, buscar y eliminar cualquier registro de autenticación existente para este usuario
-                try:
-                    existing_auth = Authentication.objects.get(user_id=user_id)
-                    existing_auth_id = existing_auth.id  # Guardar el ID para mensaje de depuración
-                    existing_auth.delete()
-                    print(f"Código anterior eliminado para el usuario {user_id} (ID de autenticación: {existing_auth_id})")
-                except Authentication.DoesNotExist:
-                    print(f"No había código anterior para el usuario {user_id}")
-                
-                # Generar un nuevo código de autenticación
-                verification_code = generate_auth_code()
-                print(f"Nuevo código generado: {verification_code}")
-                print(f"Código en variable global: {get_latest_auth_code()}")
-                
-                # Crear un nuevo registro de autenticación
-                auth_record = Authentication.objects.create(
-                    user_id=user_id,
-                    token=get_latest_auth_code()
-                )
-                
-                # Programar la eliminación del token después de 10 minutos
-                delete_auth_token_after_timeout(auth_record.id, timeout_minutes=10)
-                print(f"Programada eliminación del nuevo token (ID: {auth_record.id}) en 10 minutos")
+                now = timezone.now()
+                with transaction.atomic():
+                    # Bloquear al usuario serializa los reenvíos simultáneos: solo uno genera un código nuevo
+                    user = User.objects.select_for_update().get(id=user_id)
+                    auth_record = Authentication.objects.filter(user_id=user_id).first()
+                    
+                    # Doble clic o reintento dentro de la ventana: se reutiliza el código vigente
+                    if auth_record is not None and auth_record.in_resend_window(now):
+                        serializer = authentication_serializer(auth_record)
+                        return Response({
+                            "message": f"Ya se envió un código hace menos de {AUTH_CODE_RESEND_WINDOW_SECONDS} segundos. Se reutiliza el código vigente.",
+                            "data": serializer.data,
+                            "auth_code": auth_record.token,
+                            "expires_in": f"{AUTH_CODE_TTL_MINUTES} minutos",
+                            "resent": False
+                        }, status=status.HTTP_200_OK)
+                    
+                    # Generar un nuevo código de autenticación
+                    verification_code = generate_auth_code()
+                    # El código no se registra: solo viaja por correo
+                    logger.info("Nuevo código de verificación generado para el usuario %s", user.pk)
+                    expires_at = now + timedelta(minutes=AUTH_CODE_TTL_MINUTES)
+                    
+                    # Reemplazar el código anterior en su misma fila, o crearla si el usuario no tenía
+                    auth_record = store_auth_code(user.pk, verification_code, expires_at)
                 
-                # Enviar el código por correo electrónico
+                # Encolar el correo; el worker drain_email_outbox se encarga del envío
                 try:
-                    send_auth_email(get_latest_auth_code(), user.email)
-                    print(f"Correo enviado con éxito con código: {get_latest_auth_code()}")
-                except Exception as e:
-                    print(f"Error al enviar correo: {str(e)}")
-                    # Continuamos incluso si falla el envío de correo
+                    enqueue_auth_email(verification_code, user.email)
+                except Exception:
+                    logger.exception("Error al encolar el correo de verificación del usuario %s", user.pk)
+                    # Continuamos incluso si falla el encolado del correo
                 
                 # Devolver el nuevo registro
                 serializer = authentication_serializer(auth_record)
                 return Response({
-                    "message": "Código anterior eliminado. Nuevo código generado y enviado. Expirará en 10 minutos.",
+                    "message": f"Código anterior reemplazado. Nuevo código generado y enviado. Expirará en {AUTH_CODE_TTL_MINUTES} minutos.",
                     "data": serializer.data,
-                    "auth_code": get_latest_auth_code(),
-                    "expires_in": "10 minutos"
+                    "auth_code": verification_code,
+                    "expires_in": f"{AUTH_CODE_TTL_MINUTES} minutos",
+                    "resent": True
                 }, status=status.HTTP_200_OK)
                 
             except User.DoesNotExist:
                 return Response({"error": "Usuario no encontrado"}, status=status.HTTP_404_NOT_FOUND)
             except Exception as e:
-                print(f"Error general: {str(e)}")
+                logger.exception("Error en AuthenticationView.get")
                 return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
         
         # Si no hay ID de usuario, devolver todos los registros
@@ -247,24 +310,26 @@ class AuthenticationView(APIView):
         if not user_id or not input_code:
             return Response({'error': 'Faltan datos'}, status=400)
         try:
-            auth_record = Authentication.objects.filter(user_id=user_id).order_by('-id').first()
+            auth_record = Authentication.objects.filter(user_id=user_id).first()
             if not auth_record:
                 return Response({'error': 'No se encontró código para este usuario'}, status=404)
-            if str(auth_record.token) == str(input_code):
-                user = User.objects.get(id=user_id)
-                user.verified = 1
-                user.save()
-                # Crear perfil si no existe y asignar al usuario
-                if not user.profile:
-                    perfil = Profile.objects.create(
-                        first_name=user.first_name,
-                        last_name=user.last_name,
-                        email=user.email,
-                        phone=user.phone or '',
-                        password='',
-                        photo=''
-                    )
-                    user.profile = perfil
+            if auth_record.is_expired():
+                return Response({'success': False, 'error': 'El código ha expirado'}, status=400)
+            if verify_auth_code(auth_record.token, input_code):
+                # Verificar y crear el perfil en una sola transacción, con un único UPDATE del usuario
+                with transaction.atomic():
+                    user = User.objects.select_for_update().get(id=user_id)
+                    user.verified = 1
+                    # Crear perfil si no existe y asignar al usuario
+                    if not user.profile_id:
+                        user.profile = Profile.objects.create(
+                            first_name=user.first_name,
+                            last_name=user.last_name,
+                            email=user.email,
+                            phone=user.phone or '',
+                            password='',
+                            photo=''
+                        )
                     user.save()
                 return Response({'success': True})
             else:
@@ -281,10 +346,12 @@ class AuthenticationView(APIView):
         if not user_id or not input_code:
             return Response({'error': 'Faltan datos'}, status=400)
         try:
-            auth_record = Authentication.objects.filter(user_id=user_id).order_by('-id').first()
+            auth_record = Authentication.objects.filter(user_id=user_id).first()
             if not auth_record:
                 return Response({'error': 'No se encontró código para este usuario'}, status=404)
-            if str(auth_record.token) == str(input_code):
+            if auth_record.is_expired():
+                return Response({'success': False, 'error': 'El código ha expirado'}, status=400)
+            if verify_auth_code(auth_record.token, input_code):
                 return Response({'success': True, 'message': 'Token válido'})
             else:
                 return Response({'success': False, 'error': 'Código incorrecto'}, status=400)
@@ -327,15 +394,12 @@ class ClaimView(APIView):
         if filter_user_id:
             try:
                 claims = Claim.objects.filter(user_id=filter_user_id)
-                serializer = claim_serializer(claims, many=True)
-                return Response(serializer.data)
+                return filtered_response(request, claims, claim_read_serializer)
             except Exception as e:
                 return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
         
         # Si no hay filtros, devolver todos los reclamos
-        claims = Claim.objects.all()
-        serializer = claim_serializer(claims, many=True)
-        return Response(serializer.data)
+        return filtered_response(request, Claim.objects.all(), claim_read_serializer)
         
     def put(self, request, pk=None):
         request_data = request.data[0] if isinstance(request.data, list) else request.data
@@ -410,15 +474,12 @@ class RequestView(APIView):
         if filter_user_id:
             try:
                 requests = Request.objects.filter(user_id=filter_user_id)
-                serializer = request_serializer(requests, many=True)
-                return Response(serializer.data)
+                return filtered_response(request, requests, request_read_serializer)
             except Exception as e:
                 return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
         
         # Si no hay filtros, devolver todas las solicitudes
-        requests = Request.objects.all()
-        serializer = request_serializer(requests, many=True)
-        return Response(serializer.data)
+        return filtered_response(request, Request.objects.all(), request_read_serializer)
         
     def put(self, request, pk=None):
         request_data = request.data[0] if isinstance(request.data, list) else request.data
@@ -458,6 +519,71 @@ class RequestView(APIView):
         except Exception as e:
             return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
+def bulk_create_items(request, model, serializer_class, kind):
+    """
+    Valida una lista de reclamos o solicitudes y guarda los válidos con bulk_create por lotes
+    dentro de una transacción. Los elementos inválidos se reportan sin abortar el lote.
+    """
+    items = request.data if isinstance(request.data, list) else None
+    if not items:
+        return Response({"error": "Se requiere una lista de elementos"}, status=status.HTTP_400_BAD_REQUEST)
+    if len(items) > BULK_MAX_ITEMS:
+        return Response({"error": f"Se permiten como máximo {BULK_MAX_ITEMS} elementos por petición"}, status=status.HTTP_400_BAD_REQUEST)
+    try:
+        chunk_size = max(1, int(request.query_params.get('chunk_size', BULK_CREATE_CHUNK_SIZE)))
+    except ValueError:
+        return Response({"error": "chunk_size debe ser un número entero"}, status=status.HTTP_400_BAD_REQUEST)
+
+    # Una sola consulta para todos los usuarios referenciados en el lote
+    # Solo ids escalares; listas u objetos no se pueden agrupar y el serializador los reporta como error del elemento
+    user_ids = {item.get('user') for item in items if isinstance(item, dict) and isinstance(item.get('user'), (int, str))}
+    user_ids = {int(user_id) for user_id in user_ids if str(user_id).isdigit()}
+    users = {user.id: user for user in User.objects.filter(id__in=user_ids).only('id')}
+    serializer = serializer_class(many=True, context={'users': users})
+
+    objects, errors = [], []
+    for index, item in enumerate(items):
+        if not isinstance(item, dict):
+            errors.append({"index": index, "errors": {"non_field_errors": ["Se esperaba un objeto"]}})
+            continue
+        if not item.get('user'):
+            errors.append({"index": index, "errors": {"user": ["Se requiere el ID del usuario"]}})
+            continue
+        data = {
+            'user': item.get('user'),
+            'subject': item.get('subject'),
+            'description': item.get('description'),
+            'status': item.get('status') or 'Pendiente',
+        }
+        try:
+            validated = serializer.child.run_validation(data)
+        except ValidationError as e:
+            errors.append({"index": index, "errors": e.detail})
+            continue
+        obj = model(**validated)
+        # bulk_create no llama a save() ni dispara señales
+        obj.status_code = status_code_for(obj.status)
+        objects.append(obj)
+
+    with transaction.atomic():
+        created = model.objects.bulk_create(objects, batch_size=chunk_size)
+        deltas = Counter((kind, rollup_date(obj.created_at), normalize_status(obj.status)) for obj in created)
+        apply_rollup_deltas(deltas)
+
+    return Response({
+        "created": len(created),
+        "ids": [obj.id for obj in created],
+        "errors": errors
+    }, status=status.HTTP_201_CREATED if created else status.HTTP_400_BAD_REQUEST)
+
+class ClaimBulkView(APIView):
+    def post(self, request):
+        return bulk_create_items(request, Claim, claim_bulk_serializer, 'claim')
+
+class RequestBulkView(APIView):
+    def post(self, request):
+        return bulk_create_items(request, Request, request_bulk_serializer, 'request')
+
 #profile
 class ProfileView(APIView):
     def post(self, request):
@@ -500,7 +626,7 @@ class ProfileView(APIView):
                 profile.phone = request_data.get('phone')
             if 'password' in request_data:
                 # Hashear la contraseña antes de guardarla en el perfil
-                profile.password = make_password(request_data.get('password'))
+                profile.password = hash_password(request_data.get('password'))
             if 'photo' in request_data:
                 profile.photo = request_data.get('photo')
             
@@ -538,9 +664,7 @@ class ProfileView(APIView):
                 return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
         
         # Si no hay filtros, devolver todos los perfiles
-        profiles = Profile.objects.all()
-        serializer = profile_serializer(profiles, many=True)
-        return Response(serializer.data)
+        return paginated_response(request, Profile.objects.all(), profile_read_serializer, keys=('id',))
 
 # Login de usuario
 class LoginView(APIView):
@@ -559,7 +683,7 @@ class LoginView(APIView):
             user = User.objects.get(email=email)
             
             # Verificar si la contraseña es correcta (asumiendo que está hasheada)
-            if check_password(password, user.password):
+            if check_user_password(user, password):
                 # Si el usuario está verificado
                 if user.verified == 1:
                     # Buscar el perfil del usuario
@@ -569,6 +693,9 @@ class LoginView(APIView):
                     except Profile.DoesNotExist:
                         profile_data = None
                     
+                    # Las peticiones con el token leen la bandera is_admin de la caché
+                    admin_flags.remember(user)
+                    
                     # Devolver la información del usuario y el perfil
                     return Response({
                         "message": "Inicio de sesión exitoso",
@@ -582,7 +709,7 @@ class LoginView(APIView):
                             "is_admin": user.is_admin
                         },
                         "profile": profile_data,
-                        "token": "dummy-token"
+                        **issue_token_pair(user)
                     }, status=status.HTTP_200_OK)
                 else:
                     return Response({"error": "Usuario no verificado"}, status=status.HTTP_401_UNAUTHORIZED)
@@ -593,105 +720,128 @@ class LoginView(APIView):
         except Exception as e:
             return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
-# Añadir una función para eliminar tokens después de un tiempo
-def delete_auth_token_after_timeout(auth_id, timeout_minutes=10):
-    """
-    Función para eliminar un token de autenticación después de un tiempo determinado
-    """
-    # Crear un temporizador en segundo plano
-    def delete_token():
-        time.sleep(timeout_minutes * 60)  # Convertir minutos a segundos
-        try:
-            # Intentar obtener y eliminar el token después del tiempo especificado
-            auth_record = Authentication.objects.get(id=auth_id)
-            auth_record.delete()
-            print(f"Token de autenticación con ID {auth_id} eliminado después de {timeout_minutes} minutos")
-        except Authentication.DoesNotExist:
-            print(f"El token de autenticación con ID {auth_id} ya no existe")
-        except Exception as e:
-            print(f"Error al eliminar el token: {str(e)}")
+# Renovación del token de acceso
+class TokenRefreshView(APIView):
+    permission_classes = [AllowAny]
     
-    # Iniciar el temporizador en un hilo separado
-    thread = threading.Thread(target=delete_token)
-    thread.daemon = True  # Hacer que el hilo sea un demonio para que no bloquee la salida
-    thread.start()
-    return thread
+    def post(self, request):
+        """
+        Canjea un refresh_token válido por un nuevo par de tokens con los datos actuales del usuario
+        """
+        refresh_token = request.data.get('refresh_token')
+        if not refresh_token:
+            return Response({"error": "Se requiere refresh_token"}, status=status.HTTP_400_BAD_REQUEST)
+        
+        try:
+            payload = read_token(refresh_token, 'refresh')
+        except InvalidToken as e:
+            return Response({"error": str(e)}, status=status.HTTP_401_UNAUTHORIZED)
+        
+        # Se relee el usuario para que los cambios de is_admin o de verificación se apliquen al renovar
+        user = User.objects.filter(id=payload['uid']).only('id', 'is_admin', 'verified').first()
+        if user is None:
+            return Response({"error": "Usuario no encontrado"}, status=status.HTTP_404_NOT_FOUND)
+        if user.verified != 1:
+            return Response({"error": "Usuario no verificado"}, status=status.HTTP_401_UNAUTHORIZED)
+        
+        admin_flags.remember(user)
+        return Response(issue_token_pair(user), status=status.HTTP_200_OK)
 
 # Panel de administrador
+# Datos básicos del usuario que se adjuntan a cada reclamo o solicitud
+USER_INFO_LOOKUPS = {'first_name': 'user__first_name', 'last_name': 'user__last_name', 'email': 'user__email'}
+
+def admin_projection(queryset, serializer_class, keys):
+    """
+    Lee con .values() los campos del read_serializer, las claves del orden y los datos del usuario
+    en la misma consulta. Devuelve (queryset, claves_a_descartar)
+    """
+    extra_keys = [key for key in keys if key not in serializer_class.fields]
+    return queryset.values(*serializer_class.fields, *extra_keys, *USER_INFO_LOOKUPS.values()), extra_keys
+
+def admin_payload(serializer_class, rows, extra_keys):
+    """
+    Serializa las filas del panel y agrupa los datos del usuario en user_info
+    """
+    for row in rows:
+        info = {'id': row['user']}
+        for name, lookup in USER_INFO_LOOKUPS.items():
+            info[name] = row.pop(lookup)
+        for key in extra_keys:
+            del row[key]
+        row['user_info'] = info
+    return serializer_class.serialize(rows)
+
+def admin_page(request, queryset, keys, descending, cursor_param, continuing):
+    """
+    Página de una lista del panel de administrador y su total. Al continuar con cursores, la lista
+    que no envía el suyo ya terminó: se devuelve vacía y sin siguiente cursor en lugar de repetir
+    su primera página. Devuelve (filas, siguiente_cursor, paginado, total)
+    """
+    if continuing and cursor_param not in request.query_params:
+        return [], None, True, None
+    rows, next_cursor, paginated = paginate_queryset(request, queryset, keys, cursor_param=cursor_param, descending=descending)
+    return rows, next_cursor, paginated, page_total(request, queryset, rows, paginated, cursor_param)
+
 class AdminView(APIView):
     permission_classes = [AllowAny]
     
+    @admin_required
     def get(self, request):
         """
         Obtener todas las solicitudes y reclamos para el panel de administrador
         """
         try:
-            # Verificar si el usuario es administrador
-            user_id = request.query_params.get('user_id')
-            if not user_id:
-                return Response({"error": "Se requiere user_id"}, status=status.HTTP_400_BAD_REQUEST)
-            
+            # Obtener las solicitudes y reclamos filtrados junto con su usuario en una sola consulta
+            cursor = is_paginated(request, 'claims_cursor') or is_paginated(request, 'requests_cursor')
             try:
-                user = User.objects.get(id=user_id)
-                if not user.is_admin:
-                    return Response({"error": "Acceso denegado. Solo administradores."}, status=status.HTTP_403_FORBIDDEN)
-            except User.DoesNotExist:
-                return Response({"error": "Usuario no encontrado"}, status=status.HTTP_404_NOT_FOUND)
-            
-            # Obtener todas las solicitudes y reclamos
-            claims = Claim.objects.all().order_by('-created_at')
-            requests = Request.objects.all().order_by('-created_at')
+                claims_queryset, keys, descending = filter_items(
+                    Claim.objects.order_by('-created_at'), request.query_params, cursor
+                )
+                requests_queryset, _, _ = filter_items(
+                    Request.objects.order_by('-created_at'), request.query_params, cursor
+                )
+            except InvalidFilter as e:
+                return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+            claims_queryset, extra_keys = admin_projection(claims_queryset, claim_read_serializer, keys)
+            requests_queryset, _ = admin_projection(requests_queryset, request_read_serializer, keys)
             
-            # Serializar los datos incluyendo información del usuario
-            claims_data = []
-            for claim in claims:
-                claim_data = claim_serializer(claim).data
-                claim_data['user_info'] = {
-                    'id': claim.user.id,
-                    'first_name': claim.user.first_name,
-                    'last_name': claim.user.last_name,
-                    'email': claim.user.email
-                }
-                claims_data.append(claim_data)
+            # Cada lista avanza con su propio cursor; la que no lo envía ya se recorrió entera
+            continuing = 'claims_cursor' in request.query_params or 'requests_cursor' in request.query_params
+            claims, next_claims_cursor, claims_paginated, total_claims = admin_page(
+                request, claims_queryset, keys, descending, 'claims_cursor', continuing
+            )
+            requests, next_requests_cursor, requests_paginated, total_requests = admin_page(
+                request, requests_queryset, keys, descending, 'requests_cursor', continuing
+            )
             
-            requests_data = []
-            for req in requests:
-                request_data = request_serializer(req).data
-                request_data['user_info'] = {
-                    'id': req.user.id,
-                    'first_name': req.user.first_name,
-                    'last_name': req.user.last_name,
-                    'email': req.user.email
-                }
-                requests_data.append(request_data)
+            # Serializar las filas leídas con .values() incluyendo información del usuario
+            claims_data = admin_payload(claim_read_serializer, claims, extra_keys)
+            requests_data = admin_payload(request_read_serializer, requests, extra_keys)
             
-            return Response({
+            response_data = {
                 "claims": claims_data,
                 "requests": requests_data,
-                "total_claims": len(claims_data),
-                "total_requests": len(requests_data)
-            }, status=status.HTTP_200_OK)
+            }
+            # Los totales se cuentan solo en la primera página; las siguientes no los repiten
+            if total_claims is not None:
+                response_data["total_claims"] = total_claims
+            if total_requests is not None:
+                response_data["total_requests"] = total_requests
+            if claims_paginated or requests_paginated:
+                response_data["next_claims_cursor"] = next_claims_cursor
+                response_data["next_requests_cursor"] = next_requests_cursor
+            return Response(response_data, status=status.HTTP_200_OK)
             
         except Exception as e:
             return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
     
+    @admin_required
     def patch(self, request):
         """
         Actualizar el estado de una solicitud o reclamo
         """
         try:
-            # Verificar si el usuario es administrador
-            user_id = request.data.get('user_id')
-            if not user_id:
-                return Response({"error": "Se requiere user_id"}, status=status.HTTP_400_BAD_REQUEST)
-            
-            try:
-                user = User.objects.get(id=user_id)
-                if not user.is_admin:
-                    return Response({"error": "Acceso denegado. Solo administradores."}, status=status.HTTP_403_FORBIDDEN)
-            except User.DoesNotExist:
-                return Response({"error": "Usuario no encontrado"}, status=status.HTTP_404_NOT_FOUND)
-            
             # Obtener los datos de la solicitud
             item_type = request.data.get('type')  # 'claim' o 'request'
             item_id = request.data.get('id')
@@ -731,138 +881,141 @@ class AdminView(APIView):
         except Exception as e:
             return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
+# Exportación del panel de administrador
+class AdminExportView(APIView):
+    permission_classes = [AllowAny]
+    
+    @admin_required
+    def get(self, request):
+        """
+        Descarga reclamos y solicitudes con la información de su usuario en CSV o NDJSON,
+        escribiendo las filas a medida que se leen de la base de datos
+        """
+        try:
+            item_types, output = parse_export_params(request.query_params)
+        except InvalidExport as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        
+        response = StreamingHttpResponse(export_stream(item_types, output), content_type=EXPORT_FORMATS[output])
+        filename = f"{'_'.join(item_types)}_{timezone.localdate():%Y%m%d}.{output}"
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+        return response
+
+# Contadores de la caché de permisos de administrador
+class AdminCacheStatsView(APIView):
+    permission_classes = [AllowAny]
+    
+    @admin_required
+    def get(self, request):
+        """
+        Devuelve los aciertos y fallos de la caché de banderas is_admin
+        """
+        return Response(admin_flags.stats(), status=status.HTTP_200_OK)
+
+# Cambio de estado masivo desde el panel de administrador
+class AdminBulkView(APIView):
+    permission_classes = [AllowAny]
+    
+    MODELS = {'claim': Claim, 'request': Request}
+    
+    @admin_required
+    def patch(self, request):
+        """
+        Aplica una lista de cambios de estado {type, id, status} con un UPDATE por tipo y estado
+        """
+        try:
+            items = request.data.get('items')
+            if not isinstance(items, list) or not items:
+                return Response({"error": "Se requiere una lista items con type, id y status"}, status=status.HTTP_400_BAD_REQUEST)
+            if len(items) > BULK_MAX_ITEMS:
+                return Response({"error": f"Se permiten como máximo {BULK_MAX_ITEMS} elementos por petición"}, status=status.HTTP_400_BAD_REQUEST)
+            
+            # Agrupar por tipo y nuevo estado; el último cambio de un mismo id gana
+            transitions = {item_type: {} for item_type in self.MODELS}
+            errors = []
+            for index, item in enumerate(items):
+                item_type = item.get('type') if isinstance(item, dict) else None
+                item_status = item.get('status') if isinstance(item, dict) else None
+                try:
+                    item_id = int(item.get('id'))
+                except (AttributeError, TypeError, ValueError):
+                    item_id = None
+                if item_type not in self.MODELS or item_id is None or not item_status:
+                    errors.append({"index": index, "error": "Se requieren type ('claim' o 'request'), id y status"})
+                    continue
+                transitions[item_type][item_id] = item_status
+            
+            updated = {item_type: 0 for item_type in self.MODELS}
+            missing = {item_type: [] for item_type in self.MODELS}
+            with transaction.atomic():
+                deltas = Counter()
+                for item_type, new_statuses in transitions.items():
+                    if not new_statuses:
+                        continue
+                    model = self.MODELS[item_type]
+                    # Filas bloqueadas hasta el commit: ningún cambio o borrado concurrente puede
+                    # dejar desfasado el estado anterior con el que se calculan los deltas
+                    existing = {
+                        row_id: (old_status, created_at)
+                        for row_id, old_status, created_at in model.objects.select_for_update().filter(
+                            id__in=new_statuses
+                        ).order_by('id').values_list('id', 'status', 'created_at')
+                    }
+                    missing[item_type] = sorted(set(new_statuses) - set(existing))
+                    
+                    ids_by_status = {}
+                    for row_id, new_status in new_statuses.items():
+                        if row_id not in existing:
+                            continue
+                        ids_by_status.setdefault(new_status, []).append(row_id)
+                        old_status, created_at = existing[row_id]
+                        day = rollup_date(created_at)
+                        deltas[(item_type, day, normalize_status(old_status))] -= 1
+                        deltas[(item_type, day, normalize_status(new_status))] += 1
+                    
+                    for new_status, ids in ids_by_status.items():
+                        updated[item_type] += model.objects.filter(id__in=ids).update(
+                            status=new_status, status_code=status_code_for(new_status)
+                        )
+                # QuerySet.update no dispara señales: el resumen diario se ajusta aquí
+                apply_rollup_deltas(deltas)
+            
+            return Response({
+                "message": "Estados actualizados correctamente",
+                "updated": updated,
+                "missing": missing,
+                "errors": errors
+            }, status=status.HTTP_200_OK)
+            
+        except Exception as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
 # Panel de reportes para administradores
 class ReportsView(APIView):
     permission_classes = [AllowAny]
     
+    @admin_required
     def get(self, request):
         """
         Obtener estadísticas detalladas de solicitudes y reclamos para reportes
         """
         try:
-            # Verificar si el usuario es administrador
-            user_id = request.GET.get('user_id')  # Changed from request.query_params.get('user_id')
-            if not user_id:
-                return Response({"error": "Se requiere user_id"}, status=status.HTTP_400_BAD_REQUEST)
-            
             try:
-                user = User.objects.get(id=user_id)
-                if not user.is_admin:
-                    return Response({"error": "Acceso denegado. Solo administradores."}, status=status.HTTP_403_FORBIDDEN)
-            except User.DoesNotExist:
-                return Response({"error": "Usuario no encontrado"}, status=status.HTTP_404_NOT_FOUND)
-            
-            # Obtener todas las solicitudes y reclamos
-            claims = Claim.objects.all()
-            requests = Request.objects.all()
-            
-            # Estadísticas de reclamos
-            claims_stats = {
-                'total': claims.count(),
-                'pendiente': claims.filter(status__iexact='pendiente').count(),
-                'en_proceso': claims.filter(status__iexact='en proceso').count(),
-                'completado': claims.filter(status__iexact='completado').count(),
-            }
-            
-            # Estadísticas de solicitudes
-            requests_stats = {
-                'total': requests.count(),
-                'pendiente': requests.filter(status__iexact='pendiente').count(),
-                'en_proceso': requests.filter(status__iexact='en proceso').count(),
-                'completado': requests.filter(status__iexact='completado').count(),
-            }
-            
-            # Datos para gráficas por fecha (últimos 30 días)
-            from datetime import timedelta
-            
-            end_date = timezone.now().date()
-            start_date = end_date - timedelta(days=29)  # 30 días incluyendo hoy
-            
-            # Generar lista de fechas para los últimos 30 días
-            date_range = []
-            current_date = start_date
-            while current_date <= end_date:
-                date_range.append(current_date.strftime('%Y-%m-%d'))
-                current_date += timedelta(days=1)
-            
-            # Obtener datos de reclamos y solicitudes en el rango de fechas
-            claims_in_range = claims.filter(
-                created_at__date__gte=start_date,
-                created_at__date__lte=end_date
-            )
-            
-            requests_in_range = requests.filter(
-                created_at__date__gte=start_date,
-                created_at__date__lte=end_date
-            )
-            
-            # Organizar datos para gráficas
-            claims_chart_data = {}
-            requests_chart_data = {}
-            
-            # Inicializar datos para cada fecha
-            for date_str in date_range:
-                claims_chart_data[date_str] = {
-                    'pendiente': 0,
-                    'en_proceso': 0,
-                    'completado': 0,
-                    'total': 0
-                }
-                requests_chart_data[date_str] = {
-                    'pendiente': 0,
-                    'en_proceso': 0,
-                    'completado': 0,
-                    'total': 0
-                }
-            
-            # Procesar reclamos
-            for claim in claims_in_range:
-                date_str = claim.created_at.date().strftime('%Y-%m-%d')
-                status_value = (claim.status or 'pendiente').lower()
-                
-                if date_str in claims_chart_data:
-                    if status_value in claims_chart_data[date_str]:
-                        claims_chart_data[date_str][status_value] += 1
-                    claims_chart_data[date_str]['total'] += 1
-            
-            # Procesar solicitudes
-            for req in requests_in_range:
-                date_str = req.created_at.date().strftime('%Y-%m-%d')
-                status_value = (req.status or 'pendiente').lower()
-                
-                if date_str in requests_chart_data:
-                    if status_value in requests_chart_data[date_str]:
-                        requests_chart_data[date_str][status_value] += 1
-                    requests_chart_data[date_str]['total'] += 1
-            
-            # Convertir a formato de array para gráficas
-            claims_chart_array = []
-            requests_chart_array = []
-            
-            for date_str in date_range:
-                claims_chart_array.append({
-                    'date': date_str,
-                    **claims_chart_data[date_str]
-                })
-                requests_chart_array.append({
-                    'date': date_str,
-                    **requests_chart_data[date_str]
-                })
+                start_date, end_date = parse_report_window(request.GET)
+            except InvalidReportWindow as e:
+                return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
             
-            return Response({
-                "claims_stats": claims_stats,
-                "requests_stats": requests_stats,
-                "claims_chart_data": claims_chart_array,
-                "requests_chart_data": requests_chart_array,
-                "date_range": {
-                    "start_date": start_date.strftime('%Y-%m-%d'),
-                    "end_date": end_date.strftime('%Y-%m-%d')
-                }
-            }, status=status.HTTP_200_OK)
+            # Reporte en caché por ventana; las consultas repetidas sin cambios reciben 304
+            report, etag, last_modified = get_cached_report(start_date, end_date)
+            response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+            if response is None:
+                response = Response(report, status=status.HTTP_200_OK)
+            response['ETag'] = etag
+            response['Last-Modified'] = http_date(last_modified)
+            response['Cache-Control'] = 'private, no-cache'
+            return response
             
         except Exception as e:
-            import traceback
-            print(f"Error en ReportsView: {str(e)}")
-            print(traceback.format_exc())
+            logger.exception("Error en ReportsView")
             return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
@@ -12,5 +12,7 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'Resolution.settings')
+# Las vistas de lectura asíncronas quedan desactivadas por defecto: en el benchmark de
+# AsyncViewsBenchmarkTest rinden menos que WSGI (RESOLUTION_ASYNC_VIEWS=1 para probarlas)
 
 application = get_asgi_application()
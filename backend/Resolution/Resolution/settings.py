@@ -10,8 +10,12 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
+import importlib.util
+import os
 from pathlib import Path
 
+from django.core.exceptions import ImproperlyConfigured
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -126,6 +130,43 @@ DATABASES = {
     }
 }
 
+# Conexiones persistentes: evita un nuevo handshake TCP + TLS con el proxy en cada petición.
+# RESOLUTION_DB_CONN_MAX_AGE en segundos (0 cierra al terminar cada petición, 'none' sin límite).
+_conn_max_age = os.environ.get('RESOLUTION_DB_CONN_MAX_AGE', '60')
+DATABASES['default']['CONN_MAX_AGE'] = None if _conn_max_age.lower() == 'none' else int(_conn_max_age)
+DATABASES['default']['CONN_HEALTH_CHECKS'] = os.environ.get('RESOLUTION_DB_CONN_HEALTH_CHECKS', '1') == '1'
+
+# Pool de conexiones de psycopg 3 (requiere psycopg[pool]); sustituye a CONN_MAX_AGE,
+# con el que Django no lo permite combinar. psycopg2 no tiene pool: se falla al arrancar
+# en lugar de en la primera conexión.
+if os.environ.get('RESOLUTION_DB_POOL', '0') == '1':
+    if not (importlib.util.find_spec('psycopg') and importlib.util.find_spec('psycopg_pool')):
+        raise ImproperlyConfigured('RESOLUTION_DB_POOL=1 requiere psycopg 3 con el pool instalado (pip install "psycopg[pool]")')
+    DATABASES['default']['CONN_MAX_AGE'] = 0
+    DATABASES['default']['OPTIONS']['pool'] = {
+        'min_size': int(os.environ.get('RESOLUTION_DB_POOL_MIN_SIZE', 2)),
+        'max_size': int(os.environ.get('RESOLUTION_DB_POOL_MAX_SIZE', 10)),
+        'timeout': int(os.environ.get('RESOLUTION_DB_POOL_TIMEOUT', 10)),
+    }
+
+
+# Caché compartida (permisos de administrador y reportes).
+# Con varios procesos de servidor defina RESOLUTION_REDIS_URL para que las invalidaciones
+# lleguen a todos; sin ella cada proceso usa su propia caché en memoria.
+if os.environ.get('RESOLUTION_REDIS_URL'):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': os.environ['RESOLUTION_REDIS_URL'],
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -146,6 +187,22 @@ AUTH_PASSWORD_VALIDATORS = [
 ]
 
 
+# Hashers de contraseñas: el primero es el preferido y los demás se aceptan y se
+# vuelven a hashear con él al iniciar sesión. Con argon2-cffi instalado se prefiere argon2
+# (RESOLUTION_PASSWORD_HASHER=pbkdf2 mantiene PBKDF2 o =argon2 lo fuerza).
+PASSWORD_HASHERS = [
+    'django.contrib.auth.hashers.PBKDF2PasswordHasher',
+    'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+    'django.contrib.auth.hashers.Argon2PasswordHasher',
+    'django.contrib.auth.hashers.BCryptSHA256PasswordHasher',
+    'django.contrib.auth.hashers.ScryptPasswordHasher',
+]
+_password_hasher = os.environ.get('RESOLUTION_PASSWORD_HASHER', 'auto')
+if _password_hasher == 'argon2' or (_password_hasher == 'auto' and importlib.util.find_spec('argon2')):
+    PASSWORD_HASHERS.remove('django.contrib.auth.hashers.Argon2PasswordHasher')
+    PASSWORD_HASHERS.insert(0, 'django.contrib.auth.hashers.Argon2PasswordHasher')
+
+
 # Internationalization
 # https://docs.djangoproject.com/en/5.2/topics/i18n/
 
@@ -171,3 +228,20 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 # MailerSend Configuration
 MAILERSEND_API_KEY = 'your-api-key-here'  # Replace with your actual MailerSend API key
 MAILERSEND_FROM_EMAIL = 'your-verified-sender@yourdomain.com'  # Replace with your verified sender email
+
+# Django REST Framework: tokens firmados sin consulta a la base de datos
+REST_FRAMEWORK = {
+    'DEFAULT_AUTHENTICATION_CLASSES': [
+        'AppResolution.utils.tokens.SignedTokenAuthentication',
+    ],
+    # JSON con orjson cuando está instalado (ver RESOLUTION_JSON_BACKEND en AppResolution/config.py)
+    'DEFAULT_RENDERER_CLASSES': [
+        'AppResolution.utils.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'AppResolution.utils.renderers.FastJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
+}